@@ -6,7 +6,7 @@
 from typing import List, Dict, Any
 from langchain_core.tools import tool
 from .tool_error_handler import tool_error_handler
-from utils.ml_tool import logistic_regression, clustering_analysis
+from utils.ml_tool import logistic_regression, clustering_analysis, clustering_k_sweep
 
 # 注册逻辑回归工具
 @tool
@@ -35,6 +35,8 @@ def logistic_regression_tool(file_path: str, x_columns: List[str], y_column: str
             - tol: 收敛容差 (默认1e-4)
             - fit_intercept: 是否拟合截距 (默认True)
             - class_weight: 类别权重 ("balanced" 或 None)
+            - mode: 训练方式 ("auto" 默认, "dense", "sparse", "incremental")，
+              auto在存在分类特征或特征很多时使用稀疏矩阵，大文件使用分块增量训练
 
     Returns:
         Dict[str, Any]: 包含逻辑回归结果的字典
@@ -59,13 +61,17 @@ def clustering_analysis_tool(file_path: str, columns: List[str],
             - "hierarchical": 层次聚类
             - "dbscan": DBSCAN聚类
             - "gmm": 高斯混合模型
+            - "minibatch_kmeans": 小批量K-means，适用于大数据
+            - "birch": BIRCH聚类，适用于大数据
+            - "hierarchical_sampled": 基于微簇中心的层次聚类，适用于大数据
+            - "auto": 按数据行数自动选择kmeans或minibatch_kmeans
         n_clusters (int): 簇的数量 (对于K-means、层次聚类和GMM)
         session_id (str): 会话ID
         **kwargs: 其他参数，用于特定聚类方法的配置
             - standardize (bool): 是否标准化数据 (默认True)
             - init (str): K-means初始化方法 ("k-means++", "random") 
             - max_iter (int): K-means最大迭代次数 (默认300)
-            - eps (float): DBSCAN的邻域半径 (默认0.5)
+            - eps (float): DBSCAN的邻域半径 (默认0.5，"auto"表示根据k距离曲线自动估计)
             - min_samples (int): DBSCAN的最小样本数 (默认5)
             - linkage (str): 层次聚类的链接方法 ("ward", "complete", "average", "single")
             - covariance_type (str): GMM协方差类型 ("full", "tied", "diag", "spherical")
@@ -76,6 +82,32 @@ def clustering_analysis_tool(file_path: str, columns: List[str],
     return clustering_analysis(file_path, columns, method, n_clusters, session_id, **kwargs)
 
 
+# 注册聚类k值扫描工具
+@tool
+@tool_error_handler
+def clustering_k_sweep_tool(file_path: str, columns: List[str], k_min: int = 2, k_max: int = 10,
+                            method: str = "kmeans", session_id: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    聚类k值扫描 - 一次请求中比较多个簇数量，返回惯性和轮廓系数曲线以及最佳k值的聚类结果
+
+    Args:
+        file_path (str): 文件路径
+        columns (List[str]): 用于聚类的列名列表
+        k_min (int): 最小簇数量 (默认2)
+        k_max (int): 最大簇数量 (默认10)
+        method (str): 聚类方法，"kmeans" (默认) 或 "minibatch_kmeans"
+        session_id (str): 会话ID
+        **kwargs: 其他参数
+            - standardize (bool): 是否标准化数据 (默认True)
+            - warm_start (bool): 是否用上一个k的簇中心初始化下一个k (默认True)
+            - n_jobs (int): 并行进程数
+
+    Returns:
+        Dict[str, Any]: 包含k值扫描结果的字典
+    """
+    return clustering_k_sweep(file_path, columns, k_min, k_max, method, session_id, **kwargs)
+
+
 # 将模块中的函数注册为工具
 def register_ml_tools(agent):
     """
@@ -86,3 +118,4 @@ def register_ml_tools(agent):
     """
     agent.tools.append(logistic_regression_tool)
     agent.tools.append(clustering_analysis_tool)
+    agent.tools.append(clustering_k_sweep_tool)
@@ -10,7 +10,7 @@ from langchain_core.tools import tool
 from utils.file_manager import remove_invalid_samples, handle_missing_values
 from utils.pandas_tool import dimensionless_processing, scientific_calculation, one_hot_encoding,\
     statistical_summary, text_to_numeric_or_datetime, correlation_analysis, normality_test, \
-    t_test, f_test, chi_square_test, non_parametric_test, linear_regression
+    t_test, f_test, chi_square_test, non_parametric_test, linear_regression, regularization_path
 
 
 # 注册去除无效样本工具
@@ -21,7 +21,8 @@ def remove_invalid_samples_tool(file_path: str, session_id: str = None,
                                 remove_duplicate_cols: bool = False,
                                 remove_constant_cols: bool = False,
                                 row_missing_threshold: float = 1,
-                                col_missing_threshold: float = 1) -> dict:
+                                col_missing_threshold: float = 1,
+                                streaming: bool = None) -> dict:
     """
     去除无效样本 - 处理重复数据和超出阈值的行列
     Args:
@@ -32,10 +33,12 @@ def remove_invalid_samples_tool(file_path: str, session_id: str = None,
         remove_constant_cols (bool): 是否删除所有数据都相同的列
         row_missing_threshold (float): 行缺失值阈值 (0-1之间)
         col_missing_threshold (float): 列缺失值阈值 (0-1之间)
+        streaming (bool): 是否分块处理行（基于行指纹去重），None表示大文件自动启用；
+            列相关的操作需要完整数据，不能与分块处理同时使用
     """
     return remove_invalid_samples(file_path, session_id, remove_duplicates,
                                   remove_duplicate_cols, remove_constant_cols,
-                                  row_missing_threshold, col_missing_threshold)
+                                  row_missing_threshold, col_missing_threshold, streaming)
 
 
 # 注册处理缺失值工具
@@ -45,7 +48,8 @@ def handle_missing_values_tool(file_path: str, session_id: str = None,
                                specified_columns: List[str] = None,
                                interpolation_method: str = "linear",
                                fill_value: Any = None,
-                               knn_neighbors: int = 5) -> dict:
+                               knn_neighbors: int = 5,
+                               knn_backend: str = "index") -> dict:
     """
     对缺失数据进行插值
     Args:
@@ -55,9 +59,12 @@ def handle_missing_values_tool(file_path: str, session_id: str = None,
         interpolation_method (str): 插值方法 ("linear", "ffill", "bfill", "mean", "median", "mode", "knn", "constant")
         fill_value (Any): 当使用constant方法时的填充值
         knn_neighbors (int): KNN插值的邻居数量
+        knn_backend (str): KNN插值的实现
+            - "index": 在完整行上建立近邻索引，只查询含缺失值的行，适用于大数据 (默认)
+            - "sklearn": sklearn的KNNImputer，近邻可来自任意非缺失行，复杂度为O(n²)
     """
     return handle_missing_values(file_path, session_id, specified_columns, interpolation_method,
-                                 fill_value, knn_neighbors)
+                                 fill_value, knn_neighbors, knn_backend)
 
 
 # 注册量纲处理工具
@@ -67,6 +74,7 @@ def dimensionless_processing_tool(
         file_path: str, session_id: str = None,
         columns: List[str] = None,
         method: str = "standard",
+        streaming: bool = None,
         **kwargs
 ) -> dict:
     """
@@ -91,8 +99,9 @@ def dimensionless_processing_tool(
             - n_quantiles: 分位数变换的分位数数量 (默认100)
             - output_distribution: 分位数变换的输出分布 ('uniform'或'normal')
             - standardize: 是否在power变换后标准化数据 (默认True)
+        streaming (bool): 是否分块处理（不支持yeo-johnson和box-cox），None表示大文件自动启用
     """
-    return dimensionless_processing(file_path, columns, method, session_id, **kwargs)
+    return dimensionless_processing(file_path, columns, method, session_id, streaming, **kwargs)
 
 
 # 注册科学计算工具
@@ -112,6 +121,10 @@ def scientific_calculation_tool(
         columns (List[str]): 需要处理的列名列表
         operation (str): 运算类型 ("log", "exp", "power", "sqrt", "poly")
         params (dict): 运算参数
+            - power: 幂指数 (用于"power"操作)
+            - degree: 多项式度数 (用于"poly"操作)
+            - cross_terms: 是否生成交叉项 (用于"poly"操作，默认False)
+            - dtype: 结果精度，"float64" (默认) 或 "float32"
     """
     return scientific_calculation(file_path, columns, operation, params, session_id)
 
@@ -122,7 +135,8 @@ def scientific_calculation_tool(
 def one_hot_encoding_tool(
         file_path: str, session_id: str = None,
         columns: List[str] = None,
-        drop_first: bool = False
+        drop_first: bool = False,
+        output_format: str = "dense"
 ) -> dict:
     """
     独热编码 - 对分类变量进行独热编码处理
@@ -131,8 +145,9 @@ def one_hot_encoding_tool(
         session_id (str): session_id
         columns (List[str]): 需要处理的列名列表
         drop_first (bool): 是否删除第一个虚拟变量以避免多重共线性
+        output_format (str): 输出格式，"dense"写入数据文件，"sparse"另存为稀疏矩阵（适用于高基数列，仅供导出，后续分析工具不会读取），"auto"按独热列数自动选择
     """
-    return one_hot_encoding(file_path, columns, session_id, drop_first)
+    return one_hot_encoding(file_path, columns, session_id, drop_first, output_format)
 
 
 # 注册统计摘要工具
@@ -340,6 +355,7 @@ def linear_regression_tool(file_path: str, x_columns: List[str], y_column: str,
             - max_iter: 最大迭代次数 (默认1000)
             - tol: 收敛容差 (默认1e-4)
             - fit_intercept: 是否拟合截距 (默认True)
+            - streaming: OLS是否分块流式求解并返回标准误、t值和p值 (默认文件超过256MB时启用)
 
     Returns:
         Dict[str, Any]: 包含线性回归结果的字典
@@ -347,6 +363,37 @@ def linear_regression_tool(file_path: str, x_columns: List[str], y_column: str,
     return linear_regression(file_path, x_columns, y_column, method, session_id, alpha, l1_ratio, **kwargs)
 
 
+# 注册正则化路径工具
+@tool
+@tool_error_handler
+def regularization_path_tool(file_path: str, x_columns: List[str], y_column: str,
+                             method: str = "lasso", session_id: str = None, alphas: List[float] = None,
+                             n_alphas: int = 50, l1_ratio: float = 0.5, cv: int = 5, **kwargs) -> dict:
+    """
+    正则化路径与交叉验证 - 一次计算整条系数路径和k折交叉验证曲线，返回最佳alpha，适用于为lasso/ridge/elastic_net选择alpha
+
+    Args:
+        file_path (str): 文件路径
+        x_columns (List[str]): 自变量列名列表（特征列）
+        y_column (str): 因变量列名（目标列）
+        method (str): 回归方法 ("lasso" 默认, "ridge", "elastic_net")
+        session_id (str): 会话ID
+        alphas (List[float]): alpha取值列表，默认根据数据自动生成
+        n_alphas (int): 自动生成的alpha数量 (默认50)
+        l1_ratio (float): ElasticNet中L1正则化的比例 (仅用于elastic_net)
+        cv (int): 交叉验证折数 (默认5)
+        **kwargs: 其他参数
+            - max_iter: 最大迭代次数 (默认1000)
+            - tol: 收敛容差 (默认1e-4)
+            - fit_intercept: 是否拟合截距 (默认True)
+
+    Returns:
+        Dict[str, Any]: 包含CV曲线和最佳alpha的字典
+    """
+    return regularization_path(file_path, x_columns, y_column, method, session_id,
+                               alphas, n_alphas, l1_ratio, cv, **kwargs)
+
+
 # 将模块中的函数注册为工具
 def register_pandas_tools(agent):
     """
@@ -369,3 +416,4 @@ def register_pandas_tools(agent):
     agent.tools.append(chi_square_test_tool)
     agent.tools.append(non_parametric_test_tool)
     agent.tools.append(linear_regression_tool)
+    agent.tools.append(regularization_path_tool)
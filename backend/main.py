@@ -35,12 +35,15 @@ logger.info(f"DASHSCOPE_API_KEY 环境变量设置情况: {bool(os.getenv('DASHS
 # 使用绝对导入代替相对导入
 from utils.file_manager import upload_file
 from utils.cleanup import clean_expired_sessions_and_files
+from utils.warmup import warmup_models, is_warmup_enabled
 from routers.chat import router as chat_router
 from routers.data import router as data_router
 from routers.files import router as files_router
 from routers.analysis import router as analysis_router
 from routers.nlp import router as nlp_router
 from routers.charts import router as charts_router
+from routers.models import router as models_router
+from routers.transformers import router as transformers_router
 
 app = FastAPI(title="Agent-Analytics API", description="数据分析系统的后端API")
 
@@ -60,12 +63,16 @@ app.include_router(files_router)
 app.include_router(analysis_router)
 app.include_router(nlp_router)
 app.include_router(charts_router)
+app.include_router(models_router)
+app.include_router(transformers_router)
 
 # 挂载静态文件目录，使生成的图片可以通过URL访问
 app.mount("/data", StaticFiles(directory="data"), name="data")
 
 # 存储定时任务的引用
 cleanup_task = None
+# 存储预热任务的引用
+warmup_task = None
 
 async def periodic_cleanup():
     """
@@ -87,11 +94,18 @@ async def startup_event():
     """
     应用启动时的事件处理
     """
-    global cleanup_task
+    global cleanup_task, warmup_task
     # 启动定期清理任务
     cleanup_task = asyncio.create_task(periodic_cleanup())
     logger.info("定期清理任务已启动")
 
+    # 在后台线程中预热NLP模型，不阻塞服务启动
+    if is_warmup_enabled():
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup_models))
+        logger.info("模型预热任务已启动")
+    else:
+        logger.info("模型预热已禁用")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """
@@ -14,9 +14,9 @@ from typing import List, Optional, Tuple, Dict, Any
 
 from routers.data import load_csv_file
 from utils.pandas_tool import statistical_summary, correlation_analysis, \
-    normality_test, t_test, f_test, chi_square_test, non_parametric_test,linear_regression
-from utils.ml_tool import clustering_analysis,logistic_regression
-from utils.file_manager import get_file_path
+    normality_test, t_test, f_test, chi_square_test, non_parametric_test,linear_regression,regularization_path
+from utils.ml_tool import clustering_analysis,logistic_regression,clustering_k_sweep,dbscan_eps_estimation
+from utils.file_manager import get_file_path, read_header
 import pandas as pd
 
 router = APIRouter(prefix="/data", tags=["analysis"])
@@ -75,6 +75,20 @@ class ClusteringRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None  # 其他参数
 
 
+class ClusteringSweepRequest(BaseModel):
+    columns: Optional[List[str]] = None
+    method: str = "kmeans"
+    k_min: int = 2
+    k_max: int = 10
+    params: Optional[Dict[str, Any]] = None  # 其他参数
+
+
+class DbscanEpsRequest(BaseModel):
+    columns: Optional[List[str]] = None
+    min_samples: int = 5
+    params: Optional[Dict[str, Any]] = None  # 其他参数
+
+
 def validate_request_data(request: Request, data_id: str, body_columns: Optional[List[str]] = None) -> Tuple[str, str, pd.DataFrame, List[str], JSONResponse]:
     """
     验证请求数据并准备处理参数
@@ -148,6 +162,60 @@ def validate_request_data(request: Request, data_id: str, body_columns: Optional
     return session_id, file_path, df, columns_to_process, None
 
 
+def validate_request_columns(request: Request, data_id: str,
+                             body_columns: List[str]) -> Tuple[str, str, List[str], JSONResponse]:
+    """
+    只根据列名验证请求数据，不读取数据行，用于会对大文件分块处理的接口
+
+    Args:
+        request: FastAPI请求对象
+        data_id: 数据ID
+        body_columns: 请求体中的列列表
+
+    Returns:
+        Tuple[session_id, file_path, columns_to_process, error_response]
+    """
+    session_id = request.state.session_id
+    file_path = get_file_path(data_id, session_id)
+
+    if not os.path.exists(file_path):
+        return "", "", [], JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": f"文件不存在: {file_path}"
+            }
+        )
+
+    try:
+        header = read_header(file_path)
+    except Exception as e:
+        logger.error(f"读取文件 {file_path} 失败: {str(e)}")
+        return "", "", [], JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": f"读取文件失败: {str(e)}"
+            }
+        )
+
+    columns_to_process = [col for col in body_columns if col in header]
+    missing_columns = set(body_columns) - set(columns_to_process)
+    if missing_columns:
+        logger.warning(f"以下列在数据中不存在: {missing_columns}")
+
+    if not columns_to_process:
+        return "", "", [], JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": "没有可处理的列"
+            }
+        )
+
+    return session_id, file_path, columns_to_process, None
+
+
 @router.post("/{data_id}/statistical_summary")
 async def get_statistical_summary(request: Request, data_id: str, body: StatisticalSummaryRequest):
     """
@@ -443,7 +511,8 @@ async def get_linear_regression(request: Request, data_id: str, body: LinearRegr
     获取数据文件的线性回归分析结果接口，用于"线性回归"方法
     """
     try:
-        session_id, file_path, df, columns_to_process, error_response = validate_request_data(
+        # 大文件的OLS分块求解，这里只检查列名，不读取整个文件
+        session_id, file_path, columns_to_process, error_response = validate_request_columns(
             request, data_id, body.x_columns)
         if error_response:
             return error_response
@@ -466,6 +535,14 @@ async def get_linear_regression(request: Request, data_id: str, body: LinearRegr
             "l1_ratio": regression_result["l1_ratio"]
         }
 
+        if "model_id" in regression_result:
+            result_data["model_id"] = regression_result["model_id"]
+
+        # 流式OLS额外返回的检验统计量
+        for key in ("statistics", "degrees_of_freedom", "residual_std_error", "solver", "rank_deficient", "chunks"):
+            if key in regression_result:
+                result_data[key] = regression_result[key]
+
         # 如果有正则化参数，也返回
         if "regularization_params" in regression_result:
             result_data["regularization_params"] = regression_result["regularization_params"]
@@ -485,6 +562,51 @@ async def get_linear_regression(request: Request, data_id: str, body: LinearRegr
         )
 
 
+class RegularizationPathRequest(BaseModel):
+    x_columns: List[str]  # 自变量列
+    y_column: str         # 因变量列
+    method: str = "lasso" # 正则化方法
+    alphas: Optional[List[float]] = None  # alpha取值列表，默认自动生成
+    n_alphas: int = 50    # 自动生成的alpha数量
+    l1_ratio: float = 0.5 # ElasticNet中L1正则化的比例
+    cv: int = 5           # 交叉验证折数
+    params: Optional[Dict[str, Any]] = None  # 其他参数
+
+
+@router.post("/{data_id}/regularization_path")
+async def get_regularization_path(request: Request, data_id: str, body: RegularizationPathRequest):
+    """
+    正则化路径与交叉验证接口，一次请求返回系数路径、CV曲线和最佳alpha
+    """
+    try:
+        session_id, file_path, df, columns_to_process, error_response = validate_request_data(
+            request, data_id, body.x_columns)
+        if error_response:
+            return error_response
+
+        kwargs = body.params if body.params else {}
+
+        path_result = regularization_path(
+            file_path, columns_to_process, body.y_column, body.method, session_id,
+            body.alphas, body.n_alphas, body.l1_ratio, body.cv, **kwargs)
+
+        result_data = {"data_id": data_id, **path_result}
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result_data
+        })
+    except Exception as e:
+        logger.error(f"获取正则化路径时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": f"{str(e)}"
+            }
+        )
+
+
 class LogisticRegressionRequest(BaseModel):
     x_columns: List[str]  # 自变量列
     y_column: str         # 因变量列
@@ -499,7 +621,8 @@ async def get_logistic_regression(request: Request, data_id: str, body: Logistic
     获取数据文件的逻辑回归分析结果接口，用于"逻辑回归"方法
     """
     try:
-        session_id, file_path, df, columns_to_process, error_response = validate_request_data(
+        # 大文件分块增量训练，这里只检查列名，不读取整个文件
+        session_id, file_path, columns_to_process, error_response = validate_request_columns(
             request, data_id, body.x_columns)
         if error_response:
             return error_response
@@ -523,6 +646,7 @@ async def get_logistic_regression(request: Request, data_id: str, body: Logistic
             "class_labels": regression_result["class_labels"],
             "confusion_matrix": regression_result["confusion_matrix"],
             "model_params": regression_result["model_params"],
+            "model_id": regression_result.get("model_id"),
         }
 
         return JSONResponse(content={
@@ -567,7 +691,10 @@ async def get_clustering_analysis(request: Request, data_id: str, body: Clusteri
             "evaluation_metrics": clustering_result["evaluation_metrics"],
             "sample_size": clustering_result["sample_size"],
             "result_file_path": clustering_result["result_file_path"],  # 添加结果文件路径
-            "model_params": clustering_result["model_params"]
+            "model_params": clustering_result["model_params"],
+            "model_id": clustering_result.get("model_id"),
+            "k_distance": clustering_result.get("k_distance"),
+            "projection": clustering_result.get("projection")
         }
 
         return JSONResponse(content={
@@ -583,3 +710,69 @@ async def get_clustering_analysis(request: Request, data_id: str, body: Clusteri
                 "error": f"{str(e)}"
             }
         )
+
+
+@router.post("/{data_id}/clustering_sweep")
+async def get_clustering_sweep(request: Request, data_id: str, body: ClusteringSweepRequest):
+    """
+    聚类k值扫描接口，一次请求返回多个簇数量的惯性和轮廓系数曲线以及最佳k值的聚类结果
+    """
+    try:
+        session_id, file_path, df, columns_to_process, error_response = validate_request_data(
+            request, data_id, body.columns)
+        if error_response:
+            return error_response
+
+        kwargs = body.params if body.params else {}
+
+        sweep_result = clustering_k_sweep(
+            file_path, columns_to_process, body.k_min, body.k_max, body.method, session_id, **kwargs)
+
+        result_data = {"data_id": data_id, **sweep_result}
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result_data
+        })
+    except Exception as e:
+        logger.error(f"获取聚类k值扫描结果时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": f"{str(e)}"
+            }
+        )
+
+
+@router.post("/{data_id}/dbscan_eps")
+async def get_dbscan_eps(request: Request, data_id: str, body: DbscanEpsRequest):
+    """
+    DBSCAN参数估计接口，返回k距离曲线和建议的eps
+    """
+    try:
+        session_id, file_path, df, columns_to_process, error_response = validate_request_data(
+            request, data_id, body.columns)
+        if error_response:
+            return error_response
+
+        kwargs = body.params if body.params else {}
+
+        eps_result = dbscan_eps_estimation(
+            file_path, columns_to_process, body.min_samples, session_id, **kwargs)
+
+        result_data = {"data_id": data_id, **eps_result}
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result_data
+        })
+    except Exception as e:
+        logger.error(f"估计DBSCAN参数时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": f"{str(e)}"
+            }
+        )
@@ -65,7 +65,8 @@ async def chat_stream(request: Request, chat_request: ChatRequest):
                     # 移除了文件路径的日志打印，以保护用户隐私
                     if os.path.exists(file_path):
                         import pandas as pd
-                        df = pd.read_csv(file_path, encoding='utf-8-sig')
+                        from utils.file_manager import read_any_file
+                        df = read_any_file(file_path)
                         # 处理NaN值，将其替换为None以便JSON序列化
                         df = df.replace({pd.NA: None, pd.NaT: None, np.nan: None})
                         
@@ -8,13 +8,14 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from fastapi import APIRouter, Request, Body
-from fastapi.responses import JSONResponse,FileResponse
+from fastapi.responses import JSONResponse,FileResponse,StreamingResponse
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 import logging
 
-from utils.file_manager import get_file_path, delete_file, sanitize_filename
+from utils.file_manager import get_file_path, delete_file, sanitize_filename, read_any_file, \
+    has_appended_columns, iter_csv_with_appended_columns
 
 router = APIRouter(prefix="/data", tags=["data"])
 
@@ -49,7 +50,7 @@ def get_user_files_list(session_id: str) -> list:
                 try:
                     # 获取文件信息
                     stat = os.stat(file_path)
-                    df = pd.read_csv(file_path, encoding="utf-8-sig")
+                    df = read_any_file(file_path)
                     # 处理NaN值，将其替换为None以便JSON序列化
                     df = df.replace({pd.NA: None, pd.NaT: None, np.nan: None})
                     
@@ -87,7 +88,7 @@ def load_csv_file(data_id: str, session_id: str) -> tuple:
     
     # 读取CSV文件
     try:
-        df = pd.read_csv(file_path, encoding="utf-8-sig")
+        df = read_any_file(file_path)
         return True, df, 200
     except Exception as e:
         error_msg = f"读取文件失败: {str(e)}"
@@ -494,6 +495,15 @@ async def download_data(request: Request, data_id: str):
         # 从文件路径中提取实际的data_id（文件名不带扩展名）
         actual_data_id = os.path.splitext(os.path.basename(file_path))[0]
         logger.info(f"找到文件，实际data_id为: {actual_data_id}")
+
+        # 存在追加列时分块输出合并后的数据，不改写数据文件（改写会使基于数据版本的缓存失效）
+        if has_appended_columns(file_path):
+            filename = urllib.parse.quote(f"{actual_data_id}.csv")
+            return StreamingResponse(
+                (text.encode("utf-8") for text in iter_csv_with_appended_columns(file_path)),
+                media_type='text/csv',
+                headers={"Content-Disposition": f"attachment; filename*=utf-8''{filename}"}
+            )
         
         # 返回文件下载响应
         return FileResponse(
@@ -12,7 +12,8 @@ from backend.routers.data import load_csv_file
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from utils.file_manager import get_file_path, delete_file, delete_columns
+from utils.file_manager import get_file_path, delete_file, delete_columns, read_any_file, READ_CHUNK_SIZE
+from utils.knn_imputation import KNN_MAX_DONORS
 
 router = APIRouter(prefix="/user", tags=["user"])
 
@@ -44,7 +45,7 @@ async def get_user_files(request: Request):
                     try:
                         # 获取文件信息
                         stat = os.stat(file_path)
-                        df = pd.read_csv(file_path, encoding="utf-8-sig")
+                        df = read_any_file(file_path)
                         # 处理NaN值，将其替换为None以便JSON序列化
                         df = df.replace({pd.NA: None, pd.NaT: None, np.nan: None})
                         
@@ -195,6 +196,8 @@ class RemoveInvalidSamplesRequest(BaseModel):
     remove_constant_cols: bool = False
     row_missing_threshold: float = 1.0
     col_missing_threshold: float = 1.0
+    streaming: Optional[bool] = None  # 是否分块去重，None表示按文件大小自动选择
+    chunksize: int = READ_CHUNK_SIZE  # 分块处理时每块的行数
 
 
 @router.post("/{data_id}/remove_invalid_samples")
@@ -214,22 +217,23 @@ async def remove_invalid_samples(request: Request, data_id: str, body: RemoveInv
         # 获取session_id
         session_id = request.state.session_id
 
-        # 加载CSV文件
-        success, result, status_code = load_csv_file(data_id, session_id)
-        if not success:
+        # 检查文件是否存在（分块处理时不预先加载完整数据）
+        file_path = get_file_path(data_id, session_id)
+        if not os.path.exists(file_path):
             return JSONResponse(
-                status_code=status_code,
+                status_code=404,
                 content={
                     "success": False,
-                    "error": result
+                    "error": "数据文件不存在"
                 }
             )
         # 导入并调用去除无效样本的函数
         from utils.file_manager import remove_invalid_samples
 
-        result = remove_invalid_samples(get_file_path(data_id, session_id), session_id,
+        result = remove_invalid_samples(file_path, session_id,
                                         body.remove_duplicates, body.remove_duplicate_cols, body.remove_constant_cols,
-                                        body.row_missing_threshold, body.col_missing_threshold)
+                                        body.row_missing_threshold, body.col_missing_threshold,
+                                        body.streaming, body.chunksize)
 
         return JSONResponse(content={
             "success": True,
@@ -251,6 +255,8 @@ class HandleMissingValuesRequest(BaseModel):
     interpolation_method: str = "linear"
     fill_value: Any = None
     knn_neighbors: int = 5
+    knn_backend: str = "index"  # KNN插值实现："index"（近邻索引）或 "sklearn"（KNNImputer）
+    knn_max_donors: int = KNN_MAX_DONORS  # 近邻候选行的最大数量
 
 
 @router.post("/{data_id}/handle_missing_values")
@@ -285,7 +291,7 @@ async def handle_missing_values_endpoint(request: Request, data_id: str, body: H
 
         result = handle_missing_values(get_file_path(data_id, session_id), session_id, body.specified_columns,
                                        body.interpolation_method, body.fill_value,
-                                       body.knn_neighbors)
+                                       body.knn_neighbors, body.knn_backend, body.knn_max_donors)
 
         return JSONResponse(content={
             "success": True,
@@ -307,6 +313,8 @@ class DimensionlessProcessingRequest(BaseModel):
     columns: List[str]
     method: str = "standard"
     params: Optional[Dict[str, Any]] = None
+    streaming: Optional[bool] = None  # 是否分块处理，None表示按文件大小自动选择
+    chunksize: int = READ_CHUNK_SIZE  # 分块处理时每块的行数
 
 
 @router.post("/{data_id}/dimensionless_processing")
@@ -326,17 +334,17 @@ async def dimensionless_processing_endpoint(request: Request, data_id: str, body
         # 获取session_id
         session_id = request.state.session_id
 
-        # 加载CSV文件
-        success, result, status_code = load_csv_file(data_id, session_id)
-        if not success:
+        # 检查文件是否存在（分块处理时不预先加载完整数据）
+        file_path = get_file_path(data_id, session_id)
+        if not os.path.exists(file_path):
             return JSONResponse(
-                status_code=status_code,
+                status_code=404,
                 content={
                     "success": False,
-                    "error": result
+                    "error": "数据文件不存在"
                 }
             )
-            
+
         # 导入并调用量纲处理函数
         from utils.pandas_tool import dimensionless_processing
 
@@ -346,10 +354,12 @@ async def dimensionless_processing_endpoint(request: Request, data_id: str, body
             kwargs.update(body.params)
             
         result = dimensionless_processing(
-            get_file_path(data_id, session_id), 
-            body.columns, 
-            body.method, 
+            file_path,
+            body.columns,
+            body.method,
             session_id,
+            body.streaming,
+            body.chunksize,
             **kwargs
         )
 
@@ -431,6 +441,7 @@ async def scientific_calculation_endpoint(request: Request, data_id: str, body:
 class OneHotEncodingRequest(BaseModel):
     columns: List[str]
     drop_first: bool = False
+    output_format: str = "dense"  # "dense", "sparse" (export-only .npz, not read by other endpoints) or "auto"
 
 
 @router.post("/{data_id}/one_hot_encoding")
@@ -468,7 +479,8 @@ async def one_hot_encoding_endpoint(request: Request, data_id: str, body: OneHot
             get_file_path(data_id, session_id), 
             body.columns, 
             session_id,
-            body.drop_first
+            body.drop_first,
+            body.output_format
         )
 
         return JSONResponse(content={
@@ -543,4 +555,66 @@ async def text_to_numeric_or_datetime_endpoint(request: Request, data_id: str, b
                 "success": False,
                 "error": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+class PipelineStep(BaseModel):
+    operation: str  # "remove_invalid_samples", "handle_missing_values", "dimensionless_processing" or "one_hot_encoding"
+    params: Dict[str, Any] = {}  # 与对应单独接口的参数相同
+
+
+class PipelineRequest(BaseModel):
+    steps: List[PipelineStep]
+    save_transformers: bool = True  # 是否保存各步拟合得到的参数
+
+
+@router.post("/{data_id}/pipeline")
+async def pipeline_endpoint(request: Request, data_id: str, body: PipelineRequest):
+    """
+    清洗流水线接口，按顺序执行多个操作，只读取一次数据、写出一次结果
+
+    Args:
+        request (Request): FastAPI请求对象
+        data_id (str): 数据文件ID
+        body (PipelineRequest): 请求体，包含按顺序执行的操作
+
+    Returns:
+        JSONResponse: 处理结果，包含读取、写出和每一步的耗时
+    """
+    try:
+        # 获取session_id
+        session_id = request.state.session_id
+
+        # 检查文件是否存在（流水线只读取一次数据）
+        file_path = get_file_path(data_id, session_id)
+        if not os.path.exists(file_path):
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "success": False,
+                    "error": "数据文件不存在"
+                }
+            )
+
+        # 导入并调用清洗流水线
+        from utils.cleaning_pipeline import run_cleaning_pipeline
+
+        result = run_cleaning_pipeline(
+            file_path,
+            [{"operation": step.operation, "params": step.params} for step in body.steps],
+            session_id,
+            body.save_transformers
+        )
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result
+        })
+    except Exception as e:
+        logger.error(f"执行清洗流水线时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
@@ -0,0 +1,165 @@
+import sys
+import os
+
+# 添加项目根目录到sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+import logging
+from pydantic import BaseModel
+from typing import Optional
+
+from utils.file_manager import get_file_path
+from utils.model_registry import list_models, get_model_info, delete_model, predict, PREDICT_BATCH_SIZE
+
+router = APIRouter(prefix="/models", tags=["models"])
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PredictRequest(BaseModel):
+    """
+    模型预测请求模型
+    """
+    data_id: str  # 待预测的数据文件ID
+    batch_size: Optional[int] = PREDICT_BATCH_SIZE  # 每批预测的行数
+    write_back: Optional[bool] = False  # 是否将预测结果作为新列追加到数据集
+
+
+@router.get("")
+async def get_models(request: Request):
+    """
+    获取当前会话已保存的模型列表接口
+    """
+    try:
+        models = list_models(request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "data": models
+        })
+    except Exception as e:
+        logger.error(f"获取模型列表时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.get("/{model_id}")
+async def get_model(request: Request, model_id: str):
+    """
+    获取模型信息接口
+    """
+    try:
+        info = get_model_info(model_id, request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "data": info
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"获取模型信息时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.delete("/{model_id}")
+async def remove_model(request: Request, model_id: str):
+    """
+    删除模型接口
+    """
+    try:
+        delete_model(model_id, request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "message": "模型已删除"
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"删除模型时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.post("/{model_id}/predict")
+async def predict_with_model(request: Request, model_id: str, body: PredictRequest):
+    """
+    使用已保存的模型对数据集进行预测接口，无需重新拟合
+    """
+    try:
+        # 获取session_id
+        session_id = request.state.session_id
+
+        # 获取文件路径
+        file_path = get_file_path(body.data_id, session_id)
+
+        if not os.path.exists(file_path):
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "success": False,
+                    "error": f"文件不存在: {file_path}"
+                }
+            )
+
+        predict_result = predict(
+            model_id, file_path, session_id,
+            batch_size=body.batch_size or PREDICT_BATCH_SIZE,
+            write_back=body.write_back
+        )
+
+        result_data = {"data_id": body.data_id, **predict_result}
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result_data
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"模型预测时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
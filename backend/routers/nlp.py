@@ -7,14 +7,16 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import json
 import logging
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 
-from routers.data import load_csv_file
-from utils.nlp_tool import generate_wordcloud, analyze_sentiment
-from utils.file_manager import get_file_path
+from utils.nlp_tool import generate_wordcloud, analyze_sentiment, keyword_analysis
+from utils.file_manager import get_file_path, read_header, iter_column_chunks
+from utils.job_manager import submit_job, get_job
 
 router = APIRouter(prefix="/nlp", tags=["nlp"])
 
@@ -37,6 +39,7 @@ class WordCloudRequest(BaseModel):
     color: Optional[List[str]] = ["#FF274B"]  # 词云颜色列表
     max_words: Optional[int] = 200  # 最大词数
     stopwords: Optional[List[str]] = []  # 自定义停用词列表
+    background: Optional[bool] = False  # 是否以后台任务方式执行
 
 
 class SentimentAnalysisRequest(BaseModel):
@@ -46,6 +49,110 @@ class SentimentAnalysisRequest(BaseModel):
     column: str  # 需要分析情感的列名
     stopwords: Optional[List[str]] = []  # 自定义停用词列表
     internet_slang: Optional[Dict[str, str]] = {}  # 网络用语映射
+    write_back: Optional[bool] = False  # 是否将逐行情感标签和得分追加为数据列
+    background: Optional[bool] = False  # 是否以后台任务方式执行
+
+
+class KeywordAnalysisRequest(BaseModel):
+    """
+    关键词与n-gram分析请求模型
+    """
+    column: str  # 需要分析的文本列名
+    top_k: Optional[int] = 50  # 每项统计返回的词数
+    stopwords: Optional[List[str]] = []  # 自定义停用词列表
+    group_by: Optional[str] = None  # 分组列名，用于比较各分组的特征词
+    min_length: Optional[int] = 2  # 关键词最小长度
+
+
+def _run_wordcloud(data_id: str, file_path: str, session_id: str, body: WordCloudRequest,
+                   progress_callback=None) -> dict:
+    """
+    调用工具函数生成词云并整理返回结果
+    """
+    wordcloud_result = generate_wordcloud(
+        file_path=file_path,
+        column=body.column,
+        session_id=session_id,
+        shape=body.shape,
+        word_gap=body.word_gap,
+        word_size_range=body.word_size_range,
+        rotate_step=body.rotate_step,
+        width=body.width,
+        height=body.height,
+        color=body.color,
+        max_words=body.max_words,
+        stopwords=body.stopwords,
+        progress_callback=progress_callback
+    )
+
+    # 准备返回结果
+    return {
+        "data_id": data_id,
+        "column": body.column,
+        "chart_path": wordcloud_result["chart_path"],  # 返回HTML文件路径
+        "top_words": wordcloud_result["top_words"],
+        "total_words": wordcloud_result["total_words"]
+    }
+
+
+def _run_sentiment(data_id: str, file_path: str, session_id: str, body: SentimentAnalysisRequest,
+                   progress_callback=None) -> dict:
+    """
+    调用工具函数进行情感分析并整理返回结果
+    """
+    sentiment_result = analyze_sentiment(
+        file_path=file_path,
+        column=body.column,
+        session_id=session_id,
+        stopwords=body.stopwords,
+        internet_slang=body.internet_slang,
+        write_back=body.write_back,
+        progress_callback=progress_callback
+    )
+
+    # 准备返回结果
+    result_data = {
+        "data_id": data_id,
+        "column": body.column,
+        "sentiment_ratios": sentiment_result["sentiment_ratios"],
+        "statistics": sentiment_result["statistics"],
+        "sentiment_counts": sentiment_result["sentiment_counts"],
+        "echarts_data": sentiment_result["echarts_data"]
+    }
+
+    # 如果追加了情感列，也返回
+    if "appended_columns" in sentiment_result:
+        result_data["appended_columns"] = sentiment_result["appended_columns"]
+
+    return result_data
+
+
+def _check_column(file_path: str, column: str) -> Optional[JSONResponse]:
+    """
+    只根据列名和首行数据检查指定列是否存在、数据是否为空，不读取整个文件
+
+    Returns:
+        Optional[JSONResponse]: 检查不通过时的错误响应，否则为None
+    """
+    if column not in read_header(file_path):
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": f"列 '{column}' 不存在于数据文件中"
+            }
+        )
+
+    first_row = next(iter_column_chunks(file_path, [column], 1), None)
+    if first_row is None or first_row.empty:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": "数据文件为空"
+            }
+        )
+    return None
 
 
 @router.post("/{data_id}/wordcloud")
@@ -77,67 +184,24 @@ async def generate_wordcloud_endpoint(request: Request, data_id: str, body: Word
                 }
             )
 
-        # 加载CSV文件
-        success, result, status_code = load_csv_file(data_id, session_id)
-        if not success:
-            return JSONResponse(
-                status_code=status_code,
-                content={
-                    "success": False,
-                    "error": result
-                }
-            )
-
-        df = result
-
-        # 检查DataFrame是否为空
-        if df.empty:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "数据文件为空"
-                }
-            )
-
-        # 检查指定列是否存在
-        if body.column not in df.columns:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": f"列 '{body.column}' 不存在于数据文件中"
-                }
-            )
-
-        # 调用工具函数生成词云
-        wordcloud_result = generate_wordcloud(
-            file_path=file_path,
-            column=body.column,
-            session_id=session_id,
-            shape=body.shape,
-            word_gap=body.word_gap,
-            word_size_range=body.word_size_range,
-            rotate_step=body.rotate_step,
-            width=body.width,
-            height=body.height,
-            color=body.color,
-            max_words=body.max_words,
-            stopwords=body.stopwords
-        )
-
-        # 准备返回结果
-        result_data = {
-            "data_id": data_id,
-            "column": body.column,
-            "chart_path": wordcloud_result["chart_path"],  # 返回HTML文件路径
-            "top_words": wordcloud_result["top_words"],
-            "total_words": wordcloud_result["total_words"]
-        }
+        # 只读取列名检查列是否存在，词频索引按数据版本缓存，命中时无需读取数据
+        error_response = _check_column(file_path, body.column)
+        if error_response:
+            return error_response
+
+        # 后台任务模式：立即返回任务ID，通过 /nlp/jobs/{job_id}/stream 获取进度
+        if body.background:
+            job = submit_job("wordcloud", _run_wordcloud, {
+                "data_id": data_id, "file_path": file_path, "session_id": session_id, "body": body
+            }, session_id)
+            return JSONResponse(content={
+                "success": True,
+                "data": {"job_id": job.job_id, "status": job.status}
+            })
 
         return JSONResponse(content={
             "success": True,
-            "data": result_data
+            "data": _run_wordcloud(data_id, file_path, session_id, body)
         })
     except Exception as e:
         logger.error(f"生成词云时出错: {str(e)}")
@@ -179,68 +243,171 @@ async def analyze_sentiment_endpoint(request: Request, data_id: str, body: Senti
                 }
             )
 
-        # 加载CSV文件
-        success, result, status_code = load_csv_file(data_id, session_id)
-        if not success:
-            return JSONResponse(
-                status_code=status_code,
-                content={
-                    "success": False,
-                    "error": result
-                }
-            )
+        # 只读取列名和首行做检查，完整数据在任务中读取，后台模式下请求可立即返回
+        error_response = _check_column(file_path, body.column)
+        if error_response:
+            return error_response
+
+        # 后台任务模式：立即返回任务ID，通过 /nlp/jobs/{job_id}/stream 获取进度
+        if body.background:
+            job = submit_job("sentiment", _run_sentiment, {
+                "data_id": data_id, "file_path": file_path, "session_id": session_id, "body": body
+            }, session_id)
+            return JSONResponse(content={
+                "success": True,
+                "data": {"job_id": job.job_id, "status": job.status}
+            })
 
-        df = result
+        return JSONResponse(content={
+            "success": True,
+            "data": _run_sentiment(data_id, file_path, session_id, body)
+        })
+    except Exception as e:
+        logger.error(f"情感分析时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
 
-        # 检查DataFrame是否为空
-        if df.empty:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "数据文件为空"
-                }
-            )
 
-        # 检查指定列是否存在
-        if body.column not in df.columns:
+@router.post("/{data_id}/keywords")
+async def keyword_analysis_endpoint(request: Request, data_id: str, body: KeywordAnalysisRequest):
+    """
+    关键词与n-gram分析接口，稀疏词频矩阵按数据版本缓存，重复请求无需重新分词
+
+    Args:
+        request: FastAPI请求对象
+        data_id: 数据文件ID
+        body: 关键词分析请求参数
+
+    Returns:
+        JSONResponse: TF-IDF关键词、二元词组频率及分组用词比较结果
+    """
+    try:
+        # 获取session_id
+        session_id = request.state.session_id
+
+        # 获取文件路径
+        file_path = get_file_path(data_id, session_id)
+
+        if not os.path.exists(file_path):
             return JSONResponse(
-                status_code=400,
+                status_code=404,
                 content={
                     "success": False,
-                    "error": f"列 '{body.column}' 不存在于数据文件中"
+                    "error": f"文件不存在: {file_path}"
                 }
             )
 
-        # 调用工具函数进行情感分析
-        sentiment_result = analyze_sentiment(
+        # 调用工具函数进行关键词分析（只读取需要的列）
+        keyword_result = keyword_analysis(
             file_path=file_path,
             column=body.column,
             session_id=session_id,
+            top_k=body.top_k,
             stopwords=body.stopwords,
-            internet_slang=body.internet_slang
+            group_by=body.group_by,
+            min_length=body.min_length
         )
 
         # 准备返回结果
-        result_data = {
-            "data_id": data_id,
-            "column": body.column,
-            "sentiment_ratios": sentiment_result["sentiment_ratios"],
-            "statistics": sentiment_result["statistics"],
-            "sentiment_counts": sentiment_result["sentiment_counts"],
-            "echarts_data": sentiment_result["echarts_data"]
-        }
+        result_data = {"data_id": data_id, **keyword_result}
 
         return JSONResponse(content={
             "success": True,
             "data": result_data
         })
     except Exception as e:
-        logger.error(f"情感分析时出错: {str(e)}")
+        logger.error(f"关键词分析时出错: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={
                 "success": False,
                 "error": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(request: Request, job_id: str):
+    """
+    查询后台任务状态接口
+    """
+    job = get_job(job_id, request.state.session_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": "任务不存在"
+            }
+        )
+
+    return JSONResponse(content={
+        "success": True,
+        "data": job.snapshot()
+    })
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_job_progress(request: Request, job_id: str):
+    """
+    以SSE流式返回后台任务进度（已处理条数、预计剩余时间、阶段性结果），任务结束时返回最终结果
+    """
+    job = get_job(job_id, request.state.session_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": "任务不存在"
+            }
+        )
+
+    async def generate():
+        last_state = None
+        while True:
+            snapshot = job.snapshot()
+            state = (snapshot["status"], snapshot["processed"])
+            if state != last_state:
+                last_state = state
+                yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+            if job.finished:
+                yield "data: [DONE]\n\n"
+                break
+
+            # 客户端断开后停止推送，任务本身继续执行
+            if await request.is_disconnected():
+                break
+
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: str):
+    """
+    取消后台任务接口，正在执行的任务会在下一次上报进度时停止
+    """
+    job = get_job(job_id, request.state.session_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": "任务不存在"
+            }
+        )
+
+    if not job.finished:
+        job.cancel()
+
+    return JSONResponse(content={
+        "success": True,
+        "data": {"job_id": job.job_id, "status": job.status, "cancel_requested": job.cancel_requested}
+    })
@@ -0,0 +1,156 @@
+import sys
+import os
+
+# 添加项目根目录到sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+import logging
+from pydantic import BaseModel
+
+from utils.file_manager import get_file_path
+from utils.transformer_registry import list_transformers, get_transformer_info, delete_transformer, apply_transformer
+
+router = APIRouter(prefix="/transformers", tags=["transformers"])
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ApplyTransformerRequest(BaseModel):
+    """
+    重放预处理请求模型
+    """
+    data_id: str  # 待处理的数据文件ID
+
+
+@router.get("")
+async def get_transformers(request: Request):
+    """
+    获取当前会话已保存的预处理器列表接口
+    """
+    try:
+        transformers = list_transformers(request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "data": transformers
+        })
+    except Exception as e:
+        logger.error(f"获取预处理器列表时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.get("/{transformer_id}")
+async def get_transformer(request: Request, transformer_id: str):
+    """
+    获取预处理器信息接口
+    """
+    try:
+        info = get_transformer_info(transformer_id, request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "data": info
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"获取预处理器信息时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.delete("/{transformer_id}")
+async def remove_transformer(request: Request, transformer_id: str):
+    """
+    删除预处理器接口
+    """
+    try:
+        delete_transformer(transformer_id, request.state.session_id)
+        return JSONResponse(content={
+            "success": True,
+            "message": "预处理器已删除"
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"删除预处理器时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+
+
+@router.post("/{transformer_id}/apply")
+async def apply_transformer_endpoint(request: Request, transformer_id: str, body: ApplyTransformerRequest):
+    """
+    使用已保存的预处理器对新数据重放同样的变换接口，无需重新拟合
+    """
+    try:
+        # 获取session_id
+        session_id = request.state.session_id
+
+        # 获取文件路径
+        file_path = get_file_path(body.data_id, session_id)
+
+        if not os.path.exists(file_path):
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "success": False,
+                    "error": f"文件不存在: {file_path}"
+                }
+            )
+
+        result = apply_transformer(transformer_id, file_path, session_id)
+
+        return JSONResponse(content={
+            "success": True,
+            "data": result
+        })
+    except FileNotFoundError as e:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
+    except Exception as e:
+        logger.error(f"重放预处理时出错: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": str(e)
+            }
+        )
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.pandas_tool.linear_regression import linear_regression
+from utils.pandas_tool.streaming_ols import streaming_ols
+
+
+@pytest.fixture
+def offset_csv(tmp_path, monkeypatch):
+    """目标值整体偏移约1e6、噪声标准差0.01的数据"""
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.RandomState(0)
+    n = 20000
+    x1 = rng.normal(size=n)
+    x2 = rng.uniform(0, 10, size=n)
+    y = 1e6 + 0.5 * x1 - 0.02 * x2 + rng.normal(scale=0.01, size=n)
+    file_path = tmp_path / "offset.csv"
+    pd.DataFrame({"x1": x1, "x2": x2, "y": y}).to_csv(file_path, index=False)
+    return str(file_path), np.column_stack([x1, x2]), y
+
+
+def test_streaming_ols_large_offset_target(offset_csv):
+    file_path, X, y = offset_csv
+    streaming = streaming_ols(file_path, ["x1", "x2"], "y", chunksize=3000)
+    in_memory = linear_regression(file_path, ["x1", "x2"], "y", streaming=False, save_model=False)
+
+    for col in ("x1", "x2"):
+        assert streaming["coefficients"][col] == pytest.approx(in_memory["coefficients"][col], rel=1e-6)
+    assert streaming["intercept"] == pytest.approx(in_memory["intercept"], rel=1e-12)
+    for metric in ("mse", "r2_score"):
+        assert streaming["evaluation_metrics"][metric] == pytest.approx(
+            in_memory["evaluation_metrics"][metric], rel=1e-4)
+    assert streaming["evaluation_metrics"]["mse"] == pytest.approx(1e-4, rel=0.05)
+    assert streaming["evaluation_metrics"]["r2_score"] < 1.0
+
+    # 标准误与按中心化数据直接计算的结果一致
+    design = np.column_stack([X - X.mean(axis=0), np.ones(len(X))])
+    beta, *_ = np.linalg.lstsq(design, y - y.mean(), rcond=None)
+    residuals = y - y.mean() - design @ beta
+    sigma2 = residuals @ residuals / (len(y) - design.shape[1])
+    std_errors = np.sqrt(np.diag(np.linalg.inv(design.T @ design)) * sigma2)
+    for i, col in enumerate(("x1", "x2")):
+        statistics = streaming["statistics"][col]
+        assert statistics["std_error"] == pytest.approx(std_errors[i], rel=1e-4)
+        assert statistics["t_value"] is not None
+
+
+def test_streaming_ols_without_intercept_matches_in_memory(offset_csv):
+    file_path, _, _ = offset_csv
+    streaming = streaming_ols(file_path, ["x1", "x2"], "y", fit_intercept=False, chunksize=3000)
+    in_memory = linear_regression(file_path, ["x1", "x2"], "y", streaming=False, save_model=False,
+                                  fit_intercept=False)
+
+    for col in ("x1", "x2"):
+        assert streaming["coefficients"][col] == pytest.approx(in_memory["coefficients"][col], rel=1e-6)
+    for metric in ("mse", "r2_score"):
+        assert streaming["evaluation_metrics"][metric] == pytest.approx(
+            in_memory["evaluation_metrics"][metric], rel=1e-6)
@@ -0,0 +1,151 @@
+"""
+缓存管理工具
+按 (数据集版本, 参数) 缓存中间计算结果，避免对同一份数据重复进行耗时计算
+"""
+
+import os
+import hashlib
+import pickle
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable
+
+from utils.file_manager import get_file_version
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 数据目录
+DATA_DIR = "data"
+
+# 缓存子目录名称（位于session目录下，随session一起被定期清理）
+CACHE_DIR_NAME = ".cache"
+
+# 内存缓存的最大条目数
+MEMORY_CACHE_SIZE = 32
+
+_memory_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_dataset_version(file_path: str) -> str:
+    """
+    获取数据集版本标识，文件被重写或追加新列后版本随之变化
+
+    Args:
+        file_path (str): 数据文件路径
+
+    Returns:
+        str: 由修改时间和文件大小组成的版本字符串
+    """
+    return get_file_version(file_path)
+
+
+def make_cache_key(file_path: str, *parts) -> str:
+    """
+    生成缓存键，绑定文件路径、数据集版本以及任意附加参数
+
+    Args:
+        file_path (str): 数据文件路径
+        *parts: 影响计算结果的其他参数（如列名、方法等）
+
+    Returns:
+        str: 缓存键
+    """
+    raw = "|".join([os.path.abspath(file_path), get_dataset_version(file_path)] + [repr(p) for p in parts])
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def get_cache_dir(namespace: str, session_id: str = None) -> str:
+    """
+    获取缓存目录，支持session隔离
+    """
+    base_dir = os.path.join(DATA_DIR, session_id) if session_id else DATA_DIR
+    cache_dir = os.path.join(base_dir, CACHE_DIR_NAME, namespace)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def load_cache(namespace: str, key: str, session_id: str = None, persist: bool = True) -> Any:
+    """
+    读取缓存，优先读取内存缓存，其次读取磁盘缓存
+
+    Returns:
+        Any: 缓存的对象，未命中时返回None
+    """
+    memory_key = (namespace, key)
+    with _lock:
+        if memory_key in _memory_cache:
+            _memory_cache.move_to_end(memory_key)
+            return _memory_cache[memory_key]
+
+    if not persist:
+        return None
+
+    cache_path = os.path.join(get_cache_dir(namespace, session_id), f"{key}.pkl")
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "rb") as f:
+            value = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"读取缓存失败 {cache_path}: {e}")
+        return None
+
+    _remember(memory_key, value)
+    return value
+
+
+def save_cache(namespace: str, key: str, value: Any, session_id: str = None, persist: bool = True):
+    """
+    写入缓存，同时写入内存缓存和磁盘缓存
+    """
+    _remember((namespace, key), value)
+
+    if not persist:
+        return
+
+    cache_dir = get_cache_dir(namespace, session_id)
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"写入缓存失败 {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_or_build(namespace: str, key: str, builder: Callable[[], Any],
+                 session_id: str = None, persist: bool = True) -> Any:
+    """
+    读取缓存，未命中时调用builder构建并写入缓存
+
+    Args:
+        namespace (str): 缓存命名空间
+        key (str): 缓存键
+        builder (Callable): 缓存未命中时用于构建结果的函数
+        session_id (str): 用户会话ID
+        persist (bool): 是否持久化到磁盘
+
+    Returns:
+        Any: 缓存或新构建的对象
+    """
+    value = load_cache(namespace, key, session_id, persist)
+    if value is None:
+        value = builder()
+        save_cache(namespace, key, value, session_id, persist)
+    return value
+
+
+def _remember(memory_key: tuple, value: Any):
+    """写入内存缓存，超出容量时淘汰最久未使用的条目"""
+    with _lock:
+        _memory_cache[memory_key] = value
+        _memory_cache.move_to_end(memory_key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
@@ -0,0 +1,157 @@
+"""
+数据清洗流水线
+按顺序在内存中执行多个清洗操作，整个流程只读取一次文件、写出一次结果
+"""
+
+import os
+import time
+from typing import Any, Dict, List
+
+from utils.file_manager import (read_any_file, generate_new_file_path, ensure_data_dir, ensure_session_dir,
+                                remove_invalid_samples_frame, handle_missing_values_frame)
+from utils.pandas_tool.dimensionless_processing import dimensionless_processing_frame
+from utils.pandas_tool.one_hot_encoding import one_hot_encoding_frame
+from utils.transformer_registry import register_transformer
+
+# 流水线支持的操作
+PIPELINE_OPERATIONS = ("remove_invalid_samples", "handle_missing_values", "dimensionless_processing",
+                       "one_hot_encoding")
+
+# 只适用于单独调用的参数（分块处理、稀疏输出等需要直接读写文件）
+_UNSUPPORTED_PARAMS = {
+    "remove_invalid_samples": ("streaming", "chunksize"),
+    "dimensionless_processing": ("streaming", "chunksize"),
+    "one_hot_encoding": ("output_format",)
+}
+
+
+def _validate_steps(steps: List[Dict[str, Any]]):
+    """在读取数据前检查所有步骤，避免执行到一半才发现参数错误"""
+    if not steps:
+        raise ValueError("流水线至少需要一个操作")
+    for index, step in enumerate(steps):
+        operation = step.get("operation")
+        if operation not in PIPELINE_OPERATIONS:
+            raise ValueError(f"第{index + 1}步不支持的操作: {operation}，可选 {list(PIPELINE_OPERATIONS)}")
+        params = step.get("params") or {}
+        unsupported = [name for name in _UNSUPPORTED_PARAMS.get(operation, ()) if name in params]
+        if unsupported:
+            raise ValueError(f"第{index + 1}步 ({operation}) 在流水线中不支持参数: {unsupported}")
+        if operation in ("dimensionless_processing", "one_hot_encoding") and not params.get("columns"):
+            raise ValueError(f"第{index + 1}步 ({operation}) 没有指定列")
+
+
+def _run_step(df, operation: str, params: Dict[str, Any]) -> tuple:
+    """
+    执行单个操作
+
+    Returns:
+        tuple: (df, result, transformer) transformer为可保存的拟合参数，没有时为None
+    """
+    params = dict(params)
+    if operation == "remove_invalid_samples":
+        df, cleaning_stats = remove_invalid_samples_frame(df, **params)
+        return df, {"cleaning_stats": cleaning_stats}, None
+
+    if operation == "handle_missing_values":
+        df, filling_stats = handle_missing_values_frame(df, **params)
+        result = {
+            "missing_filled_count": int(filling_stats['missing_filled']),
+            "cols_filled": filling_stats['cols_filled'],
+            "remaining_missing_count": int(filling_stats['total_missing_after'])
+        }
+        transformer = {
+            "method": params.get("interpolation_method", "linear"),
+            "columns": filling_stats['columns_processed'],
+            "state": filling_stats['fitted'],
+            "params": {"fill_value": params.get("fill_value"), "knn_neighbors": params.get("knn_neighbors", 5),
+                       "knn_backend": params.get("knn_backend", "index")}
+        }
+        return df, result, transformer
+
+    if operation == "dimensionless_processing":
+        columns = params.pop("columns")
+        method = params.pop("method", "standard")
+        df, processed_columns, state = dimensionless_processing_frame(df, columns, method, **params)
+        transformer = {"method": method, "columns": processed_columns, "state": state, "params": params}
+        return df, {"processed_columns": processed_columns, "method": method}, transformer
+
+    columns = params.pop("columns")
+    drop_first = params.pop("drop_first", False)
+    df, info, state = one_hot_encoding_frame(df, columns, drop_first, **params)
+    transformer = {"method": "one_hot", "columns": list(columns), "state": state,
+                   "params": {"drop_first": drop_first, "output_format": "dense"}}
+    return df, info, transformer
+
+
+def run_cleaning_pipeline(file_path: str, steps: List[Dict[str, Any]], session_id: str = None,
+                          save_transformers: bool = True) -> Dict[str, Any]:
+    """
+    清洗流水线 - 读取一次数据，按顺序在内存中执行多个操作，最后写出一次结果
+
+    Args:
+        file_path (str): 文件路径
+        steps (List[Dict[str, Any]]): 按顺序执行的操作，每个操作为 {"operation": 操作名, "params": 参数}
+            - "remove_invalid_samples": 参数同remove_invalid_samples（不支持streaming）
+            - "handle_missing_values": 参数同handle_missing_values
+            - "dimensionless_processing": columns, method 及方法参数（不支持streaming）
+            - "one_hot_encoding": columns, drop_first（只支持稠密输出）
+        session_id (str): 会话ID
+        save_transformers (bool): 是否保存各步拟合得到的参数，以便对新数据单独重放
+
+    Returns:
+        Dict[str, Any]: 包含 data_id, saved_path, 最终的行列数，读取、写出和每一步的耗时及结果
+    """
+    ensure_data_dir()
+
+    if session_id:
+        ensure_session_dir(session_id)
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    _validate_steps(steps)
+
+    start = time.perf_counter()
+    df = read_any_file(file_path)
+    read_seconds = time.perf_counter() - start
+
+    step_results = []
+    for index, step in enumerate(steps):
+        operation = step["operation"]
+        start = time.perf_counter()
+        try:
+            df, result, transformer = _run_step(df, operation, step.get("params") or {})
+        except Exception as e:
+            raise ValueError(f"第{index + 1}步 ({operation}) 执行失败: {e}") from e
+        seconds = time.perf_counter() - start
+
+        if save_transformers and transformer is not None:
+            result["transformer_id"] = register_transformer(
+                operation, transformer["method"], transformer["columns"], transformer["state"],
+                session_id, source_file=file_path, params=transformer["params"])
+
+        step_results.append({
+            "step": index + 1,
+            "operation": operation,
+            "seconds": round(seconds, 4),
+            "rows": int(df.shape[0]),
+            "columns": int(df.shape[1]),
+            "result": result
+        })
+
+    start = time.perf_counter()
+    new_filename, new_file_path = generate_new_file_path(file_path, session_id)
+    df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
+    write_seconds = time.perf_counter() - start
+
+    return {
+        "data_id": new_filename,
+        "saved_path": new_file_path,
+        "rows": int(df.shape[0]),
+        "columns": int(df.shape[1]),
+        "read_seconds": round(read_seconds, 4),
+        "write_seconds": round(write_seconds, 4),
+        "total_seconds": round(read_seconds + write_seconds + sum(step["seconds"] for step in step_results), 4),
+        "steps": step_results
+    }
@@ -1,12 +1,28 @@
 import os
+import json
+import shutil
 import uuid
-from typing import Any, List
+import hashlib
+from typing import Any, Iterator, List
 
+import numpy as np
 import pandas as pd
 from sklearn.impute import KNNImputer
 
+from utils.knn_imputation import knn_impute, KNN_MAX_DONORS
+from utils.transformer_registry import register_transformer
+
 DATA_DIR = "data"
 
+# 追加列的存放目录（位于数据文件所在目录下，按data_id分子目录）
+APPENDED_COLUMNS_DIR = ".columns"
+
+# 分块读取时每块的行数
+READ_CHUNK_SIZE = 100000
+
+# 文件超过该大小（字节）时去除无效样本自动改为分块处理
+STREAMING_FILE_SIZE = 256 * 1024 * 1024
+
 
 def ensure_data_dir():
     """确保 data 目录存在"""
@@ -23,13 +39,17 @@ def ensure_session_dir(session_id: str):
 def read_any_file(file_path: str) -> pd.DataFrame:
     """
     自动识别 CSV / Excel 文件并读取。
-    CSV 使用 utf-8-sig 防止 BOM 和乱码。
+    CSV 使用 utf-8-sig 防止 BOM 和乱码，并自动拼接通过 append_columns 追加的列。
     项目实际运行时会把用户上传的文件转成csv因此用不到，该方法主要用于单元测试
     """
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext in [".csv", ".txt"]:
-        return pd.read_csv(file_path, encoding="utf-8-sig")
+        df = pd.read_csv(file_path, encoding="utf-8-sig")
+        manifest = _load_columns_manifest(file_path)
+        if manifest:
+            df = _attach_appended_columns(file_path, manifest, df)
+        return df
 
     elif ext in [".xlsx", ".xls"]:
         # 读取Excel文件的第一个工作表
@@ -39,6 +59,231 @@ def read_any_file(file_path: str) -> pd.DataFrame:
         raise ValueError(f"不支持的文件格式：{ext}")
 
 
+def read_header(file_path: str) -> List[str]:
+    """
+    只读取列名，CSV 文件包含通过 append_columns 追加的列，不解析数据行
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext in [".csv", ".txt"]:
+        header = list(pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns)
+        return header + [col for col in _appended_column_names(_load_columns_manifest(file_path))
+                         if col not in header]
+
+    return list(read_any_file(file_path).columns)
+
+
+def read_columns(file_path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    只读取指定的列，CSV 文件通过 usecols 跳过无关列的解析
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext in [".csv", ".txt"]:
+        manifest = _load_columns_manifest(file_path)
+        appended = _appended_column_names(manifest)
+        header = list(pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns) + appended
+        missing_columns = [col for col in columns if col not in header]
+        if missing_columns:
+            raise ValueError(f"以下列不存在于数据集中: {missing_columns}")
+
+        base_columns = [col for col in columns if col not in appended]
+        if base_columns:
+            df = pd.read_csv(file_path, encoding="utf-8-sig", usecols=base_columns)
+        else:
+            df = pd.DataFrame(index=pd.RangeIndex(manifest["rows"]))
+        if manifest:
+            df = _attach_appended_columns(file_path, manifest, df, columns)
+        return df[columns]
+
+    df = read_any_file(file_path)
+    missing_columns = [col for col in columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"以下列不存在于数据集中: {missing_columns}")
+    return df[columns]
+
+
+def iter_column_chunks(file_path: str, columns: List[str], chunksize: int = READ_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    分块读取指定的列，内存占用只与块大小有关；追加列与原数据按行对齐逐块拼接
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext not in [".csv", ".txt"]:
+        df = read_columns(file_path, columns)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+        return
+
+    manifest = _load_columns_manifest(file_path)
+    appended = _appended_column_names(manifest)
+    header = list(pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns) + appended
+    missing_columns = [col for col in columns if col not in header]
+    if missing_columns:
+        raise ValueError(f"以下列不存在于数据集中: {missing_columns}")
+
+    readers = []
+    base_columns = [col for col in columns if col not in appended]
+    if base_columns:
+        readers.append(pd.read_csv(file_path, encoding="utf-8-sig", usecols=base_columns, chunksize=chunksize))
+
+    if manifest:
+        # 同名追加列以最后一次追加的为准
+        sources = {}
+        for part in manifest["parts"]:
+            for col in part["columns"]:
+                if col in columns:
+                    sources[col] = part["file"]
+        columns_dir = get_appended_columns_dir(file_path)
+        for part_file in dict.fromkeys(sources.values()):
+            part_columns = [col for col, source in sources.items() if source == part_file]
+            readers.append(pd.read_csv(os.path.join(columns_dir, part_file), encoding="utf-8-sig",
+                                       usecols=part_columns, chunksize=chunksize))
+
+    for chunks in zip(*readers):
+        index = chunks[0].index
+        chunk = pd.concat([part.reset_index(drop=True) for part in chunks], axis=1)
+        chunk.index = index
+        yield chunk[columns]
+
+
+def _stat_version(path: str) -> str:
+    """由修改时间和文件大小组成的版本字符串"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def get_appended_columns_dir(file_path: str) -> str:
+    """
+    获取数据文件的追加列目录：<数据目录>/.columns/<data_id>
+    """
+    directory, filename = os.path.split(file_path)
+    return os.path.join(directory, APPENDED_COLUMNS_DIR, os.path.splitext(filename)[0])
+
+
+def get_file_version(file_path: str) -> str:
+    """
+    获取数据文件版本，数据文件被重写或追加新列后版本都会变化
+    """
+    version = _stat_version(file_path)
+    manifest_path = os.path.join(get_appended_columns_dir(file_path), "manifest.json")
+    if os.path.exists(manifest_path):
+        version = f"{version}+{_stat_version(manifest_path)}"
+    return version
+
+
+def _load_columns_manifest(file_path: str):
+    """
+    读取追加列清单。数据文件在追加之后被重写时（重写的内容已包含追加列），清单失效并被删除
+
+    Returns:
+        dict: 清单内容，不存在或已失效时返回None
+    """
+    columns_dir = get_appended_columns_dir(file_path)
+    manifest_path = os.path.join(columns_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if not os.path.exists(file_path) or manifest.get("base_version") != _stat_version(file_path):
+        shutil.rmtree(columns_dir, ignore_errors=True)
+        return None
+    return manifest
+
+
+def _appended_column_names(manifest: dict) -> List[str]:
+    """按首次追加的顺序返回追加列名"""
+    if not manifest:
+        return []
+    names = []
+    for part in manifest["parts"]:
+        names.extend(col for col in part["columns"] if col not in names)
+    return names
+
+
+def _attach_appended_columns(file_path: str, manifest: dict, df: pd.DataFrame,
+                             columns: List[str] = None) -> pd.DataFrame:
+    """将追加列拼接到数据上，后追加的同名列覆盖先前的值"""
+    if manifest["rows"] != len(df):
+        print(f"警告: 追加列行数({manifest['rows']})与数据行数({len(df)})不一致，已忽略追加列")
+        return df
+
+    columns_dir = get_appended_columns_dir(file_path)
+    for part in manifest["parts"]:
+        wanted = [col for col in part["columns"] if columns is None or col in columns]
+        if not wanted:
+            continue
+        part_df = pd.read_csv(os.path.join(columns_dir, part["file"]), encoding="utf-8-sig", usecols=wanted)
+        for col in wanted:
+            df[col] = part_df[col].to_numpy()
+    return df
+
+
+def append_columns(file_path: str, new_columns: pd.DataFrame) -> dict:
+    """
+    以追加方式为数据文件新增列：只写入新列本身，不重写原数据文件。
+    读取数据时 read_any_file / read_columns 会自动拼接这些列
+
+    Args:
+        file_path (str): 数据文件路径
+        new_columns (pd.DataFrame): 新增的列，行数与行顺序需与数据文件一致
+
+    Returns:
+        dict: 追加的列名和存放目录
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    manifest = _load_columns_manifest(file_path) or {
+        "base_version": _stat_version(file_path),
+        "rows": len(new_columns),
+        "parts": []
+    }
+    if manifest["rows"] != len(new_columns):
+        raise ValueError(f"新增列的行数({len(new_columns)})与数据行数({manifest['rows']})不一致")
+
+    columns_dir = get_appended_columns_dir(file_path)
+    os.makedirs(columns_dir, exist_ok=True)
+
+    # 写入新列
+    part_file = f"part_{len(manifest['parts'])}.csv"
+    new_columns.to_csv(os.path.join(columns_dir, part_file), index=False, encoding="utf-8-sig")
+
+    # 更新清单（先写临时文件再替换，避免读到不完整的清单）
+    manifest["parts"].append({"file": part_file, "columns": [str(col) for col in new_columns.columns]})
+    manifest_path = os.path.join(columns_dir, "manifest.json")
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    return {
+        "appended_columns": [str(col) for col in new_columns.columns],
+        "columns_dir": columns_dir
+    }
+
+
+def has_appended_columns(file_path: str) -> bool:
+    """数据文件是否存在尚未合并的追加列"""
+    return bool(_load_columns_manifest(file_path))
+
+
+def iter_csv_with_appended_columns(file_path: str, chunksize: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """
+    分块生成合并了追加列的CSV文本（例如用于下载），不改写数据文件本身，
+    避免数据版本变化导致基于该版本的缓存全部失效
+    """
+    columns = read_header(file_path)
+    first = True
+    for chunk in iter_column_chunks(file_path, columns, chunksize):
+        # 与to_csv(encoding="utf-8-sig")一致，在开头写入BOM
+        yield ("\ufeff" if first else "") + chunk.to_csv(index=False, header=first)
+        first = False
+    if first:
+        yield "\ufeff" + pd.DataFrame(columns=columns).to_csv(index=False)
+
+
 def get_file_path(data_id: str, session_id: str = None) -> str:
     """
     获取文件路径，支持session隔离
@@ -142,6 +387,7 @@ def delete_file(data_id: str, session_id: str = None):
     file_path = get_file_path(data_id, session_id)
     if os.path.exists(file_path):
         os.remove(file_path)
+    shutil.rmtree(get_appended_columns_dir(file_path), ignore_errors=True)
 
 def generate_new_file_path(file_path , session_id):
     original_filename = os.path.splitext(os.path.basename(file_path))[0]
@@ -212,39 +458,202 @@ def add_header_to_file(file_path: str, column_names: list, session_id: str = Non
     }
 
 
-def remove_invalid_samples(file_path: str, session_id: str = None,
-                           remove_duplicates: bool = False,
-                           remove_duplicate_cols: bool = False,
-                           remove_constant_cols: bool = False,
-                           row_missing_threshold: float = 1,
-                           col_missing_threshold: float = 1) -> dict:
+def _exact_numeric_parts(series: pd.Series):
     """
-    去除无效样本 - 处理重复数据和超出阈值的行列
+    将数值列拆为整数部分和非整数部分，用于精确比较和哈希：整数列（含布尔列）按int64保留全部精度，
+    浮点列中能精确表示为int64的整数值归入整数部分，其余值（小数、NaN、inf）留在浮点部分。
+    同一取值无论被推断为int还是float结果都相同，超过2^53的不同整数也不会因转为float64而合并
 
-    Args:
-        file_path (str): 文件路径
-        session_id (str): session_id
-        remove_duplicates (bool): 是否去除重复行
-        remove_duplicate_cols (bool): 是否删除重复列
-        remove_constant_cols (bool): 是否删除所有数据都相同的列
-        row_missing_threshold (float): 行缺失值阈值 (0-1之间)
-        col_missing_threshold (float): 列缺失值阈值 (0-1之间)
+    Returns:
+        pd.DataFrame: 包含 int, float 两列；不是数值列（或uint64超出int64范围）时返回None
+    """
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_complex_dtype(series):
+        return None
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        if pd.api.types.is_unsigned_integer_dtype(series) and series.max() > np.iinfo(np.int64).max:
+            return None
+        missing = series.isna().to_numpy()
+        ints = series.to_numpy(dtype=np.int64, na_value=0)
+        floats = np.where(missing, np.nan, 0.0)
+    else:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            integral = np.isfinite(values) & (values == np.floor(values)) & (np.abs(values) < 2.0 ** 63)
+        ints = np.where(integral, values, 0).astype(np.int64)
+        # 加0.0将-0.0规整为0.0，二者取值相等但字节不同
+        floats = np.where(integral, 0.0, values) + 0.0
+    return pd.DataFrame({"int": ints, "float": floats})
+
+
+def _column_fingerprint(series: pd.Series) -> tuple:
+    """
+    计算列的指纹：数值列按_exact_numeric_parts规整后哈希，使值相同但类型不同的列（如1与1.0）指纹一致，
+    其他列按原值哈希；逐行哈希后再对整列求摘要
+    """
+    parts = _exact_numeric_parts(series)
+    numeric = parts is not None
+    row_hashes = pd.util.hash_pandas_object(parts if numeric else series, index=False).to_numpy()
+    return numeric, hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+
+
+def _columns_equal(left: pd.Series, right: pd.Series, numeric: bool) -> bool:
+    """逐值确认两列相同（缺失值视为相等），用于排除指纹碰撞；数值列按整数精度比较"""
+    if numeric:
+        left, right = _exact_numeric_parts(left), _exact_numeric_parts(right)
+        return np.array_equal(left["int"].to_numpy(), right["int"].to_numpy()) and \
+            np.array_equal(left["float"].to_numpy(), right["float"].to_numpy(), equal_nan=True)
+    return np.array_equal(left.isna().to_numpy(), right.isna().to_numpy()) and \
+        np.array_equal(left.dropna().to_numpy(), right.dropna().to_numpy())
+
+
+def find_duplicate_columns(df: pd.DataFrame) -> List[str]:
+    """
+    查找重复列 - 按列计算哈希指纹分组，仅对指纹相同的候选列逐值确认，
+    复杂度为 O(行数×列数)，不转置数据、不改变列类型
 
     Returns:
-        dict: 处理结果和统计信息
+        List[str]: 需要删除的重复列（保留每组中第一次出现的列）
     """
-    # 确保数据目录存在
-    ensure_data_dir()
+    kept = {}
+    duplicates = []
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        numeric, digest = _column_fingerprint(series)
+        candidates = kept.setdefault((numeric, digest), [])
+        if any(_columns_equal(df.iloc[:, other], series, numeric) for other in candidates):
+            duplicates.append(position)
+        else:
+            candidates.append(position)
+    return [df.columns[position] for position in duplicates]
 
-    if session_id:
-        ensure_session_dir(session_id)
 
-    if not os.path.isfile(file_path):
-        raise FileNotFoundError(f"文件不存在: {file_path}")
+def _row_fingerprints(chunk: pd.DataFrame) -> np.ndarray:
+    """
+    计算每行的64位指纹。数值列按_exact_numeric_parts规整后哈希，避免分块读取时同一列在不同块中
+    被推断为int或float导致相同的行指纹不同，同时保留int64的全部精度
+    """
+    parts = {}
+    for position, col in enumerate(chunk.columns):
+        numeric_parts = _exact_numeric_parts(chunk[col])
+        if numeric_parts is None:
+            parts[(position, "value")] = chunk[col]
+        else:
+            parts[(position, "int")] = numeric_parts["int"].to_numpy()
+            parts[(position, "float")] = numeric_parts["float"].to_numpy()
+    return pd.util.hash_pandas_object(pd.DataFrame(parts, index=chunk.index), index=False).to_numpy()
 
-    # 读取文件
-    df = read_any_file(file_path)
 
+def _row_key(row: tuple) -> tuple:
+    """
+    用于逐值确认重复的行键：缺失值统一为None，整数保持为Python int（不转为float，避免丢失精度），
+    Python中int与float按数学值精确比较，因此1与1.0仍然相等
+    """
+    return tuple(None if pd.isna(value) else int(value) if isinstance(value, (int, np.integer))
+                 else float(value) if isinstance(value, (float, np.floating)) else value for value in row)
+
+
+def _streaming_remove_invalid_rows(file_path: str, output_path: str, remove_duplicates: bool,
+                                   row_missing_threshold: float, chunksize: int) -> dict:
+    """
+    分块去除重复行和缺失值超过阈值的行，不加载完整数据，内存占用主要为每行8字节的指纹
+
+    第一遍只计算每行的64位指纹，找出与前面某行指纹相同的候选重复行及其首次出现的行；
+    第二遍分块写出结果，只缓存被引用的首次出现行，对候选行逐值确认后才删除，
+    指纹碰撞但取值不同的行会被保留
+
+    Returns:
+        dict: 清洗统计信息，包含每块的重复行数
+    """
+    header = list(pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns)
+    columns = header + [col for col in _appended_column_names(_load_columns_manifest(file_path))
+                        if col not in header]
+
+    # 第一遍：计算指纹，定位候选重复行及其首次出现的行
+    candidate_rows = np.array([], dtype=np.int64)
+    first_rows = np.array([], dtype=np.int64)
+    if remove_duplicates:
+        fingerprints = np.concatenate(
+            [_row_fingerprints(chunk) for chunk in iter_column_chunks(file_path, columns, chunksize)]
+            or [np.array([], dtype=np.uint64)])
+        _, first_index, inverse = np.unique(fingerprints, return_index=True, return_inverse=True)
+        first_of_row = first_index[inverse.ravel()]
+        candidate_rows = np.flatnonzero(first_of_row != np.arange(len(fingerprints)))
+        first_rows = first_of_row[candidate_rows]
+        del fingerprints, first_of_row, inverse
+
+    anchor_rows = np.unique(first_rows)
+
+    # 第二遍：逐值确认并分块写出
+    cleaning_stats = {
+        'duplicates_removed': 0,
+        'duplicate_cols_removed': 0,
+        'constant_cols_removed': 0,
+        'rows_removed': 0,
+        'columns_removed': 0,
+        'hash_collisions': 0,
+        'chunks': []
+    }
+    anchors = {}
+    offset = 0
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8-sig", newline="") as f:
+        for chunk_number, chunk in enumerate(iter_column_chunks(file_path, columns, chunksize)):
+            n_rows = len(chunk)
+            keep = np.ones(n_rows, dtype=bool)
+
+            # 候选行与首次出现的行均按行号升序排列，用二分查找取出落在当前块内的部分
+            start, stop = np.searchsorted(anchor_rows, [offset, offset + n_rows])
+            positions = anchor_rows[start:stop] - offset
+            anchors.update(zip((positions + offset).tolist(),
+                               map(_row_key, chunk.iloc[positions].itertuples(index=False, name=None))))
+
+            start, stop = np.searchsorted(candidate_rows, [offset, offset + n_rows])
+            positions = candidate_rows[start:stop] - offset
+            rows = chunk.iloc[positions].itertuples(index=False, name=None)
+            for position, first, row in zip(positions.tolist(), first_rows[start:stop].tolist(), rows):
+                if _row_key(row) == anchors[first]:
+                    keep[position] = False
+                else:
+                    cleaning_stats['hash_collisions'] += 1
+
+            duplicates = int((~keep).sum())
+            chunk = chunk[keep]
+            missing_removed = 0
+            if row_missing_threshold < 1 and len(chunk.columns):
+                row_missing_ratio = chunk.isnull().sum(axis=1) / chunk.shape[1]
+                rows_before = len(chunk)
+                chunk = chunk[row_missing_ratio <= row_missing_threshold]
+                missing_removed = rows_before - len(chunk)
+
+            chunk.to_csv(f, index=False, header=chunk_number == 0)
+            cleaning_stats['duplicates_removed'] += duplicates
+            cleaning_stats['rows_removed'] += missing_removed
+            cleaning_stats['chunks'].append({
+                'chunk': chunk_number,
+                'rows': n_rows,
+                'duplicates_removed': duplicates,
+                'rows_removed': missing_removed
+            })
+            offset += n_rows
+
+        if offset == 0:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+
+    os.replace(temp_path, output_path)
+    return cleaning_stats
+
+
+def remove_invalid_samples_frame(df: pd.DataFrame, remove_duplicates: bool = False,
+                                 remove_duplicate_cols: bool = False,
+                                 remove_constant_cols: bool = False,
+                                 row_missing_threshold: float = 1,
+                                 col_missing_threshold: float = 1) -> tuple:
+    """
+    对内存中的数据去除无效样本，参数含义同remove_invalid_samples
+
+    Returns:
+        tuple: (df, cleaning_stats)
+    """
     # 记录处理统计信息
     cleaning_stats = {
         'duplicates_removed': 0,
@@ -263,7 +672,7 @@ def remove_invalid_samples(file_path: str, session_id: str = None,
     # 2. 删除重复列（如果启用）
     if remove_duplicate_cols:
         before_cols = len(df.columns)
-        df = df.T.drop_duplicates().T
+        df = df.drop(columns=find_duplicate_columns(df))
         cleaning_stats['duplicate_cols_removed'] = before_cols - len(df.columns)
 
     # 3. 删除所有数据都相同的列（如果启用）
@@ -290,6 +699,68 @@ def remove_invalid_samples(file_path: str, session_id: str = None,
         df = df.loc[:, col_missing_ratio <= col_missing_threshold]
         cleaning_stats['columns_removed'] = cols_before - len(df.columns)
 
+    return df, cleaning_stats
+
+
+def remove_invalid_samples(file_path: str, session_id: str = None,
+                           remove_duplicates: bool = False,
+                           remove_duplicate_cols: bool = False,
+                           remove_constant_cols: bool = False,
+                           row_missing_threshold: float = 1,
+                           col_missing_threshold: float = 1,
+                           streaming: bool = None,
+                           chunksize: int = READ_CHUNK_SIZE) -> dict:
+    """
+    去除无效样本 - 处理重复数据和超出阈值的行列
+
+    Args:
+        file_path (str): 文件路径
+        session_id (str): session_id
+        remove_duplicates (bool): 是否去除重复行
+        remove_duplicate_cols (bool): 是否删除重复列
+        remove_constant_cols (bool): 是否删除所有数据都相同的列
+        row_missing_threshold (float): 行缺失值阈值 (0-1之间)
+        col_missing_threshold (float): 列缺失值阈值 (0-1之间)
+        streaming (bool): 是否分块处理行（基于行指纹去重），None表示文件超过STREAMING_FILE_SIZE时自动启用；
+            列相关的操作需要完整数据，不能与分块处理同时使用
+        chunksize (int): 分块处理时每块的行数
+
+    Returns:
+        dict: 处理结果和统计信息
+    """
+    # 确保数据目录存在
+    ensure_data_dir()
+
+    if session_id:
+        ensure_session_dir(session_id)
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    column_operations = remove_duplicate_cols or remove_constant_cols or col_missing_threshold < 1
+    is_csv = os.path.splitext(file_path)[1].lower() in [".csv", ".txt"]
+    if streaming is None:
+        streaming = is_csv and not column_operations and os.path.getsize(file_path) > STREAMING_FILE_SIZE
+    if streaming:
+        if not is_csv:
+            raise ValueError("分块处理仅支持CSV文件")
+        if column_operations:
+            raise ValueError("分块处理只支持去除重复行和按缺失比例删除行，删除重复列、常量列或按缺失比例删除列需要完整数据")
+        new_filename, new_file_path = generate_new_file_path(file_path, session_id)
+        cleaning_stats = _streaming_remove_invalid_rows(
+            file_path, new_file_path, remove_duplicates, row_missing_threshold, chunksize)
+        return {
+            "data_id": new_filename,
+            "saved_path": new_file_path,
+            "cleaning_stats": cleaning_stats,
+        }
+
+    # 读取文件
+    df = read_any_file(file_path)
+    df, cleaning_stats = remove_invalid_samples_frame(df, remove_duplicates, remove_duplicate_cols,
+                                                      remove_constant_cols, row_missing_threshold,
+                                                      col_missing_threshold)
+
     new_filename,new_file_path = generate_new_file_path(file_path, session_id)
     df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
     """
@@ -312,11 +783,54 @@ def remove_invalid_samples(file_path: str, session_id: str = None,
     }
 
 
+def handle_missing_values_frame(df: pd.DataFrame, specified_columns: List[str] = None,
+                                interpolation_method: str = "linear", fill_value: Any = None,
+                                knn_neighbors: int = 5, knn_backend: str = "index",
+                                knn_max_donors: int = KNN_MAX_DONORS, fitted: dict = None) -> tuple:
+    """
+    对内存中的数据插补缺失值，参数含义同handle_missing_values
+
+    Returns:
+        tuple: (df, filling_stats) 其中filling_stats['fitted']为可重放的插补参数
+    """
+    # 确定要处理的列
+    if specified_columns is None:
+        # 未指定列，处理所有列
+        columns_to_process = df.columns.tolist()
+    else:
+        # 过滤出数据集中存在的列
+        columns_to_process = [col for col in specified_columns if col in df.columns]
+        missing_columns = set(specified_columns) - set(columns_to_process)
+        if missing_columns:
+            print(f"警告: 以下列不存在于数据集中: {missing_columns}")
+
+    # 记录处理统计信息
+    filling_stats = {
+        'missing_filled': 0,
+        'columns_processed': columns_to_process,
+        'cols_filled': {}
+    }
+
+    # 插值处理
+    df, stats = _interpolate_missing_values(df, columns_to_process, interpolation_method,
+                                            fill_value, knn_neighbors, knn_backend, knn_max_donors, fitted)
+
+    filling_stats['missing_filled'] = stats['missing_filled']
+    filling_stats['cols_filled'] = stats['cols_filled']
+    filling_stats['total_missing_after'] = df.isnull().sum().sum()
+    filling_stats['fitted'] = stats['fitted']
+    return df, filling_stats
+
+
 def handle_missing_values(file_path: str, session_id: str = None,
                           specified_columns: List[str] = None,
                           interpolation_method: str = "linear",
                           fill_value: Any = None,
-                          knn_neighbors: int = 5) -> dict:
+                          knn_neighbors: int = 5,
+                          knn_backend: str = "index",
+                          knn_max_donors: int = KNN_MAX_DONORS,
+                          save_transformer: bool = True,
+                          fitted: dict = None) -> dict:
     """
     对缺失数据进行插值
 
@@ -327,6 +841,13 @@ def handle_missing_values(file_path: str, session_id: str = None,
         interpolation_method (str): 插值方法 ("linear", "ffill", "bfill", "mean", "median", "mode", "knn", "constant")
         fill_value (Any): 当使用constant方法时的填充值
         knn_neighbors (int): KNN插值的邻居数量
+        knn_backend (str): KNN插值的实现
+            - "index": 在完整行上建立近邻索引，只查询含缺失值的行，适用于大数据 (默认)
+            - "sklearn": sklearn的KNNImputer，近邻可来自任意非缺失行，复杂度为O(n²)
+        knn_max_donors (int): "index"实现中作为近邻候选的行的最大数量（完整行不足时同样限制退回KNNImputer时拟合的行数）
+        save_transformer (bool): 是否保存填充值和近邻候选行，以便对新数据重放同样的插补；
+            linear、ffill、bfill只依赖数据本身的顺序，重放时直接在新数据上执行
+        fitted (dict): 已保存的插补参数（由预处理器注册表传入），传入时不重新计算填充值
 
     Returns:
         dict: 处理结果和统计信息
@@ -342,32 +863,8 @@ def handle_missing_values(file_path: str, session_id: str = None,
 
     # 读取文件
     df = read_any_file(file_path)
-
-    # 确定要处理的列
-    if specified_columns is None:
-        # 未指定列，处理所有列
-        columns_to_process = df.columns.tolist()
-    else:
-        # 过滤出数据集中存在的列
-        columns_to_process = [col for col in specified_columns if col in df.columns]
-        missing_columns = set(specified_columns) - set(columns_to_process)
-        if missing_columns:
-            print(f"警告: 以下列不存在于数据集中: {missing_columns}")
-
-    # 记录处理统计信息
-    filling_stats = {
-        'missing_filled': 0,
-        'columns_processed': columns_to_process,
-        'cols_filled': {}
-    }
-
-    # 插值处理
-    df, stats = _interpolate_missing_values(df, columns_to_process, interpolation_method,
-                                            fill_value, knn_neighbors)
-
-    filling_stats['missing_filled'] = stats['missing_filled']
-    filling_stats['cols_filled'] = stats['cols_filled']
-    filling_stats['total_missing_after'] = df.isnull().sum().sum()
+    df, filling_stats = handle_missing_values_frame(df, specified_columns, interpolation_method, fill_value,
+                                                    knn_neighbors, knn_backend, knn_max_donors, fitted)
 
     # 保存处理后的数据
     new_filename,new_file_path = generate_new_file_path(file_path, session_id)
@@ -387,7 +884,7 @@ def handle_missing_values(file_path: str, session_id: str = None,
         "saved_path": "data\\100\\x_edit.csv"
     }
     """
-    return {
+    result = {
         "processed_rows": df.shape[0],
         "processed_cols": df.shape[1],
         "remaining_missing_count": int(filling_stats['total_missing_after']),
@@ -396,33 +893,98 @@ def handle_missing_values(file_path: str, session_id: str = None,
         "data_id": new_filename,
         "saved_path": new_file_path,
     }
+    if save_transformer and fitted is None:
+        result["transformer_id"] = register_transformer(
+            "handle_missing_values", interpolation_method, filling_stats['columns_processed'],
+            filling_stats['fitted'],
+            session_id, source_file=file_path,
+            params={"fill_value": fill_value, "knn_neighbors": knn_neighbors, "knn_backend": knn_backend})
+    return result
+
+
+def _missing_fill_values(df: pd.DataFrame, columns: List[str], method: str, fill_value: Any) -> dict:
+    """
+    计算按固定值填充的列的填充值（数值列的均值、中位数、常量，分类列和时间列的常量），
+    不依赖行顺序的方法才能保存后对新数据重放；KNN插补的数值列和linear、ffill、bfill不在其中
+    """
+    fill_values = {}
+    for column in columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series):
+            match method:
+                case "knn" | "linear" | "ffill" | "bfill":
+                    continue
+                case "mean":
+                    fill_values[column] = series.mean()
+                case "median":
+                    fill_values[column] = series.median()
+                case "constant":
+                    fill_values[column] = fill_value if fill_value is not None else 0
+                case _:
+                    fill_values[column] = 0  # 默认填充值改为0，类似分类数据的默认处理
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            if method == "constant":
+                fill_values[column] = fill_value if fill_value is not None else pd.Timestamp.now()
+        elif method not in ("ffill", "bfill"):
+            if method == "constant":
+                fill_values[column] = fill_value if fill_value is not None else "Unknown"
+            else:
+                fill_values[column] = "Missing"
+    return fill_values
 
 
 
 def _interpolate_missing_values(df: pd.DataFrame, columns: List[str], method: str,
-                                fill_value: Any, knn_neighbors: int) -> tuple:
-    """插值处理缺失值"""
+                                fill_value: Any, knn_neighbors: int, knn_backend: str = "index",
+                                knn_max_donors: int = KNN_MAX_DONORS, fitted: dict = None) -> tuple:
+    """插值处理缺失值，传入fitted时使用已保存的填充值和近邻候选行"""
     df_copy = df.copy()
     total_filled = 0
     cols_filled = {}
+    fill_values = _missing_fill_values(df_copy, columns, method, fill_value)
+    if fitted:
+        fill_values.update(fitted.get('fill_values', {}))
+    new_fitted = {'fill_values': fill_values}
 
     # 如果使用KNN方法，需要特殊处理
     if method == "knn":
-        numeric_cols = [col for col in columns if pd.api.types.is_numeric_dtype(df_copy[col])]
+        # 全部缺失的列无法插值，保持原样
+        numeric_cols = [col for col in columns if pd.api.types.is_numeric_dtype(df_copy[col])
+                        and df_copy[col].notna().any()]
+        if fitted and fitted.get('knn_columns'):
+            # 重放时使用拟合时的列
+            numeric_cols = fitted['knn_columns']
         if numeric_cols:
             # 记录KNN处理前的缺失值数量
             original_null_counts = {}
             for col in numeric_cols:
                 original_null_counts[col] = df_copy[col].isnull().sum()
-            
-            knn_imputer = KNNImputer(n_neighbors=knn_neighbors)
-            df_copy[numeric_cols] = knn_imputer.fit_transform(df_copy[numeric_cols])
-            
+
+            if fitted and fitted.get('knn_columns'):
+                # 重放：使用拟合时的近邻候选行
+                X = df_copy[numeric_cols].to_numpy(dtype=float)
+                if fitted.get('knn_imputer') is not None:
+                    df_copy[numeric_cols] = fitted['knn_imputer'].transform(X)
+                else:
+                    df_copy[numeric_cols] = knn_impute(X, knn_neighbors, donor_values=fitted['knn_donors'])["values"]
+            elif knn_backend == "sklearn":
+                knn_imputer = KNNImputer(n_neighbors=knn_neighbors)
+                df_copy[numeric_cols] = knn_imputer.fit_transform(df_copy[numeric_cols])
+                new_fitted.update(knn_columns=numeric_cols, knn_imputer=knn_imputer)
+            elif knn_backend == "index":
+                imputed = knn_impute(df_copy[numeric_cols].to_numpy(dtype=float), knn_neighbors, knn_max_donors)
+                df_copy[numeric_cols] = imputed["values"]
+                new_fitted.update(knn_columns=numeric_cols, knn_donors=imputed.get("donors"),
+                                  knn_imputer=imputed.get("imputer"))
+            else:
+                raise ValueError(f"不支持的KNN插值实现: {knn_backend}")
+
             # 计算每列填充的缺失值数量
             for col in numeric_cols:
                 filled_count = original_null_counts[col] - df_copy[col].isnull().sum()
                 if filled_count > 0:  # 只记录实际填充了缺失值的列
                     cols_filled[col] = int(filled_count)
+                    total_filled += filled_count
 
     # 处理其他列
     for column in columns:
@@ -443,15 +1005,9 @@ def _interpolate_missing_values(df: pd.DataFrame, columns: List[str], method: st
                     df_copy[column] = df_copy[column].ffill(axis=0)
                 case "bfill":
                     df_copy[column] = df_copy[column].bfill(axis=0)
-                case "mean":
-                    df_copy[column] = df_copy[column].fillna(df_copy[column].mean())
-                case "median":
-                    df_copy[column] = df_copy[column].fillna(df_copy[column].median())
-                case "constant":
-                    fill_val = fill_value if fill_value is not None else 0
-                    df_copy[column] = df_copy[column].fillna(fill_val)
                 case _:
-                    df_copy[column] = df_copy[column].fillna(0)  # 默认填充值改为0，类似分类数据的默认处理
+                    # 均值、中位数、常量或默认的0，见_missing_fill_values
+                    df_copy[column] = df_copy[column].fillna(fill_values[column])
             
         elif pd.api.types.is_datetime64_any_dtype(df_copy[column]):
             # 时间型数据
@@ -463,8 +1019,7 @@ def _interpolate_missing_values(df: pd.DataFrame, columns: List[str], method: st
                 case "bfill":
                     df_copy[column] = df_copy[column].bfill(axis=0)
                 case "constant":
-                    fill_val = fill_value if fill_value is not None else pd.Timestamp.now()
-                    df_copy[column] = df_copy[column].fillna(fill_val)
+                    df_copy[column] = df_copy[column].fillna(fill_values[column])
                 case _:
                     df_copy[column] = df_copy[column].ffill(axis=0).bfill(axis=0)  # 默认使用前向后向填充
         
@@ -475,11 +1030,9 @@ def _interpolate_missing_values(df: pd.DataFrame, columns: List[str], method: st
                     df_copy[column] = df_copy[column].ffill(axis=0)
                 case "bfill":
                     df_copy[column] = df_copy[column].bfill(axis=0)
-                case "constant":
-                    fill_val = fill_value if fill_value is not None else "Unknown"
-                    df_copy[column] = df_copy[column].fillna(fill_val)
                 case _:
-                    df_copy[column] = df_copy[column].fillna("Missing")
+                    # 常量或默认的"Missing"
+                    df_copy[column] = df_copy[column].fillna(fill_values[column])
 
         filled_count = original_null_count - df_copy[column].isnull().sum()
         total_filled += filled_count
@@ -487,7 +1040,7 @@ def _interpolate_missing_values(df: pd.DataFrame, columns: List[str], method: st
         # 移除值为0的键值对
         cols_filled = {k: v for k, v in cols_filled.items() if v != 0}
 
-    return df_copy, {'missing_filled': total_filled, 'cols_filled': cols_filled}
+    return df_copy, {'missing_filled': total_filled, 'cols_filled': cols_filled, 'fitted': new_fitted}
 
 
 def _convert_to_serializable(x):
@@ -0,0 +1,189 @@
+"""
+后台任务管理工具
+在线程池中执行耗时分析任务，记录处理进度并支持中途取消
+"""
+
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 同时执行的后台任务数量
+MAX_WORKERS = 2
+
+# 已结束任务的保留时间（秒），超时后从任务表中移除
+FINISHED_JOB_TTL = 3600
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="analysis-job")
+_jobs: Dict[str, "Job"] = {}
+_jobs_lock = threading.Lock()
+
+
+class JobCancelledError(Exception):
+    """任务被用户取消时在进度回调中抛出，用于中断正在执行的分析"""
+
+
+class Job:
+    """
+    后台任务状态
+    status 取值: pending, running, completed, failed, cancelled
+    """
+
+    def __init__(self, task: str, session_id: str = None):
+        self.job_id = uuid.uuid4().hex
+        self.task = task
+        self.session_id = session_id
+        self.status = "pending"
+        self.processed = 0
+        self.total = None
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def update_progress(self, processed: int, total: int = None, partial: Any = None):
+        """
+        更新处理进度，作为分析函数的 progress_callback 使用
+
+        Raises:
+            JobCancelledError: 任务已被请求取消
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelledError("任务已取消")
+
+        with self._lock:
+            self.processed = processed
+            if total is not None:
+                self.total = total
+            if partial is not None:
+                self.partial = partial
+
+    def cancel(self):
+        """请求取消任务，正在执行的任务会在下一次上报进度时中断"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def snapshot(self) -> dict:
+        """
+        获取任务当前状态，包含进度比例和预计剩余时间
+        """
+        with self._lock:
+            now = self.finished_at or time.time()
+            elapsed = now - self.started_at if self.started_at else 0.0
+
+            progress = None
+            eta = None
+            if self.total:
+                progress = self.processed / self.total
+                if 0 < self.processed < self.total:
+                    eta = elapsed / self.processed * (self.total - self.processed)
+
+            data = {
+                "job_id": self.job_id,
+                "task": self.task,
+                "status": self.status,
+                "processed": self.processed,
+                "total": self.total,
+                "progress": progress,
+                "elapsed": round(elapsed, 3),
+                "eta": round(eta, 3) if eta is not None else None,
+                "partial": self.partial
+            }
+            if self.status == "completed":
+                data["result"] = self.result
+            elif self.status == "failed":
+                data["error"] = self.error
+            return data
+
+    def _run(self, func: Callable, kwargs: dict):
+        """在工作线程中执行任务"""
+        if self.cancel_requested:
+            self._finish("cancelled")
+            return
+
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+
+        try:
+            result = func(progress_callback=self.update_progress, **kwargs)
+            with self._lock:
+                self.result = result
+            self._finish("completed")
+        except JobCancelledError:
+            self._finish("cancelled")
+            logger.info(f"任务 {self.job_id} 已取消")
+        except Exception as e:
+            with self._lock:
+                self.error = str(e)
+            self._finish("failed")
+            logger.error(f"任务 {self.job_id} 执行出错: {e}")
+
+    def _finish(self, status: str):
+        with self._lock:
+            self.status = status
+            self.finished_at = time.time()
+            if self.started_at is None:
+                self.started_at = self.finished_at
+
+
+def submit_job(task: str, func: Callable, func_kwargs: dict, session_id: str = None) -> Job:
+    """
+    提交后台任务，func 需接受 progress_callback 关键字参数
+
+    Args:
+        task (str): 任务类型名称
+        func (Callable): 任务函数
+        func_kwargs (dict): 传给任务函数的参数
+        session_id (str): 任务所属的用户会话ID
+
+    Returns:
+        Job: 新建的任务
+    """
+    _remove_expired_jobs()
+
+    job = Job(task, session_id)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+    _executor.submit(job._run, func, func_kwargs)
+    return job
+
+
+def get_job(job_id: str, session_id: str = None) -> Job:
+    """
+    获取任务，session_id 不匹配时视为不存在
+
+    Returns:
+        Job: 任务对象，不存在时返回None
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None or job.session_id != session_id:
+        return None
+    return job
+
+
+def _remove_expired_jobs():
+    """移除结束时间超过保留时间的任务"""
+    expiration = time.time() - FINISHED_JOB_TTL
+    with _jobs_lock:
+        expired = [job_id for job_id, job in _jobs.items()
+                   if job.finished and job.finished_at < expiration]
+        for job_id in expired:
+            del _jobs[job_id]
@@ -0,0 +1,149 @@
+"""
+KNN缺失值插补工具
+只在完整行（所有参与列都不缺失）上建立近邻索引，仅查询含缺失值的行，替代复杂度为O(n²)的KNNImputer
+"""
+
+import os
+from typing import Dict, Any
+
+import numpy as np
+from sklearn.impute import KNNImputer
+from sklearn.neighbors import NearestNeighbors
+
+# 作为近邻候选的完整行的最大数量，超过时随机抽样
+KNN_MAX_DONORS = 50000
+
+# 每次查询的行数
+KNN_QUERY_CHUNK_SIZE = 10000
+
+# 查询的最大并行线程数
+MAX_KNN_JOBS = 4
+
+# 特征维度不超过该值时使用KD树，否则使用球树
+KD_TREE_MAX_DIMENSIONS = 15
+
+# 最多为多少种缺失模式单独建立近邻索引（按行数从多到少），其余模式的行用分块暴力搜索
+KNN_MAX_PATTERN_INDEXES = 32
+
+# 暴力搜索时每块距离矩阵的最大元素数
+KNN_BRUTE_FORCE_BLOCK = 2 ** 24
+
+
+def _brute_force_impute(X: np.ndarray, missing: np.ndarray, rows: np.ndarray, donor_values: np.ndarray,
+                        n_neighbors: int):
+    """
+    对缺失模式各不相同的行分块暴力搜索近邻：每行只在自身已观测的列上计算到完整行的欧氏距离，
+    展开为 Σm·x² - 2(m·x)Dᵀ + m(D²)ᵀ 后用矩阵乘法一次算出整块的距离，直接在X上填充
+    """
+    donor_squares = donor_values ** 2
+    block_rows = max(1, KNN_BRUTE_FORCE_BLOCK // max(len(donor_values), 1))
+    for start in range(0, len(rows), block_rows):
+        chunk = rows[start:start + block_rows]
+        observed = ~missing[chunk]
+        values = np.where(observed, X[chunk], 0.0)
+        distances = ((values ** 2).sum(axis=1)[:, None] - 2 * values @ donor_values.T
+                     + observed.astype(float) @ donor_squares.T)
+        if n_neighbors < len(donor_values):
+            neighbors = np.argpartition(distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        else:
+            neighbors = np.broadcast_to(np.arange(len(donor_values)), (len(chunk), len(donor_values)))
+        imputed = donor_values[neighbors].mean(axis=1)
+        X[chunk] = np.where(observed, X[chunk], imputed)
+
+
+def knn_impute(X: np.ndarray, n_neighbors: int = 5, max_donors: int = KNN_MAX_DONORS,
+               chunksize: int = KNN_QUERY_CHUNK_SIZE, n_jobs: int = None,
+               random_state: int = 42, donor_values: np.ndarray = None) -> Dict[str, Any]:
+    """
+    基于近邻索引的KNN插补
+
+    含缺失值的行按缺失模式分组，行数最多的KNN_MAX_PATTERN_INDEXES种模式各在完整行的已观测列上
+    建立一次KD树或球树索引，分块并行查询k个最近的完整行，用其均值填充缺失列；其余模式的行
+    按各自的缺失掩码与完整行分块计算距离（暴力搜索），避免缺失模式很多时反复建树；
+    全部列都缺失的行使用列均值填充。
+    距离与KNNImputer一致采用未标准化的欧氏距离，但近邻只从完整行中选取
+
+    Args:
+        X (np.ndarray): 数值矩阵，缺失值为NaN（每列至少有一个非缺失值）
+        n_neighbors (int): 近邻数量
+        max_donors (int): 作为近邻候选的行的最大数量（完整行不足时同样限制KNNImputer拟合的行数），
+            None表示不限制
+        chunksize (int): 每次查询的行数
+        n_jobs (int): 查询的并行线程数 (默认为CPU核数，最多4个)
+        random_state (int): 抽样随机种子
+        donor_values (np.ndarray): 已保存的近邻候选行，传入时不从X中选取（用于对新数据重放）
+
+    Returns:
+        Dict[str, Any]: 包含 values (填充后的矩阵), backend, n_donors, n_patterns,
+            以及 donors (近邻候选行) 或 imputer (完整行不足时拟合的KNNImputer)
+    """
+    X = np.array(X, dtype=float)
+    missing = np.isnan(X)
+    incomplete_rows = np.flatnonzero(missing.any(axis=1))
+
+    if donor_values is None:
+        donors = np.flatnonzero(~missing.any(axis=1))
+        if len(donors) < n_neighbors:
+            # 完整行不足时退回到逐列寻找近邻的KNNImputer，近邻候选同样最多取max_donors行，
+            # 使复杂度为O(行数×max_donors)而不是O(行数²)
+            fit_rows = np.arange(len(X))
+            if max_donors and len(X) > max_donors:
+                rng = np.random.RandomState(random_state)
+                fit_rows = rng.choice(len(X), max_donors, replace=False)
+                # 抽样中全部缺失的列补入一行该列有值的数据，否则KNNImputer会丢弃该列
+                empty_columns = np.flatnonzero(missing[fit_rows].all(axis=0))
+                extra_rows = [np.flatnonzero(~missing[:, j])[0] for j in empty_columns]
+                fit_rows = np.sort(np.unique(np.concatenate([fit_rows, extra_rows]).astype(np.int64)))
+            imputer = KNNImputer(n_neighbors=n_neighbors)
+            imputer.fit(X[fit_rows])
+            values = imputer.transform(X)
+            return {"values": values, "backend": "sklearn", "n_donors": len(fit_rows), "n_patterns": None,
+                    "imputer": imputer}
+
+        if max_donors and len(donors) > max_donors:
+            rng = np.random.RandomState(random_state)
+            donors = np.sort(rng.choice(donors, max_donors, replace=False))
+        donor_values = X[donors]
+        column_means = np.nanmean(X, axis=0)
+    else:
+        donor_values = np.asarray(donor_values, dtype=float)
+        column_means = donor_values.mean(axis=0)
+    n_neighbors = min(n_neighbors, len(donor_values))
+
+    if len(incomplete_rows) == 0:
+        return {"values": X, "backend": "index", "n_donors": len(donor_values), "n_patterns": 0,
+                "donors": donor_values}
+
+    n_jobs = n_jobs or min(os.cpu_count() or 1, MAX_KNN_JOBS)
+    patterns, pattern_codes = np.unique(missing[incomplete_rows], axis=0, return_inverse=True)
+    pattern_codes = pattern_codes.ravel()
+
+    # 行数多的模式建立索引，其余模式的行留给暴力搜索
+    pattern_sizes = np.bincount(pattern_codes, minlength=len(patterns))
+    indexed = np.zeros(len(patterns), dtype=bool)
+    indexed[np.argsort(-pattern_sizes, kind="stable")[:KNN_MAX_PATTERN_INDEXES]] = True
+    brute_rows = []
+
+    for code, pattern in enumerate(patterns):
+        rows = incomplete_rows[pattern_codes == code]
+        observed = ~pattern
+        if not observed.any():
+            X[np.ix_(rows, pattern)] = column_means[pattern]
+            continue
+        if not indexed[code]:
+            brute_rows.append(rows)
+            continue
+
+        algorithm = "kd_tree" if observed.sum() <= KD_TREE_MAX_DIMENSIONS else "ball_tree"
+        index = NearestNeighbors(n_neighbors=n_neighbors, algorithm=algorithm, n_jobs=n_jobs)
+        index.fit(donor_values[:, observed])
+        for start in range(0, len(rows), chunksize):
+            chunk = rows[start:start + chunksize]
+            neighbors = index.kneighbors(X[np.ix_(chunk, observed)], return_distance=False)
+            X[np.ix_(chunk, pattern)] = donor_values[:, pattern][neighbors].mean(axis=1)
+
+    if brute_rows:
+        _brute_force_impute(X, missing, np.sort(np.concatenate(brute_rows)), donor_values, n_neighbors)
+
+    return {"values": X, "backend": "index", "n_donors": len(donor_values), "n_patterns": len(patterns),
+            "donors": donor_values}
@@ -1,9 +1,11 @@
 from .logistic_regression import logistic_regression
-from .clustering import clustering_analysis
+from .clustering import clustering_analysis, clustering_k_sweep, dbscan_eps_estimation
 
 __all__ = [
     "logistic_regression",
-    "clustering_analysis"
+    "clustering_analysis",
+    "clustering_k_sweep",
+    "dbscan_eps_estimation"
 ]
 
 __author__ = 'github.com/746505972'
\ No newline at end of file
@@ -0,0 +1,85 @@
+from typing import Dict, Any
+import numpy as np
+
+
+def confusion_matrix_from_codes(y_true: np.ndarray, y_pred: np.ndarray, n_classes: int) -> np.ndarray:
+    """
+    用一次bincount计算混淆矩阵，行为真实类别、列为预测类别
+
+    Args:
+        y_true (np.ndarray): 真实类别编码 (0 ~ n_classes-1)
+        y_pred (np.ndarray): 预测类别编码 (0 ~ n_classes-1)
+        n_classes (int): 类别数量
+
+    Returns:
+        np.ndarray: 形状为 (n_classes, n_classes) 的混淆矩阵
+    """
+    codes = np.asarray(y_true, dtype=np.int64) * n_classes + np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(codes, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+
+
+def metrics_from_confusion_matrix(cm: np.ndarray) -> Dict[str, Any]:
+    """
+    由混淆矩阵计算分类指标，口径与sklearn一致（zero_division=0）：
+    二分类时精确率、召回率和F1以编码1为正类；多分类时为宏平均，并给出微平均
+
+    Returns:
+        Dict[str, Any]: accuracy, precision, recall, f1_score, precision_micro, recall_micro, f1_micro
+    """
+    cm = np.asarray(cm)
+    tp = np.diag(cm).astype(float)
+    predicted = cm.sum(axis=0).astype(float)
+    actual = cm.sum(axis=1).astype(float)
+    total = cm.sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(actual > 0, tp / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    accuracy = tp.sum() / total if total else None
+    if len(cm) == 2:
+        return {
+            "accuracy": accuracy,
+            "precision": precision[1],
+            "recall": recall[1],
+            "f1_score": f1[1],
+            "precision_micro": None,
+            "recall_micro": None,
+            "f1_micro": None
+        }
+
+    # 单标签多分类的微平均精确率、召回率和F1都等于准确率
+    return {
+        "accuracy": accuracy,
+        "precision": precision.mean(),
+        "recall": recall.mean(),
+        "f1_score": f1.mean(),
+        "precision_micro": accuracy,
+        "recall_micro": accuracy,
+        "f1_micro": accuracy
+    }
+
+
+def evaluate_classifier(model: Any, X: Any, y_codes: np.ndarray, n_classes: int) -> Dict[str, Any]:
+    """
+    评估分类模型：只调用一次predict_proba，由概率取得预测类别，再由一个混淆矩阵得到全部指标
+
+    Args:
+        model (Any): 已拟合的分类模型，classes_ 为类别编码
+        X (Any): 特征矩阵（稠密或稀疏）
+        y_codes (np.ndarray): 真实类别编码
+        n_classes (int): 类别数量
+
+    Returns:
+        Dict[str, Any]: 包含 metrics, confusion_matrix, y_pred, y_pred_proba
+    """
+    proba = model.predict_proba(X)
+    y_pred = np.asarray(model.classes_)[proba.argmax(axis=1)]
+    cm = confusion_matrix_from_codes(y_codes, y_pred, n_classes)
+    return {
+        "metrics": metrics_from_confusion_matrix(cm),
+        "confusion_matrix": cm,
+        "y_pred": y_pred,
+        "y_pred_proba": proba
+    }
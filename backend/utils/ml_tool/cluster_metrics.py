@@ -0,0 +1,159 @@
+from typing import Dict, Any
+import numpy as np
+from sklearn.metrics import silhouette_score
+
+# 轮廓系数默认抽样数量，轮廓系数的计算复杂度为O(n²)
+SILHOUETTE_SAMPLE_SIZE = 10000
+
+# 流式计算到簇中心距离时每块的行数
+METRICS_CHUNK_SIZE = 100000
+
+
+def stratified_sample_indices(labels: np.ndarray, sample_size: int, random_state: int = 42) -> np.ndarray:
+    """
+    按簇分层抽样，各簇按比例分配样本数，每个簇至少保留2个样本（簇内样本不足时全部保留）
+
+    Args:
+        labels (np.ndarray): 簇标签
+        sample_size (int): 抽样数量
+        random_state (int): 随机种子，保证结果可复现
+
+    Returns:
+        np.ndarray: 升序排列的样本行号
+    """
+    n_samples = len(labels)
+    if sample_size is None or sample_size >= n_samples:
+        return np.arange(n_samples)
+
+    rng = np.random.RandomState(random_state)
+    codes = np.unique(labels, return_inverse=True)[1]
+    sizes = np.bincount(codes)
+    quotas = np.minimum(sizes, np.maximum(2, np.floor(sizes * sample_size / n_samples).astype(int)))
+
+    # 按簇标签排序后，每个簇的行号是一段连续区间
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    indices = [order[start + rng.choice(size, quota, replace=False)]
+               for start, size, quota in zip(starts, sizes, quotas)]
+    return np.sort(np.concatenate(indices))
+
+
+def cluster_sufficient_statistics(X: np.ndarray, labels: np.ndarray,
+                                  chunk_size: int = METRICS_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    计算各簇的充分统计量：样本数、簇中心、簇内平方和以及到簇中心的平均距离
+
+    第一遍按标签累加求和得到簇中心，第二遍分块计算每个样本到所属簇中心的距离，
+    内存占用与簇数和分块大小相关，与样本数无关
+
+    Returns:
+        Dict[str, Any]: 包含 labels, counts, centroids, within_ss, mean_distance
+    """
+    X = np.asarray(X, dtype=float)
+    unique_labels, codes = np.unique(labels, return_inverse=True)
+    n_clusters = len(unique_labels)
+
+    counts = np.bincount(codes, minlength=n_clusters)
+    sums = np.column_stack([np.bincount(codes, weights=X[:, j], minlength=n_clusters)
+                            for j in range(X.shape[1])])
+    centroids = sums / counts[:, None]
+
+    within_ss = np.zeros(n_clusters)
+    distance_sum = np.zeros(n_clusters)
+    for start in range(0, len(X), chunk_size):
+        chunk_codes = codes[start:start + chunk_size]
+        squared = ((X[start:start + chunk_size] - centroids[chunk_codes]) ** 2).sum(axis=1)
+        within_ss += np.bincount(chunk_codes, weights=squared, minlength=n_clusters)
+        distance_sum += np.bincount(chunk_codes, weights=np.sqrt(squared), minlength=n_clusters)
+
+    return {
+        "labels": unique_labels,
+        "counts": counts,
+        "centroids": centroids,
+        "within_ss": within_ss,
+        "mean_distance": distance_sum / counts
+    }
+
+
+def calinski_harabasz_from_statistics(stats: Dict[str, Any]) -> float:
+    """根据充分统计量计算Calinski-Harabasz指数（簇间离差与簇内离差之比）"""
+    counts = stats["counts"]
+    centroids = stats["centroids"]
+    n_samples = counts.sum()
+    n_clusters = len(counts)
+
+    overall_mean = (centroids * counts[:, None]).sum(axis=0) / n_samples
+    between_ss = (counts * ((centroids - overall_mean) ** 2).sum(axis=1)).sum()
+    within_ss = stats["within_ss"].sum()
+    if within_ss == 0:
+        return 1.0
+    return float(between_ss * (n_samples - n_clusters) / (within_ss * (n_clusters - 1)))
+
+
+def davies_bouldin_from_statistics(stats: Dict[str, Any]) -> float:
+    """根据充分统计量计算Davies-Bouldin指数（越小表示簇越紧凑且分离）"""
+    centroids = stats["centroids"]
+    mean_distance = stats["mean_distance"]
+
+    centroid_distances = np.sqrt(((centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2))
+    if np.allclose(mean_distance, 0) or np.allclose(centroid_distances, 0):
+        return 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = (mean_distance[:, None] + mean_distance[None, :]) / centroid_distances
+    ratios[~np.isfinite(ratios)] = 0
+    np.fill_diagonal(ratios, 0)
+    return float(ratios.max(axis=1).mean())
+
+
+def compute_cluster_metrics(X: np.ndarray, labels: np.ndarray,
+                            silhouette_sample_size: int = SILHOUETTE_SAMPLE_SIZE,
+                            random_state: int = 42) -> Dict[str, Any]:
+    """
+    计算聚类评估指标：分层抽样的轮廓系数，以及基于簇充分统计量的Calinski-Harabasz和Davies-Bouldin指数
+
+    Args:
+        X (np.ndarray): 参与聚类的特征矩阵
+        labels (np.ndarray): 簇标签
+        silhouette_sample_size (int): 轮廓系数抽样数量，None表示使用全部样本
+        random_state (int): 抽样随机种子
+
+    Returns:
+        Dict[str, Any]: silhouette_score, calinski_harabasz_score, davies_bouldin_score,
+            silhouette_sample_size（实际用于计算轮廓系数的样本数）；
+            各指标独立计算，某个指标计算失败时该指标为None，不影响其他指标
+    """
+    labels = np.asarray(labels)
+    n_labels = len(np.unique(labels))
+    if n_labels < 2 or n_labels >= len(labels):
+        return {}
+
+    X = np.asarray(X, dtype=float)
+    metrics = {
+        "silhouette_score": None,
+        "calinski_harabasz_score": None,
+        "davies_bouldin_score": None,
+        "silhouette_sample_size": None
+    }
+
+    try:
+        stats = cluster_sufficient_statistics(X, labels)
+    except Exception:
+        stats = None
+    if stats is not None:
+        try:
+            metrics["calinski_harabasz_score"] = calinski_harabasz_from_statistics(stats)
+        except Exception:
+            pass
+        try:
+            metrics["davies_bouldin_score"] = davies_bouldin_from_statistics(stats)
+        except Exception:
+            pass
+
+    try:
+        sample_indices = stratified_sample_indices(labels, silhouette_sample_size, random_state)
+        metrics["silhouette_score"] = float(silhouette_score(X[sample_indices], labels[sample_indices]))
+        metrics["silhouette_sample_size"] = int(len(sample_indices))
+    except Exception:
+        pass
+    return metrics
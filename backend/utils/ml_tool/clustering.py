@@ -1,15 +1,24 @@
 from typing import List, Dict, Any
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans, AgglomerativeClustering, DBSCAN
+from sklearn.cluster import KMeans, MiniBatchKMeans, Birch, AgglomerativeClustering
 from sklearn.mixture import GaussianMixture
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score, calinski_harabasz_score
-from sklearn.decomposition import PCA
 import warnings
 import os
 from pathlib import Path
 from .check_and_read import check_and_read
+from .cluster_metrics import compute_cluster_metrics, SILHOUETTE_SAMPLE_SIZE
+from utils.model_registry import register_model
+from .neighbor_index import get_neighbor_index, get_k_distances, suggest_eps, k_distance_curve, dbscan_with_index
+from .projection import get_projection, projection_points, PROJECTION_POINT_BUDGET
+
+# auto模式下超过该行数时改用可扩展的聚类算法
+LARGE_DATA_THRESHOLD = 100000
+
+# k值扫描的最大并行进程数
+MAX_SWEEP_JOBS = 4
+
 
 def _safe_float(value):
     """安全地将值转换为float，处理inf和nan值"""
@@ -24,6 +33,140 @@ def _safe_float(value):
         return None
 
 
+class SampledHierarchicalClustering:
+    """
+    大数据层次聚类：先用MiniBatchKMeans将数据压缩为若干微簇，
+    再对微簇中心做层次聚类，最后把每个样本映射到其微簇所属的簇
+    """
+
+    def __init__(self, n_clusters: int = 3, linkage: str = "ward", n_micro_clusters: int = None,
+                 batch_size: int = 1024, max_iter: int = 300, random_state: int = 42):
+        self.n_clusters = n_clusters
+        self.linkage = linkage
+        self.n_micro_clusters = n_micro_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.random_state = random_state
+
+    def fit_predict(self, X) -> np.ndarray:
+        n_micro_clusters = self.n_micro_clusters or max(20 * self.n_clusters, 200)
+        n_micro_clusters = max(self.n_clusters, min(n_micro_clusters, len(X)))
+
+        self.micro_model_ = MiniBatchKMeans(
+            n_clusters=n_micro_clusters,
+            batch_size=self.batch_size,
+            max_iter=self.max_iter,
+            random_state=self.random_state,
+            n_init=3
+        )
+        micro_labels = self.micro_model_.fit_predict(X)
+
+        self.hierarchical_model_ = AgglomerativeClustering(
+            n_clusters=self.n_clusters,
+            linkage=self.linkage
+        )
+        self.centroid_labels_ = self.hierarchical_model_.fit_predict(self.micro_model_.cluster_centers_)
+        self.labels_ = self.centroid_labels_[micro_labels]
+        return self.labels_
+
+    def predict(self, X) -> np.ndarray:
+        return self.centroid_labels_[self.micro_model_.predict(X)]
+
+
+def _prepare_clustering_data(file_path: str, columns: List[str], session_id: str = None,
+                             standardize: bool = True) -> tuple:
+    """
+    读取数据并准备聚类特征矩阵
+
+    Returns:
+        tuple: (df, numeric_columns, X, X_scaled, scaler) 原始数据、数值列、去除缺失值后的特征、
+            （标准化后的）特征矩阵和标准化器（未标准化时为None）
+    """
+    # 检查文件和列的有效性
+    df, numeric_columns = check_and_read(file_path, columns, session_id)
+
+    # 确保有足够的数值列用于聚类
+    if not numeric_columns:
+        raise ValueError("没有有效的数值型列用于聚类分析")
+
+    # 准备数据
+    X = df[numeric_columns].dropna()
+
+    if len(X) == 0:
+        raise ValueError("没有有效的数据可用于聚类分析")
+
+    # 标准化数据
+    if standardize:
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+    else:
+        scaler = None
+        X_scaled = X.values
+
+    return df, numeric_columns, X, X_scaled, scaler
+
+
+def _summarize_clusters(df: pd.DataFrame, X: pd.DataFrame, cluster_labels: np.ndarray,
+                        numeric_columns: List[str], file_path: str, session_id: str = None) -> tuple:
+    """
+    统计各簇信息并将带簇标签的数据保存为CSV
+
+    Returns:
+        tuple: (cluster_stats, original_indices, result_file_path)
+    """
+    # 计算每个簇的统计信息
+    cluster_stats = {}
+    unique_labels = np.unique(cluster_labels)
+    for label in unique_labels:
+        mask = cluster_labels == label
+        cluster_data = X.iloc[mask]
+
+        cluster_stats[str(label)] = {
+            "size": int(np.sum(mask)),
+            "proportion": _safe_float(np.sum(mask) / len(cluster_labels)),
+            "centroid": {col: _safe_float(cluster_data[col].mean()) for col in numeric_columns}
+        }
+
+    # 获取原始数据的索引（去除缺失值后的）
+    original_indices = X.index.tolist()
+
+    # 将聚类结果保存为CSV
+    # 创建包含原始数据和聚类标签的DataFrame
+    result_df = df.loc[original_indices].copy()  # 使用原始数据的子集
+    result_df['cluster_label'] = cluster_labels
+
+    # 生成结果文件路径
+    filename = f"{os.path.splitext(os.path.basename(file_path))[0]}_clustering_result"
+    result_file_path = os.path.join("data", session_id, f"{filename}.csv")
+
+    # 保存为CSV
+    result_df.to_csv(result_file_path, index=False, encoding='utf-8-sig')
+
+    return cluster_stats, original_indices, result_file_path
+
+
+def _evaluate_clusters(X_scaled: np.ndarray, cluster_labels: np.ndarray, silhouette_sample_size: int,
+                       silhouette_seed: int) -> Dict[str, Any]:
+    """计算聚类评估指标（轮廓系数在分层抽样上计算，其余指标由簇充分统计量得到）"""
+    evaluation_metrics = {}
+    if len(set(cluster_labels)) > 1:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                metrics = compute_cluster_metrics(
+                    X_scaled, cluster_labels,
+                    silhouette_sample_size=silhouette_sample_size,
+                    random_state=silhouette_seed
+                )
+            except Exception:
+                metrics = {}
+        evaluation_metrics["silhouette_score"] = _safe_float(metrics.get("silhouette_score"))
+        evaluation_metrics["calinski_harabasz_score"] = _safe_float(metrics.get("calinski_harabasz_score"))
+        evaluation_metrics["davies_bouldin_score"] = _safe_float(metrics.get("davies_bouldin_score"))
+        evaluation_metrics["silhouette_sample_size"] = metrics.get("silhouette_sample_size")
+    return evaluation_metrics
+
+
 def clustering_analysis(file_path: str, 
                         columns: List[str], 
                         method: str = "kmeans", 
@@ -41,46 +184,50 @@ def clustering_analysis(file_path: str,
             - "hierarchical": 层次聚类
             - "dbscan": DBSCAN聚类
             - "gmm": 高斯混合模型
+            - "minibatch_kmeans": 小批量K-means，适用于大数据
+            - "birch": BIRCH聚类，适用于大数据
+            - "hierarchical_sampled": 基于微簇中心的层次聚类，适用于大数据
+            - "auto": 数据行数不超过large_data_threshold时使用kmeans，否则使用minibatch_kmeans
         n_clusters (int): 簇的数量 (对于K-means、层次聚类和GMM)
         session_id (str): 会话ID
         **kwargs: 其他参数，用于特定聚类方法的配置
             - standardize (bool): 是否标准化数据 (默认True)
             - init (str): K-means初始化方法 ("k-means++", "random") 
             - max_iter (int): K-means最大迭代次数 (默认300)
-            - eps (float): DBSCAN的邻域半径 (默认0.5)
+            - eps (float): DBSCAN的邻域半径 (默认0.5，"auto"表示使用k距离曲线估计的值)
             - min_samples (int): DBSCAN的最小样本数 (默认5)
             - linkage (str): 层次聚类的链接方法 ("ward", "complete", "average", "single")
             - covariance_type (str): GMM协方差类型 ("full", "tied", "diag", "spherical")
+            - batch_size (int): 小批量K-means及微簇的批大小 (默认1024)
+            - threshold (float): BIRCH子簇半径阈值 (默认0.5)
+            - branching_factor (int): BIRCH分支因子 (默认50)
+            - n_micro_clusters (int): hierarchical_sampled的微簇数量 (默认max(20*n_clusters, 200))
+            - large_data_threshold (int): auto模式切换到可扩展算法的行数阈值 (默认100000)
+            - silhouette_sample_size (int): 轮廓系数分层抽样数量 (默认10000，None表示全部样本)
+            - silhouette_seed (int): 轮廓系数抽样随机种子 (默认42)
+            - save_model: 是否保存模型以便后续预测 (默认True，DBSCAN和层次聚类不支持预测)
+            - projection (bool): 是否返回二维投影散点 (默认True)
+            - projection_points (int): 二维投影返回的最大点数 (默认5000)
 
     Returns:
         Dict[str, Any]: 包含聚类分析结果的字典
     """
-    # 检查文件和列的有效性
-    df, numeric_columns = check_and_read(file_path, columns, session_id)
-
-    # 确保有足够的数值列用于聚类
-    if not numeric_columns:
-        raise ValueError("没有有效的数值型列用于聚类分析")
-
     # 获取参数
     standardize = kwargs.get("standardize", True)
     max_iter = kwargs.get("max_iter", 300)
+    silhouette_sample_size = kwargs.get("silhouette_sample_size", SILHOUETTE_SAMPLE_SIZE)
+    silhouette_seed = kwargs.get("silhouette_seed", 42)
 
-    # 准备数据
-    X = df[numeric_columns].dropna()
-
-    if len(X) == 0:
-        raise ValueError("没有有效的数据可用于聚类分析")
+    df, numeric_columns, X, X_scaled, scaler = _prepare_clustering_data(file_path, columns, session_id, standardize)
 
     if len(X) < n_clusters:
         raise ValueError(f"数据样本数量({len(X)})少于指定的簇数量({n_clusters})")
 
-    # 标准化数据
-    if standardize:
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-    else:
-        X_scaled = X.values
+    # auto模式根据数据量选择算法
+    requested_method = method
+    if method == "auto":
+        large_data_threshold = kwargs.get("large_data_threshold", LARGE_DATA_THRESHOLD)
+        method = "minibatch_kmeans" if len(X) > large_data_threshold else "kmeans"
 
     # 根据方法选择聚类算法
     if method == "kmeans":
@@ -99,12 +246,15 @@ def clustering_analysis(file_path: str,
             linkage=linkage
         )
     elif method == "dbscan":
-        eps = kwargs.get("eps", 0.5)
+        # 复用缓存的近邻索引，eps为"auto"时使用k距离曲线的拐点
         min_samples = kwargs.get("min_samples", 5)
-        model = DBSCAN(
-            eps=eps,
-            min_samples=min_samples
-        )
+        index = get_neighbor_index(file_path, numeric_columns, X_scaled, standardize, session_id)
+        k_distances = get_k_distances(file_path, numeric_columns, index, min_samples, standardize, session_id)
+        eps_suggestion = suggest_eps(k_distances)
+        eps = kwargs.get("eps", 0.5)
+        if eps in (None, "auto"):
+            eps = eps_suggestion
+        model = None
     elif method == "gmm":
         covariance_type = kwargs.get("covariance_type", "full")
         model = GaussianMixture(
@@ -113,11 +263,44 @@ def clustering_analysis(file_path: str,
             random_state=42,
             max_iter=max_iter
         )
+    elif method == "minibatch_kmeans":
+        init_method = kwargs.get("init", "k-means++")
+        batch_size = kwargs.get("batch_size", 1024)
+        model = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            init=init_method,
+            max_iter=max_iter,
+            batch_size=batch_size,
+            random_state=42,
+            n_init=3
+        )
+    elif method == "birch":
+        threshold = kwargs.get("threshold", 0.5)
+        branching_factor = kwargs.get("branching_factor", 50)
+        model = Birch(
+            n_clusters=n_clusters,
+            threshold=threshold,
+            branching_factor=branching_factor
+        )
+    elif method == "hierarchical_sampled":
+        linkage = kwargs.get("linkage", "ward")
+        batch_size = kwargs.get("batch_size", 1024)
+        n_micro_clusters = kwargs.get("n_micro_clusters")
+        model = SampledHierarchicalClustering(
+            n_clusters=n_clusters,
+            linkage=linkage,
+            n_micro_clusters=n_micro_clusters,
+            batch_size=batch_size,
+            max_iter=max_iter
+        )
     else:
         raise ValueError(f"不支持的聚类方法: {method}")
 
     # 执行聚类
-    cluster_labels = model.fit_predict(X_scaled)
+    if method == "dbscan":
+        cluster_labels = dbscan_with_index(index, eps, min_samples)
+    else:
+        cluster_labels = model.fit_predict(X_scaled)
 
     # 对于DBSCAN，需要调整簇数量（DBSCAN会生成-1的噪声点标签）
     if method == "dbscan":
@@ -125,48 +308,11 @@ def clustering_analysis(file_path: str,
 
     # 计算聚类评估指标
     evaluation_metrics = {}
-    if n_clusters > 1 and len(set(cluster_labels)) > 1:  # 只有在有多个簇时才计算轮廓系数
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            try:
-                silhouette_avg = silhouette_score(X_scaled, cluster_labels)
-                evaluation_metrics["silhouette_score"] = _safe_float(silhouette_avg)
-            except:
-                evaluation_metrics["silhouette_score"] = None
-
-        try:
-            calinski_harabasz = calinski_harabasz_score(X_scaled, cluster_labels)
-            evaluation_metrics["calinski_harabasz_score"] = _safe_float(calinski_harabasz)
-        except:
-            evaluation_metrics["calinski_harabasz_score"] = None
-
-    # 计算每个簇的统计信息
-    cluster_stats = {}
-    unique_labels = np.unique(cluster_labels)
-    for label in unique_labels:
-        mask = cluster_labels == label
-        cluster_data = X.iloc[mask] if isinstance(X, pd.DataFrame) else pd.DataFrame(X_scaled[mask], columns=numeric_columns)
-        
-        cluster_stats[str(label)] = {
-            "size": int(np.sum(mask)),
-            "proportion": _safe_float(np.sum(mask) / len(cluster_labels)),
-            "centroid": {col: _safe_float(cluster_data[col].mean()) for col in numeric_columns}
-        }
-
-    # 获取原始数据的索引（去除缺失值后的）
-    original_indices = X.index.tolist()
+    if n_clusters > 1:
+        evaluation_metrics = _evaluate_clusters(X_scaled, cluster_labels, silhouette_sample_size, silhouette_seed)
 
-    # 将聚类结果保存为CSV
-    # 创建包含原始数据和聚类标签的DataFrame
-    result_df = df.loc[original_indices].copy()  # 使用原始数据的子集
-    result_df['cluster_label'] = cluster_labels
-
-    # 生成结果文件路径
-    filename = f"{os.path.splitext(os.path.basename(file_path))[0]}_clustering_result"
-    result_file_path = os.path.join("data", session_id, f"{filename}.csv")
-
-    # 保存为CSV
-    result_df.to_csv(result_file_path, index=False, encoding='utf-8-sig')
+    cluster_stats, original_indices, result_file_path = _summarize_clusters(
+        df, X, cluster_labels, numeric_columns, file_path, session_id)
 
     # 准备返回结果
     result = {
@@ -192,9 +338,262 @@ def clustering_analysis(file_path: str,
     elif method == "dbscan":
         result["model_params"]["eps"] = eps
         result["model_params"]["min_samples"] = min_samples
+        result["model_params"]["eps_suggestion"] = _safe_float(eps_suggestion)
+        result["k_distance"] = k_distance_curve(k_distances)
     elif method == "hierarchical":
         result["model_params"]["linkage"] = linkage
     elif method == "gmm":
         result["model_params"]["covariance_type"] = covariance_type
+    elif method == "minibatch_kmeans":
+        result["model_params"]["init"] = init_method
+        result["model_params"]["batch_size"] = batch_size
+    elif method == "birch":
+        result["model_params"]["threshold"] = threshold
+        result["model_params"]["branching_factor"] = branching_factor
+    elif method == "hierarchical_sampled":
+        result["model_params"]["linkage"] = linkage
+        result["model_params"]["n_micro_clusters"] = model.micro_model_.n_clusters
+
+    if requested_method == "auto":
+        result["model_params"]["auto_selected_method"] = method
+
+    # 二维投影按数据集版本缓存，只返回不超过点数预算的分层抽样点
+    if kwargs.get("projection", True):
+        projection = get_projection(file_path, numeric_columns, X_scaled, standardize, session_id)
+        result["projection"] = projection_points(
+            projection, cluster_labels, original_indices,
+            kwargs.get("projection_points", PROJECTION_POINT_BUDGET))
+
+    # 保存支持预测新样本的模型，连同标准化器一起供预测接口复用
+    if kwargs.get("save_model", True) and hasattr(model, "predict"):
+        result["model_id"] = register_model(
+            "clustering", method, model, numeric_columns, session_id, preprocessor=scaler,
+            source_file=file_path, params=result["model_params"])
+
+    return result
+
+def _fit_k_block(X_scaled: np.ndarray, k_values: List[int], method: str, max_iter: int, n_init: int,
+                 batch_size: int, warm_start: bool, silhouette_sample_size: int,
+                 silhouette_seed: int) -> List[Dict[str, Any]]:
+    """
+    在工作进程中依次拟合一段连续的k值
+
+    warm_start为True时，k+1的初始中心由k的簇中心加上距最近中心最远的样本组成，
+    只有每段的第一个k使用k-means++多次初始化
+    """
+    from sklearn.metrics import pairwise_distances_argmin_min
+
+    results = []
+    centers = None
+    for k in k_values:
+        if warm_start and centers is not None and len(centers) == k - 1:
+            distances = pairwise_distances_argmin_min(X_scaled, centers)[1]
+            init, k_n_init = np.vstack([centers, X_scaled[np.argmax(distances)]]), 1
+        else:
+            init, k_n_init = "k-means++", n_init
+
+        if method == "minibatch_kmeans":
+            model = MiniBatchKMeans(n_clusters=k, init=init, max_iter=max_iter, batch_size=batch_size,
+                                    random_state=42, n_init=k_n_init)
+        else:
+            model = KMeans(n_clusters=k, init=init, max_iter=max_iter, random_state=42, n_init=k_n_init)
+        labels = model.fit_predict(X_scaled)
+        centers = model.cluster_centers_
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                metrics = compute_cluster_metrics(X_scaled, labels, silhouette_sample_size, silhouette_seed)
+            except Exception:
+                metrics = {}
+
+        results.append({
+            "k": int(k),
+            "inertia": _safe_float(model.inertia_),
+            "silhouette_score": _safe_float(metrics.get("silhouette_score")),
+            "calinski_harabasz_score": _safe_float(metrics.get("calinski_harabasz_score")),
+            "davies_bouldin_score": _safe_float(metrics.get("davies_bouldin_score")),
+            "silhouette_sample_size": metrics.get("silhouette_sample_size"),
+            "n_iter": int(model.n_iter_),
+            "centers": centers
+        })
+    return results
+
+
+def _elbow_k(k_values: List[int], inertia: List[float]) -> int:
+    """肘部法则：取归一化后的惯性曲线上距首尾连线最远的点"""
+    if len(k_values) < 3 or any(value is None for value in inertia):
+        return None
+    k = np.asarray(k_values, dtype=float)
+    y = np.asarray(inertia, dtype=float)
+    k = (k - k[0]) / (k[-1] - k[0])
+    span = y[0] - y[-1]
+    if span <= 0:
+        return None
+    y = (y[0] - y) / span
+    return int(k_values[int(np.argmax(y - k))])
 
-    return result
\ No newline at end of file
+
+def clustering_k_sweep(file_path: str,
+                       columns: List[str],
+                       k_min: int = 2,
+                       k_max: int = 10,
+                       method: str = "kmeans",
+                       session_id: str = None,
+                       **kwargs) -> Dict[str, Any]:
+    """
+    聚类k值扫描 - 读取并标准化数据一次，在多个进程中并行拟合一组k值，
+    返回惯性（肘部法则）和轮廓系数曲线，以及最佳k值对应的聚类结果
+
+    Args:
+        file_path (str): 文件路径
+        columns (List[str]): 用于聚类的列名列表
+        k_min (int): 最小簇数量 (默认2)
+        k_max (int): 最大簇数量 (默认10)
+        method (str): 聚类方法，"kmeans" (默认) 或 "minibatch_kmeans"
+        session_id (str): 会话ID
+        **kwargs: 其他参数
+            - standardize (bool): 是否标准化数据 (默认True)
+            - max_iter (int): 最大迭代次数 (默认300)
+            - n_init (int): k-means++初始化次数 (默认3)
+            - batch_size (int): 小批量K-means的批大小 (默认1024)
+            - warm_start (bool): 是否用上一个k的簇中心初始化下一个k (默认True)
+            - n_jobs (int): 并行进程数 (默认为k值数量与CPU核数中的较小值，最多4个)
+            - silhouette_sample_size (int): 轮廓系数分层抽样数量 (默认10000)
+            - silhouette_seed (int): 轮廓系数抽样随机种子 (默认42)
+            - projection (bool): 是否为最佳k值的结果返回二维投影散点 (默认True)
+            - projection_points (int): 二维投影返回的最大点数 (默认5000)
+
+    Returns:
+        Dict[str, Any]: 包含各k值的评估曲线、best_k、elbow_k和best_model（结构与clustering_analysis一致）
+    """
+    from joblib import Parallel, delayed
+    from sklearn.metrics import pairwise_distances_argmin
+
+    if method not in ("kmeans", "minibatch_kmeans"):
+        raise ValueError(f"k值扫描不支持的聚类方法: {method}")
+    if k_min < 2 or k_max < k_min:
+        raise ValueError(f"无效的k值范围: [{k_min}, {k_max}]")
+
+    # 获取参数
+    standardize = kwargs.get("standardize", True)
+    max_iter = kwargs.get("max_iter", 300)
+    n_init = kwargs.get("n_init", 3)
+    batch_size = kwargs.get("batch_size", 1024)
+    warm_start = kwargs.get("warm_start", True)
+    silhouette_sample_size = kwargs.get("silhouette_sample_size", SILHOUETTE_SAMPLE_SIZE)
+    silhouette_seed = kwargs.get("silhouette_seed", 42)
+
+    df, numeric_columns, X, X_scaled, scaler = _prepare_clustering_data(file_path, columns, session_id, standardize)
+    X_scaled = np.ascontiguousarray(X_scaled, dtype=float)
+
+    k_values = list(range(k_min, min(k_max, len(X) - 1) + 1))
+    if not k_values:
+        raise ValueError(f"数据样本数量({len(X)})不足以进行k值扫描")
+
+    # 将k值划分为连续的段，每个进程处理一段，段内使用热启动
+    n_jobs = kwargs.get("n_jobs") or min(len(k_values), os.cpu_count() or 1, MAX_SWEEP_JOBS)
+    blocks = [block.tolist() for block in np.array_split(k_values, n_jobs) if len(block)]
+    block_results = Parallel(n_jobs=len(blocks))(
+        delayed(_fit_k_block)(X_scaled, block, method, max_iter, n_init, batch_size, warm_start,
+                              silhouette_sample_size, silhouette_seed)
+        for block in blocks
+    )
+    sweep = [entry for block in block_results for entry in block]
+
+    # 以轮廓系数最大的k作为最佳k值
+    scored = [entry for entry in sweep if entry["silhouette_score"] is not None]
+    best = max(scored, key=lambda entry: entry["silhouette_score"]) if scored else sweep[0]
+    best_k = best["k"]
+
+    # 用最佳k值的簇中心分配标签，无需重新拟合
+    cluster_labels = pairwise_distances_argmin(X_scaled, best["centers"])
+    cluster_stats, original_indices, result_file_path = _summarize_clusters(
+        df, X, cluster_labels, numeric_columns, file_path, session_id)
+
+    best_model = {
+        "method": method,
+        "columns": numeric_columns,
+        "n_clusters": best_k,
+        "cluster_labels": [int(label) for label in cluster_labels][:19],
+        "original_indices": original_indices,
+        "cluster_stats": cluster_stats,
+        "evaluation_metrics": {
+            "silhouette_score": best["silhouette_score"],
+            "calinski_harabasz_score": best["calinski_harabasz_score"],
+            "davies_bouldin_score": best["davies_bouldin_score"],
+            "silhouette_sample_size": best["silhouette_sample_size"]
+        },
+        "sample_size": len(cluster_labels),
+        "result_file_path": result_file_path,
+        "model_params": {
+            "n_clusters": best_k,
+            "standardize": standardize,
+            "max_iter": max_iter,
+            "init": "k-means++"
+        }
+    }
+    if method == "minibatch_kmeans":
+        best_model["model_params"]["batch_size"] = batch_size
+    if kwargs.get("projection", True):
+        projection = get_projection(file_path, numeric_columns, X_scaled, standardize, session_id)
+        best_model["projection"] = projection_points(
+            projection, cluster_labels, original_indices,
+            kwargs.get("projection_points", PROJECTION_POINT_BUDGET))
+
+    inertia = [entry["inertia"] for entry in sweep]
+    return {
+        "method": method,
+        "columns": numeric_columns,
+        "k_values": k_values,
+        "inertia": inertia,
+        "silhouette_scores": [entry["silhouette_score"] for entry in sweep],
+        "calinski_harabasz_scores": [entry["calinski_harabasz_score"] for entry in sweep],
+        "davies_bouldin_scores": [entry["davies_bouldin_score"] for entry in sweep],
+        "n_iter": [entry["n_iter"] for entry in sweep],
+        "best_k": best_k,
+        "elbow_k": _elbow_k(k_values, inertia),
+        "selection_criterion": "silhouette_score",
+        "n_jobs": len(blocks),
+        "warm_start": warm_start,
+        "best_model": best_model
+    }
+
+
+def dbscan_eps_estimation(file_path: str,
+                          columns: List[str],
+                          min_samples: int = 5,
+                          session_id: str = None,
+                          **kwargs) -> Dict[str, Any]:
+    """
+    DBSCAN参数估计 - 基于缓存的近邻索引计算k距离曲线，并以曲线拐点作为建议的eps
+
+    Args:
+        file_path (str): 文件路径
+        columns (List[str]): 用于聚类的列名列表
+        min_samples (int): DBSCAN的最小样本数，即k距离中的k (默认5)
+        session_id (str): 会话ID
+        **kwargs: 其他参数
+            - standardize (bool): 是否标准化数据 (默认True)
+
+    Returns:
+        Dict[str, Any]: 包含建议eps和k距离曲线的字典
+    """
+    standardize = kwargs.get("standardize", True)
+
+    df, numeric_columns, X, X_scaled, scaler = _prepare_clustering_data(file_path, columns, session_id, standardize)
+
+    if len(X) < min_samples:
+        raise ValueError(f"数据样本数量({len(X)})少于最小样本数({min_samples})")
+
+    index = get_neighbor_index(file_path, numeric_columns, X_scaled, standardize, session_id)
+    k_distances = get_k_distances(file_path, numeric_columns, index, min_samples, standardize, session_id)
+
+    return {
+        "columns": numeric_columns,
+        "min_samples": min_samples,
+        "standardize": standardize,
+        "eps_suggestion": _safe_float(suggest_eps(k_distances)),
+        "k_distance": k_distance_curve(k_distances),
+        "sample_size": len(X)
+    }
@@ -5,6 +5,9 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import LabelEncoder
 
 from .check_and_read import check_and_read
+from .sparse_logistic import select_training_mode, large_scale_logistic_regression
+from .classification_metrics import evaluate_classifier
+from utils.model_registry import register_model
 
 
 def _safe_float(value):
@@ -45,10 +48,35 @@ def logistic_regression(file_path: str, x_columns: List[str], y_column: str,
             - tol: 收敛容差 (默认1e-4)
             - fit_intercept: 是否拟合截距 (默认True)
             - class_weight: 类别权重 ("balanced" 或 None)
+            - save_model: 是否保存模型以便后续预测 (默认True)
+            - mode: 训练方式 (默认"auto")
+                - "dense": 稠密矩阵，仅使用数值特征
+                - "sparse": 稀疏设计矩阵 + saga，分类特征直接编码为独热列
+                - "incremental": 分块读取 + SGDClassifier.partial_fit，适用于无法整体读入内存的数据
+                - "auto": 大文件使用incremental，存在分类特征、特征很多或数值特征大多为0时使用sparse，否则使用dense
+            - epochs: incremental方式的训练轮数 (默认3)
+            - chunksize: incremental方式每块读取的行数 (默认100000)
 
     Returns:
         Dict[str, Any]: 包含逻辑回归结果的字典
     """
+    # 根据数据规模和特征类型选择训练方式
+    mode = kwargs.pop("mode", "auto")
+    if mode == "auto":
+        mode = select_training_mode(file_path, x_columns)
+    if mode in ("sparse", "incremental"):
+        result = large_scale_logistic_regression(file_path, x_columns, y_column, mode, method, session_id, **kwargs)
+        model = result.pop("model")
+        encoder = result.pop("encoder")
+        result["evaluation_metrics"] = {key: _safe_float(value) for key, value in result["evaluation_metrics"].items()}
+
+        if kwargs.get("save_model", True):
+            result["model_id"] = register_model(
+                "logistic_regression", method, model, result["x_columns"], session_id, preprocessor=encoder,
+                target_column=y_column, class_labels=result["class_labels"], source_file=file_path,
+                params=result["model_params"])
+        return result
+
     # 检查文件和列的有效性
     df, numeric_x_columns = check_and_read(file_path, x_columns, session_id)
 
@@ -112,34 +140,10 @@ def logistic_regression(file_path: str, x_columns: List[str], y_column: str,
     except Exception as e:
         raise ValueError(f"模型拟合失败: {e}")
 
-    # 预测
-    y_pred = model.predict(X)
-    y_pred_proba = model.predict_proba(X)
-
-    # 计算评估指标
-    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-    from sklearn.preprocessing import label_binarize
-
-    accuracy = accuracy_score(y, y_pred)
-    
-    # 对于多分类问题，计算宏平均和微平均
-    if n_classes > 2:
-        precision = precision_score(y, y_pred, average='macro', zero_division=0)
-        recall = recall_score(y, y_pred, average='macro', zero_division=0)
-        f1 = f1_score(y, y_pred, average='macro', zero_division=0)
-        
-        # 对于微平均
-        precision_micro = precision_score(y, y_pred, average='micro', zero_division=0)
-        recall_micro = recall_score(y, y_pred, average='micro', zero_division=0)
-        f1_micro = f1_score(y, y_pred, average='micro', zero_division=0)
-    else:  # 二分类
-        precision = precision_score(y, y_pred, zero_division=0)
-        recall = recall_score(y, y_pred, zero_division=0)
-        f1 = f1_score(y, y_pred, zero_division=0)
-        precision_micro = recall_micro = f1_micro = None
-
-    # 获取混淆矩阵
-    cm = confusion_matrix(y, y_pred)
+    # 一次predict_proba得到预测类别，全部指标由同一个混淆矩阵计算
+    evaluation = evaluate_classifier(model, X, y, n_classes)
+    evaluation_metrics = evaluation["metrics"]
+    cm = evaluation["confusion_matrix"]
 
     # 获取模型系数
     coefficients = {}
@@ -156,15 +160,7 @@ def logistic_regression(file_path: str, x_columns: List[str], y_column: str,
     # 准备返回结果
     result = {"method": method, "x_columns": numeric_x_columns, "y_column": y_column, "coefficients": coefficients,
               "intercept": intercept,
-              "evaluation_metrics": {
-                "accuracy": _safe_float(accuracy),
-                "precision": _safe_float(precision),
-                "recall": _safe_float(recall),
-                "f1_score": _safe_float(f1),
-                "precision_micro": _safe_float(precision_micro),
-                "recall_micro": _safe_float(recall_micro),
-                "f1_micro": _safe_float(f1_micro)
-              },
+              "evaluation_metrics": {key: _safe_float(value) for key, value in evaluation_metrics.items()},
               "sample_size": len(X), "n_classes": n_classes, "class_labels": label_encoder.classes_.tolist(),
               "confusion_matrix": cm.tolist(),
               "model_params": {
@@ -173,7 +169,15 @@ def logistic_regression(file_path: str, x_columns: List[str], y_column: str,
                 "solver": solver,
                 "tol": tol,
                 "fit_intercept": fit_intercept,
-                "class_weight": class_weight
+                "class_weight": class_weight,
+                "mode": "dense"
         }}
 
+    # 保存模型，供预测接口复用
+    if kwargs.get("save_model", True):
+        result["model_id"] = register_model(
+            "logistic_regression", method, model, numeric_x_columns, session_id,
+            target_column=y_column, class_labels=label_encoder.classes_.tolist(), source_file=file_path,
+            params=result["model_params"])
+
     return result
\ No newline at end of file
@@ -0,0 +1,87 @@
+from typing import List, Dict, Any
+import numpy as np
+from sklearn.cluster import DBSCAN
+from sklearn.neighbors import NearestNeighbors
+
+from utils.cache_manager import make_cache_key, get_or_build
+
+# 缓存命名空间
+NEIGHBOR_INDEX_NAMESPACE = "neighbor_index"
+K_DISTANCE_NAMESPACE = "k_distance"
+
+# 特征维度不超过该值时使用KD树，否则使用球树
+KD_TREE_MAX_DIMENSIONS = 15
+
+# 返回给前端的k距离曲线点数
+K_DISTANCE_CURVE_POINTS = 200
+
+
+def get_neighbor_index(file_path: str, columns: List[str], X_scaled: np.ndarray, standardize: bool = True,
+                       session_id: str = None) -> NearestNeighbors:
+    """
+    获取聚类特征的近邻索引，按 (数据集版本, 列, 是否标准化) 缓存，调整eps和min_samples时无需重建
+
+    Args:
+        file_path (str): 数据文件路径
+        columns (List[str]): 参与聚类的列
+        X_scaled (np.ndarray): 聚类特征矩阵，需与缓存键对应
+        standardize (bool): 特征是否经过标准化
+        session_id (str): 用户会话ID
+
+    Returns:
+        NearestNeighbors: 已构建KD树或球树的近邻索引
+    """
+    def builder():
+        algorithm = "kd_tree" if X_scaled.shape[1] <= KD_TREE_MAX_DIMENSIONS else "ball_tree"
+        return NearestNeighbors(algorithm=algorithm).fit(X_scaled)
+
+    key = make_cache_key(file_path, list(columns), standardize)
+    return get_or_build(NEIGHBOR_INDEX_NAMESPACE, key, builder, session_id)
+
+
+def get_k_distances(file_path: str, columns: List[str], index: NearestNeighbors, k: int,
+                    standardize: bool = True, session_id: str = None) -> np.ndarray:
+    """
+    获取每个样本到第k个近邻（含自身）的距离，升序排列，按 (数据集版本, 列, 是否标准化, k) 缓存
+
+    k与DBSCAN的min_samples含义一致，距离不超过eps的样本即为核心点
+    """
+    def builder():
+        distances = index.kneighbors(n_neighbors=k - 1)[0][:, -1] if k > 1 else np.zeros(index.n_samples_fit_)
+        return np.sort(distances)
+
+    key = make_cache_key(file_path, list(columns), standardize, k)
+    return get_or_build(K_DISTANCE_NAMESPACE, key, builder, session_id)
+
+
+def suggest_eps(k_distances: np.ndarray) -> float:
+    """
+    根据排序后的k距离曲线估计eps：取归一化曲线上距首尾连线最远的拐点
+    """
+    n = len(k_distances)
+    if n < 3 or k_distances[-1] <= k_distances[0]:
+        return float(k_distances[-1]) if n else None
+
+    x = np.linspace(0, 1, n)
+    y = (k_distances - k_distances[0]) / (k_distances[-1] - k_distances[0])
+    return float(k_distances[int(np.argmax(x - y))])
+
+
+def k_distance_curve(k_distances: np.ndarray, n_points: int = K_DISTANCE_CURVE_POINTS) -> Dict[str, Any]:
+    """将k距离曲线等间隔抽取为固定点数，便于前端绘制"""
+    positions = np.unique(np.linspace(0, len(k_distances) - 1, min(n_points, len(k_distances))).astype(int))
+    return {
+        "positions": positions.tolist(),
+        "distances": [float(value) for value in k_distances[positions]]
+    }
+
+
+def dbscan_with_index(index: NearestNeighbors, eps: float, min_samples: int) -> np.ndarray:
+    """
+    使用已构建的近邻索引执行DBSCAN：先查询半径邻域得到稀疏距离图，再以预计算距离聚类
+
+    Returns:
+        np.ndarray: 簇标签，噪声点为-1
+    """
+    graph = index.radius_neighbors_graph(radius=eps, mode="distance")
+    return DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed").fit_predict(graph)
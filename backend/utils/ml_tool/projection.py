@@ -0,0 +1,104 @@
+from typing import List, Dict, Any
+import numpy as np
+from sklearn.decomposition import PCA, IncrementalPCA
+
+from utils.cache_manager import make_cache_key, get_or_build
+from .cluster_metrics import stratified_sample_indices
+
+# 缓存命名空间
+PROJECTION_NAMESPACE = "projection"
+
+# 返回给前端的最大点数
+PROJECTION_POINT_BUDGET = 5000
+
+# 样本数超过该值时使用增量PCA分批拟合，避免一次性对整个矩阵做分解
+INCREMENTAL_PCA_THRESHOLD = 1000000
+
+# 增量PCA每批的行数
+INCREMENTAL_PCA_BATCH_SIZE = 100000
+
+
+def _fit_projection(X_scaled: np.ndarray, random_state: int = 42) -> Dict[str, Any]:
+    """
+    将特征矩阵投影到前两个主成分：常规数据量使用随机化SVD，超大数据量使用增量PCA分批拟合和投影
+
+    Returns:
+        Dict[str, Any]: 包含 coordinates (float32, n×2), explained_variance_ratio, solver
+    """
+    n_samples, n_features = X_scaled.shape
+    n_components = min(2, n_features, n_samples)
+
+    if n_samples > INCREMENTAL_PCA_THRESHOLD:
+        model = IncrementalPCA(n_components=n_components, batch_size=INCREMENTAL_PCA_BATCH_SIZE)
+        for start in range(0, n_samples, INCREMENTAL_PCA_BATCH_SIZE):
+            batch = X_scaled[start:start + INCREMENTAL_PCA_BATCH_SIZE]
+            if len(batch) >= n_components:
+                model.partial_fit(batch)
+        solver = "incremental"
+    else:
+        model = PCA(n_components=n_components, svd_solver="randomized", random_state=random_state)
+        model.fit(X_scaled)
+        solver = "randomized"
+
+    coordinates = np.zeros((n_samples, 2), dtype=np.float32)
+    for start in range(0, n_samples, INCREMENTAL_PCA_BATCH_SIZE):
+        stop = start + INCREMENTAL_PCA_BATCH_SIZE
+        coordinates[start:stop, :n_components] = model.transform(X_scaled[start:stop])
+
+    return {
+        "coordinates": coordinates,
+        "explained_variance_ratio": [float(value) for value in model.explained_variance_ratio_],
+        "solver": solver
+    }
+
+
+def get_projection(file_path: str, columns: List[str], X_scaled: np.ndarray, standardize: bool = True,
+                   session_id: str = None) -> Dict[str, Any]:
+    """
+    获取聚类特征的二维投影，按 (数据集版本, 列, 是否标准化) 缓存，更换聚类方法或参数时无需重新分解
+
+    Args:
+        file_path (str): 数据文件路径
+        columns (List[str]): 参与聚类的列
+        X_scaled (np.ndarray): 聚类特征矩阵，需与缓存键对应
+        standardize (bool): 特征是否经过标准化
+        session_id (str): 用户会话ID
+
+    Returns:
+        Dict[str, Any]: 包含全部样本的二维坐标、各主成分的解释方差比例和求解方式
+    """
+    key = make_cache_key(file_path, list(columns), standardize)
+    return get_or_build(PROJECTION_NAMESPACE, key, lambda: _fit_projection(np.asarray(X_scaled)), session_id)
+
+
+def projection_points(projection: Dict[str, Any], labels: np.ndarray, row_indices: List[int],
+                      point_budget: int = PROJECTION_POINT_BUDGET, random_state: int = 42) -> Dict[str, Any]:
+    """
+    按簇分层抽取不超过点数预算的投影点，保证小簇在散点图中可见
+
+    Args:
+        projection (Dict[str, Any]): get_projection 的返回值
+        labels (np.ndarray): 簇标签，与投影坐标逐行对应
+        row_indices (List[int]): 各样本在原始数据中的行索引
+        point_budget (int): 最大返回点数
+        random_state (int): 抽样随机种子
+
+    Returns:
+        Dict[str, Any]: 包含 x, y, labels, indices, total_points, explained_variance_ratio, solver
+    """
+    labels = np.asarray(labels)
+    sample = stratified_sample_indices(labels, point_budget, random_state)
+    # 簇数很多时每簇保底的样本可能超出预算，再做一次均匀抽样
+    if point_budget is not None and len(sample) > point_budget:
+        rng = np.random.RandomState(random_state)
+        sample = np.sort(rng.choice(sample, point_budget, replace=False))
+    coordinates = projection["coordinates"][sample]
+    return {
+        "x": [round(float(value), 6) for value in coordinates[:, 0]],
+        "y": [round(float(value), 6) for value in coordinates[:, 1]],
+        "labels": [int(label) for label in labels[sample]],
+        "indices": [int(row_indices[i]) for i in sample],
+        "total_points": len(labels),
+        "explained_variance_ratio": projection["explained_variance_ratio"],
+        "solver": projection["solver"]
+    }
@@ -0,0 +1,402 @@
+from typing import List, Dict, Any
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from utils.file_manager import read_columns, iter_column_chunks, ensure_session_dir, READ_CHUNK_SIZE
+from .classification_metrics import confusion_matrix_from_codes, metrics_from_confusion_matrix, evaluate_classifier
+
+# auto模式下文件超过该大小（字节）时使用增量训练
+INCREMENTAL_FILE_SIZE = 256 * 1024 * 1024
+
+# auto模式下特征列超过该数量，或存在非数值特征时使用稀疏训练
+SPARSE_FEATURE_THRESHOLD = 200
+
+# auto模式下数值特征中零值比例超过该值时使用稀疏训练
+SPARSE_ZERO_RATIO = 0.9
+
+# auto模式下用于判断列类型和零值比例的抽样行数
+MODE_SAMPLE_ROWS = 10000
+
+
+class SparseDesignEncoder:
+    """
+    将数据块转换为稀疏设计矩阵：数值列标准化后按列写入，分类列由类别编码直接构造独热列，
+    不生成稠密的虚拟变量表。center为False时数值列只除以标准差、不减均值，零值保持为零，
+    平移由截距吸收
+    """
+
+    # 旧版本保存的编码器没有该属性，均做了中心化
+    center = True
+
+    def __init__(self, numeric_columns: List[str], categorical_columns: List[str],
+                 means: np.ndarray, scales: np.ndarray, categories: Dict[str, List[Any]],
+                 center: bool = True):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.means = np.asarray(means, dtype=float)
+        self.scales = np.asarray(scales, dtype=float)
+        self.categories = {col: list(values) for col, values in categories.items()}
+        self.center = center
+
+        self.feature_names = list(self.numeric_columns)
+        self._offsets = {}
+        offset = len(self.numeric_columns)
+        for col in self.categorical_columns:
+            self._offsets[col] = offset
+            self.feature_names.extend(f"{col}={value}" for value in self.categories[col])
+            offset += len(self.categories[col])
+        self.n_features = offset
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, numeric_columns: List[str], categorical_columns: List[str],
+            center: bool = True):
+        """根据内存中的数据计算数值列的均值、标准差和分类列的类别"""
+        numeric = df[numeric_columns].to_numpy(dtype=float) if numeric_columns else np.empty((len(df), 0))
+        means = np.nanmean(numeric, axis=0) if len(numeric) else np.zeros(len(numeric_columns))
+        scales = np.nanstd(numeric, axis=0) if len(numeric) else np.ones(len(numeric_columns))
+        categories = {col: pd.unique(df[col].dropna().astype(str)).tolist() for col in categorical_columns}
+        return cls(numeric_columns, categorical_columns, means, np.where(scales > 0, scales, 1.0), categories,
+                   center)
+
+    def valid_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """数值特征存在缺失值的行不可用；分类特征缺失视为不属于任何类别"""
+        if not self.numeric_columns:
+            return np.ones(len(df), dtype=bool)
+        return df[self.numeric_columns].notna().all(axis=1).to_numpy()
+
+    def transform_frame(self, df: pd.DataFrame) -> sparse.csr_matrix:
+        """将数据块转换为CSR矩阵，训练时未出现的类别被忽略"""
+        n_rows = len(df)
+        rows, cols, values = [], [], []
+
+        if self.numeric_columns:
+            numeric = df[self.numeric_columns].to_numpy(dtype=float)
+            if self.center:
+                numeric = numeric - self.means
+            numeric = numeric / self.scales
+            row_index, col_index = np.nonzero(numeric)
+            rows.append(row_index)
+            cols.append(col_index)
+            values.append(numeric[row_index, col_index])
+
+        for col in self.categorical_columns:
+            codes = pd.Categorical(df[col].astype(str).where(df[col].notna()),
+                                   categories=self.categories[col]).codes
+            present = np.flatnonzero(codes >= 0)
+            rows.append(present)
+            cols.append(codes[present].astype(np.int64) + self._offsets[col])
+            values.append(np.ones(len(present)))
+
+        if not rows:
+            return sparse.csr_matrix((n_rows, self.n_features))
+        return sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_rows, self.n_features)
+        )
+
+    def raw_coefficients(self, coef: np.ndarray, intercept: np.ndarray) -> tuple:
+        """将标准化尺度上的数值列系数还原到原始尺度"""
+        coef = np.array(coef, dtype=float)
+        intercept = np.array(intercept, dtype=float)
+        k = len(self.numeric_columns)
+        if k:
+            coef[:, :k] = coef[:, :k] / self.scales
+            if self.center:
+                intercept = intercept - coef[:, :k] @ self.means
+        return coef, intercept
+
+
+def split_feature_columns(df: pd.DataFrame, x_columns: List[str]) -> tuple:
+    """按数据类型将特征列分为数值列和分类列"""
+    numeric_columns = [col for col in x_columns if pd.api.types.is_numeric_dtype(df[col])
+                       and not pd.api.types.is_bool_dtype(df[col])]
+    categorical_columns = [col for col in x_columns if col not in numeric_columns]
+    return numeric_columns, categorical_columns
+
+
+def select_training_mode(file_path: str, x_columns: List[str]) -> str:
+    """
+    自动选择逻辑回归训练方式：只读取前MODE_SAMPLE_ROWS行，按列类型和零值比例判断
+
+    Returns:
+        str: "incremental"（大文件分块训练）、"sparse"（稀疏设计矩阵）或 "dense"（原有方式）
+    """
+    if os.path.getsize(file_path) > INCREMENTAL_FILE_SIZE:
+        return "incremental"
+
+    sample = next(iter_column_chunks(file_path, list(x_columns), MODE_SAMPLE_ROWS), None)
+    if sample is None:
+        return "dense"
+    numeric_columns, categorical_columns = split_feature_columns(sample, x_columns)
+    if categorical_columns or len(x_columns) > SPARSE_FEATURE_THRESHOLD:
+        return "sparse"
+
+    values = sample[numeric_columns].to_numpy(dtype=float)
+    if values.size and (values == 0).mean() > SPARSE_ZERO_RATIO:
+        return "sparse"
+    return "dense"
+
+
+def _format_coefficients(feature_names: List[str], coef: np.ndarray, intercept: np.ndarray,
+                         class_labels: List[Any]) -> tuple:
+    """与logistic_regression一致的系数格式：每个类别（或二分类的一组）系数"""
+    coefficients = {}
+    for i, class_coef in enumerate(coef):
+        coefficients[f"class_{class_labels[i]}"] = dict(zip(feature_names, class_coef.tolist()))
+    return coefficients, [float(value) for value in intercept]
+
+
+def sparse_logistic_regression(file_path: str, x_columns: List[str], y_column: str,
+                               session_id: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    稀疏逻辑回归 - 在内存中构造CSR设计矩阵（分类列直接由类别编码生成独热列，数值列不中心化以保持稀疏），
+    使用saga求解
+
+    Returns:
+        Dict[str, Any]: 模型、编码器、类别标签及训练数据上的混淆矩阵
+    """
+    C = kwargs.get("C", 1.0)
+    max_iter = kwargs.get("max_iter", 1000)
+    tol = kwargs.get("tol", 1e-4)
+    fit_intercept = kwargs.get("fit_intercept", True)
+    class_weight = kwargs.get("class_weight", None)
+
+    df = read_columns(file_path, list(x_columns) + [y_column])
+    df = df[df[y_column].notna()]
+    numeric_columns, categorical_columns = split_feature_columns(df, x_columns)
+
+    encoder = SparseDesignEncoder.fit(df, numeric_columns, categorical_columns, center=False)
+    df = df[encoder.valid_mask(df)]
+    if len(df) == 0:
+        raise ValueError("没有有效的数据可用于逻辑回归分析")
+
+    y_codes, class_labels = pd.factorize(df[y_column], sort=True)
+    if len(class_labels) < 2:
+        raise ValueError("目标列必须至少包含2个不同的类别")
+
+    X = encoder.transform_frame(df)
+    model = LogisticRegression(C=C, max_iter=max_iter, solver="saga", tol=tol, fit_intercept=fit_intercept,
+                               class_weight=class_weight, random_state=42)
+    try:
+        model.fit(X, y_codes)
+    except Exception as e:
+        raise ValueError(f"模型拟合失败: {e}")
+
+    evaluation = evaluate_classifier(model, X, y_codes, len(class_labels))
+
+    return {
+        "model": model,
+        "encoder": encoder,
+        "class_labels": class_labels.tolist(),
+        "confusion_matrix": evaluation["confusion_matrix"],
+        "sample_size": len(df),
+        "model_params": {"C": C, "max_iter": max_iter, "solver": "saga", "tol": tol,
+                         "fit_intercept": fit_intercept, "class_weight": class_weight}
+    }
+
+
+def _incremental_statistics(file_path: str, x_columns: List[str], y_column: str, chunksize: int,
+                            numeric_columns: List[str] = None) -> Dict[str, Any]:
+    """
+    分块统计增量训练所需的量：类别计数、数值列的均值和二阶中心矩（按块合并，与fit_streaming_scaler相同）、
+    分类列的取值。numeric_columns为None时按首个数据块的类型划分数值列和分类列
+
+    Returns:
+        Dict[str, Any]: 包含 numeric_columns, categorical_columns, n, mean, m2, class_counts, categories,
+            以及 demoted（在某个数据块中不是数值型的数值列，非空时统计结果无效，需按新的划分重新统计）
+    """
+    columns = list(x_columns) + [y_column]
+    categorical_columns = None
+    if numeric_columns is not None:
+        categorical_columns = [col for col in x_columns if col not in numeric_columns]
+
+    n = 0
+    mean = m2 = None
+    class_counts = {}
+    categories = {}
+    demoted = set()
+    for chunk in iter_column_chunks(file_path, columns, chunksize):
+        if categorical_columns is None:
+            numeric_columns, categorical_columns = split_feature_columns(chunk, x_columns)
+        if mean is None:
+            mean = np.zeros(len(numeric_columns))
+            m2 = np.zeros(len(numeric_columns))
+            categories = {col: {} for col in categorical_columns}
+
+        demoted.update(col for col in numeric_columns if not pd.api.types.is_numeric_dtype(chunk[col])
+                       or pd.api.types.is_bool_dtype(chunk[col]))
+        if demoted:
+            continue
+
+        chunk = chunk[chunk[y_column].notna()]
+        if numeric_columns:
+            chunk = chunk[chunk[numeric_columns].notna().all(axis=1)]
+        if len(chunk) == 0:
+            continue
+
+        if numeric_columns:
+            values = chunk[numeric_columns].to_numpy(dtype=float)
+            chunk_mean = values.mean(axis=0)
+            chunk_m2 = ((values - chunk_mean) ** 2).sum(axis=0)
+            total = n + len(values)
+            delta = chunk_mean - mean
+            mean = mean + delta * len(values) / total
+            m2 = m2 + chunk_m2 + delta ** 2 * n * len(values) / total
+        n += len(chunk)
+        for label, count in chunk[y_column].value_counts().items():
+            class_counts[label] = class_counts.get(label, 0) + int(count)
+        for col in categorical_columns:
+            categories[col].update(dict.fromkeys(chunk[col].dropna().astype(str).unique()))
+
+    numeric_columns = numeric_columns or []
+    return {
+        "numeric_columns": numeric_columns,
+        "categorical_columns": categorical_columns or [],
+        "n": n,
+        "mean": mean if mean is not None else np.zeros(len(numeric_columns)),
+        "m2": m2 if m2 is not None else np.zeros(len(numeric_columns)),
+        "class_counts": class_counts,
+        "categories": categories,
+        "demoted": demoted
+    }
+
+
+def incremental_logistic_regression(file_path: str, x_columns: List[str], y_column: str,
+                                    session_id: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    增量逻辑回归 - 分块读取数据，使用SGDClassifier.partial_fit训练，内存占用与数据行数无关
+
+    第一遍统计类别、数值列均值方差和分类列取值，之后每轮按块训练，最后一遍累加混淆矩阵
+
+    Returns:
+        Dict[str, Any]: 模型、编码器、类别标签及训练数据上的混淆矩阵
+    """
+    C = kwargs.get("C", 1.0)
+    epochs = kwargs.get("epochs", 3)
+    chunksize = kwargs.get("chunksize", READ_CHUNK_SIZE)
+    tol = kwargs.get("tol", 1e-4)
+    fit_intercept = kwargs.get("fit_intercept", True)
+    class_weight = kwargs.get("class_weight", None)
+    columns = list(x_columns) + [y_column]
+
+    # 第一遍：统计量。某列在后续数据块中出现非数值时改为分类列，并按新的划分重新统计
+    stats = _incremental_statistics(file_path, x_columns, y_column, chunksize)
+    while stats["demoted"]:
+        numeric_columns = [col for col in stats["numeric_columns"] if col not in stats["demoted"]]
+        stats = _incremental_statistics(file_path, x_columns, y_column, chunksize, numeric_columns)
+    n = stats["n"]
+    class_counts = stats["class_counts"]
+
+    if n == 0:
+        raise ValueError("没有有效的数据可用于逻辑回归分析")
+    try:
+        class_labels = sorted(class_counts)
+    except TypeError:
+        # 不同数据块中目标列类型不同（如int和str）时无法直接比较
+        class_labels = sorted(class_counts, key=str)
+    n_classes = len(class_labels)
+    if n_classes < 2:
+        raise ValueError("目标列必须至少包含2个不同的类别")
+
+    scales = np.sqrt(stats["m2"] / n)
+    encoder = SparseDesignEncoder(stats["numeric_columns"], stats["categorical_columns"], stats["mean"],
+                                  np.where(scales > 0, scales, 1.0),
+                                  {col: list(values) for col, values in stats["categories"].items()})
+    label_index = pd.Index(class_labels)
+    weights = None
+    if class_weight == "balanced":
+        weights = np.array([n / (n_classes * class_counts[label]) for label in class_labels])
+
+    def prepared_chunks():
+        for chunk in iter_column_chunks(file_path, columns, chunksize):
+            chunk = chunk[chunk[y_column].notna()]
+            chunk = chunk[encoder.valid_mask(chunk)]
+            if len(chunk):
+                yield encoder.transform_frame(chunk), label_index.get_indexer(chunk[y_column])
+
+    # 训练：正则化强度与LogisticRegression的C对应 alpha = 1 / (C * n)
+    model = SGDClassifier(loss="log_loss", alpha=1.0 / (C * n), tol=tol, fit_intercept=fit_intercept,
+                          random_state=42)
+    rng = np.random.RandomState(42)
+    classes = np.arange(n_classes)
+    for _ in range(epochs):
+        for X, y_codes in prepared_chunks():
+            order = rng.permutation(len(y_codes))
+            X, y_codes = X[order], y_codes[order]
+            sample_weight = weights[y_codes] if weights is not None else None
+            model.partial_fit(X, y_codes, classes=classes, sample_weight=sample_weight)
+
+    # 评估：逐块累加混淆矩阵
+    cm = np.zeros((n_classes, n_classes), dtype=np.int64)
+    for X, y_codes in prepared_chunks():
+        y_pred = model.classes_[model.predict_proba(X).argmax(axis=1)]
+        cm += confusion_matrix_from_codes(y_codes, y_pred, n_classes)
+
+    return {
+        "model": model,
+        "encoder": encoder,
+        "class_labels": [label.item() if hasattr(label, "item") else label for label in class_labels],
+        "confusion_matrix": cm,
+        "sample_size": n,
+        "model_params": {"C": C, "epochs": epochs, "solver": "sgd", "tol": tol, "chunksize": chunksize,
+                         "fit_intercept": fit_intercept, "class_weight": class_weight}
+    }
+
+
+def large_scale_logistic_regression(file_path: str, x_columns: List[str], y_column: str, mode: str,
+                                    method: str = "logistic", session_id: str = None,
+                                    **kwargs) -> Dict[str, Any]:
+    """
+    稀疏/增量逻辑回归，返回与logistic_regression一致的结果结构
+
+    Args:
+        file_path (str): 文件路径
+        x_columns (List[str]): 自变量列名列表，可包含分类列
+        y_column (str): 因变量列名
+        mode (str): "sparse" 或 "incremental"
+        method (str): 回归方法
+        session_id (str): 会话ID
+
+    Returns:
+        Dict[str, Any]: 包含逻辑回归结果的字典，以及用于保存模型的 model 和 encoder
+    """
+    if session_id:
+        ensure_session_dir(session_id)
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    if mode == "sparse":
+        fitted = sparse_logistic_regression(file_path, x_columns, y_column, session_id, **kwargs)
+    elif mode == "incremental":
+        fitted = incremental_logistic_regression(file_path, x_columns, y_column, session_id, **kwargs)
+    else:
+        raise ValueError(f"不支持的训练方式: {mode}")
+
+    model = fitted["model"]
+    encoder = fitted["encoder"]
+    class_labels = fitted["class_labels"]
+    cm = fitted["confusion_matrix"]
+    metrics = metrics_from_confusion_matrix(cm)
+
+    coef, intercept = encoder.raw_coefficients(model.coef_, model.intercept_)
+    coefficients, intercept = _format_coefficients(encoder.feature_names, coef, intercept, class_labels)
+
+    return {
+        "method": method,
+        "x_columns": list(x_columns),
+        "y_column": y_column,
+        "coefficients": coefficients,
+        "intercept": intercept,
+        "evaluation_metrics": metrics,
+        "sample_size": fitted["sample_size"],
+        "n_classes": len(class_labels),
+        "class_labels": class_labels,
+        "confusion_matrix": cm.tolist(),
+        "model_params": {**fitted["model_params"], "mode": mode, "n_features": encoder.n_features},
+        "model": model,
+        "encoder": encoder
+    }
@@ -0,0 +1,285 @@
+"""
+模型注册表
+按session保存拟合好的模型及其预处理器，可直接对其他数据集进行预测而无需重新拟合
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import pickle
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils.file_manager import read_columns, read_any_file, append_columns
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 数据目录
+DATA_DIR = "data"
+
+# 模型子目录名称（位于session目录下，随session一起被定期清理）
+MODELS_DIR_NAME = ".models"
+
+# 预测时每批处理的行数
+PREDICT_BATCH_SIZE = 100000
+
+# 预测结果预览的行数
+PREVIEW_ROWS = 20
+
+_MODEL_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def get_models_dir(session_id: str = None) -> str:
+    """
+    获取模型目录，支持session隔离
+    """
+    base_dir = os.path.join(DATA_DIR, session_id) if session_id else DATA_DIR
+    models_dir = os.path.join(base_dir, MODELS_DIR_NAME)
+    os.makedirs(models_dir, exist_ok=True)
+    return models_dir
+
+
+def _model_paths(model_id: str, session_id: str = None) -> tuple:
+    """返回模型文件和元数据文件路径，模型ID格式不正确时视为不存在"""
+    if not _MODEL_ID_PATTERN.match(model_id or ""):
+        raise FileNotFoundError(f"模型不存在: {model_id}")
+    models_dir = get_models_dir(session_id)
+    return os.path.join(models_dir, f"{model_id}.pkl"), os.path.join(models_dir, f"{model_id}.json")
+
+
+def register_model(task: str, method: str, estimator: Any, feature_columns: List[str],
+                   session_id: str = None, preprocessor: Any = None, target_column: str = None,
+                   class_labels: List[Any] = None, source_file: str = None,
+                   params: Dict[str, Any] = None) -> str:
+    """
+    保存拟合好的模型
+
+    Args:
+        task (str): 任务类型 ("linear_regression", "logistic_regression", "clustering")
+        method (str): 具体方法
+        estimator (Any): 拟合好的模型，需提供predict方法
+        feature_columns (List[str]): 特征列，预测时按同样的顺序读取
+        session_id (str): 用户会话ID
+        preprocessor (Any): 预测前对特征执行transform的预处理器（如标准化器）
+        target_column (str): 目标列名
+        class_labels (List[Any]): 分类模型的原始类别标签，下标与模型输出的编码对应
+        source_file (str): 训练数据文件路径
+        params (Dict[str, Any]): 模型参数
+
+    Returns:
+        str: 模型ID
+    """
+    model_id = uuid.uuid4().hex
+    info = {
+        "model_id": model_id,
+        "task": task,
+        "method": method,
+        "feature_columns": list(feature_columns),
+        "target_column": target_column,
+        "class_labels": list(class_labels) if class_labels is not None else None,
+        "source_data_id": os.path.splitext(os.path.basename(source_file))[0] if source_file else None,
+        "params": params or {},
+        "created_at": time.time()
+    }
+    model_path, info_path = _model_paths(model_id, session_id)
+
+    with open(f"{model_path}.tmp", "wb") as f:
+        pickle.dump({"info": info, "estimator": estimator, "preprocessor": preprocessor},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{model_path}.tmp", model_path)
+
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, default=str)
+
+    return model_id
+
+
+def load_model(model_id: str, session_id: str = None) -> Dict[str, Any]:
+    """
+    读取模型
+
+    Returns:
+        Dict[str, Any]: 包含 info, estimator, preprocessor
+
+    Raises:
+        FileNotFoundError: 模型不存在
+    """
+    model_path, _ = _model_paths(model_id, session_id)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"模型不存在: {model_id}")
+
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+def get_model_info(model_id: str, session_id: str = None) -> Dict[str, Any]:
+    """
+    读取模型元数据（不加载模型本身）
+    """
+    _, info_path = _model_paths(model_id, session_id)
+    if not os.path.exists(info_path):
+        raise FileNotFoundError(f"模型不存在: {model_id}")
+
+    with open(info_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_models(session_id: str = None) -> List[Dict[str, Any]]:
+    """
+    列出session下的全部模型，按创建时间倒序
+    """
+    models_dir = get_models_dir(session_id)
+    models = []
+    for filename in os.listdir(models_dir):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(models_dir, filename), "r", encoding="utf-8") as f:
+                models.append(json.load(f))
+        except Exception as e:
+            logger.warning(f"读取模型信息失败 {filename}: {e}")
+    return sorted(models, key=lambda info: info["created_at"], reverse=True)
+
+
+def delete_model(model_id: str, session_id: str = None):
+    """
+    删除模型
+
+    Raises:
+        FileNotFoundError: 模型不存在
+    """
+    model_path, info_path = _model_paths(model_id, session_id)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"模型不存在: {model_id}")
+
+    os.remove(model_path)
+    if os.path.exists(info_path):
+        os.remove(info_path)
+
+
+def _as_model_input(obj: Any, batch: np.ndarray, columns: List[str]):
+    """以DataFrame训练的模型按列名输入，避免特征名称不一致的警告"""
+    if hasattr(obj, "feature_names_in_"):
+        return pd.DataFrame(batch, columns=columns)
+    return batch
+
+
+def _summarize_predictions(task: str, predictions: pd.Series) -> Dict[str, Any]:
+    """汇总预测结果：分类和聚类返回各取值的数量，回归返回描述统计"""
+    valid = predictions.dropna()
+    if task == "linear_regression":
+        if valid.empty:
+            return {}
+        return {
+            "mean": float(valid.mean()),
+            "std": float(valid.std()) if len(valid) > 1 else None,
+            "min": float(valid.min()),
+            "max": float(valid.max())
+        }
+    return {str(label): int(count) for label, count in valid.value_counts().items()}
+
+
+def predict(model_id: str, file_path: str, session_id: str = None,
+            batch_size: int = PREDICT_BATCH_SIZE, write_back: bool = False) -> Dict[str, Any]:
+    """
+    使用已保存的模型对数据集进行预测，只读取特征列并分批向量化计算
+
+    Args:
+        model_id (str): 模型ID
+        file_path (str): 待预测的数据文件路径
+        session_id (str): 用户会话ID
+        batch_size (int): 每批预测的行数
+        write_back (bool): 是否将预测结果作为新列追加到数据集，否则另存为结果文件
+
+    Returns:
+        Dict[str, Any]: 预测结果摘要，特征存在缺失值的行不参与预测
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    model = load_model(model_id, session_id)
+    info = model["info"]
+    estimator = model["estimator"]
+    preprocessor = model["preprocessor"]
+    task = info["task"]
+    feature_columns = info["feature_columns"]
+
+    features = read_columns(file_path, feature_columns)[feature_columns]
+
+    # 提供transform_frame的预处理器（如稀疏设计矩阵编码器）直接处理原始数据块，可包含分类特征
+    frame_preprocessor = hasattr(preprocessor, "transform_frame")
+    if frame_preprocessor:
+        X = None
+        valid_positions = np.flatnonzero(preprocessor.valid_mask(features))
+    else:
+        non_numeric = [col for col in feature_columns if not pd.api.types.is_numeric_dtype(features[col])]
+        if non_numeric:
+            raise ValueError(f"以下特征列不是数值型: {non_numeric}")
+        X = features.to_numpy(dtype=float)
+        valid_positions = np.flatnonzero(~np.isnan(X).any(axis=1))
+    predict_proba = task == "logistic_regression" and hasattr(estimator, "predict_proba")
+
+    labels = np.empty(len(valid_positions), dtype=np.int64 if task != "linear_regression" else float)
+    confidence = np.empty(len(valid_positions)) if predict_proba else None
+    for start in range(0, len(valid_positions), batch_size):
+        positions = valid_positions[start:start + batch_size]
+        if frame_preprocessor:
+            batch = preprocessor.transform_frame(features.iloc[positions])
+        else:
+            batch = X[positions]
+            if preprocessor is not None:
+                batch = preprocessor.transform(_as_model_input(preprocessor, batch, feature_columns))
+            batch = _as_model_input(estimator, batch, feature_columns)
+        if predict_proba:
+            # 一次predict_proba同时得到预测类别和置信度
+            proba = estimator.predict_proba(batch)
+            labels[start:start + len(positions)] = estimator.classes_[proba.argmax(axis=1)]
+            confidence[start:start + len(positions)] = proba.max(axis=1)
+        else:
+            labels[start:start + len(positions)] = estimator.predict(batch)
+
+    # 组装与数据行对齐的预测列，未参与预测的行为空值
+    prediction_column = f"{task}_prediction"
+    predictions = pd.Series(np.nan, index=features.index, dtype=object if task != "linear_regression" else float)
+    if task == "logistic_regression" and info["class_labels"] is not None:
+        predictions.iloc[valid_positions] = np.asarray(info["class_labels"], dtype=object)[labels]
+    else:
+        predictions.iloc[valid_positions] = labels
+    output = pd.DataFrame({prediction_column: predictions})
+    if predict_proba:
+        output[f"{task}_probability"] = np.nan
+        output.iloc[valid_positions, 1] = confidence
+
+    result = {
+        "model_id": model_id,
+        "task": task,
+        "method": info["method"],
+        "feature_columns": feature_columns,
+        "n_rows": len(features),
+        "n_predicted": int(len(valid_positions)),
+        "n_skipped": int(len(features) - len(valid_positions)),
+        "prediction_columns": output.columns.tolist(),
+        "summary": _summarize_predictions(task, predictions),
+        "preview": [
+            {col: (None if pd.isna(value) else (value.item() if hasattr(value, "item") else value))
+             for col, value in row.items()}
+            for row in output.head(PREVIEW_ROWS).to_dict(orient="records")
+        ]
+    }
+
+    if write_back:
+        result["appended_columns"] = append_columns(file_path, output)["appended_columns"]
+    else:
+        result_df = pd.concat([read_any_file(file_path), output], axis=1)
+        filename = f"{os.path.splitext(os.path.basename(file_path))[0]}_prediction_result"
+        result_file_path = os.path.join(os.path.dirname(file_path), f"{filename}.csv")
+        result_df.to_csv(result_file_path, index=False, encoding="utf-8-sig")
+        result["result_file_path"] = result_file_path
+
+    return result
@@ -1,9 +1,14 @@
 from .analyze_sentiment import analyze_sentiment
 from .generate_wordcloud import generate_wordcloud
+from .token_index import get_token_index, query_token_index
+from .keyword_analysis import keyword_analysis
 
 __all__ = [
     'analyze_sentiment',
-    'generate_wordcloud'
+    'generate_wordcloud',
+    'get_token_index',
+    'query_token_index',
+    'keyword_analysis'
 ]
 
 __author__ = 'github.com/746505972'
@@ -1,9 +1,13 @@
 from typing import Dict, Any
 import re
-from snownlp import SnowNLP
 from collections import Counter
 import numpy as np
-from utils.file_manager import read_any_file, ensure_data_dir, ensure_session_dir, generate_new_file_path
+import pandas as pd
+from utils.file_manager import read_columns, ensure_data_dir, ensure_session_dir, append_columns
+
+# 每处理多少条文本上报一次进度
+PROGRESS_INTERVAL = 200
+
 
 def analyze_sentiment(file_path: str, column: str, session_id: str = None, **kwargs) -> Dict[str, Any]:
     """
@@ -16,6 +20,8 @@ def analyze_sentiment(file_path: str, column: str, session_id: str = None, **kwa
         **kwargs: 其他参数，包括:
             - stopwords (List[str]): 自定义停用词列表
             - internet_slang (Dict[str, str]): 网络用语映射字典
+            - progress_callback (Callable): 进度回调，参数为 (已处理条数, 总条数, 当前情感分布)
+            - write_back (bool): 是否将每行的情感标签和得分作为 sentiment / sentiment_score 列追加到数据文件
 
     Returns:
         Dict[str, Any]: 情感分析结果，包括情感分布比例、统计数据等
@@ -27,35 +33,44 @@ def analyze_sentiment(file_path: str, column: str, session_id: str = None, **kwa
     if session_id:
         ensure_session_dir(session_id)
 
-    # 读取数据文件
-    df = read_any_file(file_path)
-
-    # 检查列是否存在
-    if column not in df.columns:
-        raise ValueError(f"列 '{column}' 不存在于数据文件中")
+    # 只读取需要分析的列
+    series = read_columns(file_path, [column])[column]
 
     # 提取指定列的文本数据
-    text_data = df[column].dropna().astype(str).tolist()
+    text_series = series.dropna()
+    text_data = text_series.astype(str).tolist()
 
     # 处理网络用语
     internet_slang = kwargs.get("internet_slang", {})
 
+    progress_callback = kwargs.get("progress_callback")
+
     # 情感分析结果存储
     sentiments = []
     scores = []
+    sentiment_counts = Counter()
+    score_sum = 0.0
+    total_count = len(text_data)
 
     # 初始化情感分析器
     analyzer = SentimentAnalyzer(internet_slang)
 
-    # 对每条文本进行情感分析
-    for text in text_data:
+    if progress_callback:
+        progress_callback(0, total_count, {"sentiment_counts": {}, "average_score": None})
+
+    # 对每条文本进行情感分析，同时累计情感分布
+    for i, text in enumerate(text_data, 1):
         sentiment, score = analyzer.analyze_sentiment(text)
         sentiments.append(sentiment)
         scores.append(score)
+        sentiment_counts[sentiment] += 1
+        score_sum += score
 
-    # 统计情感分布
-    sentiment_counts = Counter(sentiments)
-    total_count = len(sentiments)
+        if progress_callback and (i % PROGRESS_INTERVAL == 0 or i == total_count):
+            progress_callback(i, total_count, {
+                "sentiment_counts": dict(sentiment_counts),
+                "average_score": score_sum / i
+            })
 
     # 计算各类情感的比例
     positive_ratio = sentiment_counts.get('正面', 0) / total_count if total_count > 0 else 0
@@ -85,7 +100,7 @@ def analyze_sentiment(file_path: str, column: str, session_id: str = None, **kwa
     }
 
     # 返回结果
-    return {
+    result = {
         "sentiment_ratios": {
             "positive": positive_ratio,
             "neutral": neutral_ratio,
@@ -103,6 +118,16 @@ def analyze_sentiment(file_path: str, column: str, session_id: str = None, **kwa
         }
     }
 
+    # 将逐行结果以追加列的方式写回数据文件，空文本行的结果为空值
+    if kwargs.get("write_back", False):
+        new_columns = pd.DataFrame({
+            "sentiment": pd.Series(sentiments, index=text_series.index, dtype=object),
+            "sentiment_score": pd.Series(scores, index=text_series.index, dtype=float)
+        }).reindex(series.index)
+        result["appended_columns"] = append_columns(file_path, new_columns)["appended_columns"]
+
+    return result
+
 
 class SentimentAnalyzer:
     def __init__(self, internet_slang: Dict[str, str] = None):
@@ -173,6 +198,9 @@ class SentimentAnalyzer:
             return '中性', 0.5
 
         try:
+            # 延迟导入：snownlp在导入时加载情感模型，启动时由预热任务提前加载
+            from snownlp import SnowNLP
+
             s = SnowNLP(processed_text)
             sentiment_score = s.sentiments
 
@@ -1,13 +1,8 @@
-import jieba.posseg as pseg
 from typing import Dict, Any
 import os
-from collections import Counter
-# 导入pyecharts相关模块
-from pyecharts import options as opts
-from pyecharts.charts import WordCloud
-from pyecharts.globals import ThemeType
 
-from utils.file_manager import read_any_file, ensure_data_dir, ensure_session_dir, generate_new_file_path
+from utils.file_manager import ensure_data_dir, ensure_session_dir
+from .token_index import get_token_index, query_token_index
 
 def generate_wordcloud(file_path: str, column: str, session_id: str = None, **kwargs) -> Dict[str, Any]:
     """
@@ -27,6 +22,7 @@ def generate_wordcloud(file_path: str, column: str, session_id: str = None, **kw
             - color (List[str]): 词云颜色列表
             - max_words (int): 最大词数，默认200
             - stopwords (List[str]): 自定义停用词列表
+            - progress_callback (Callable): 分词进度回调，参数为 (已处理条数, 总条数)
 
     Returns:
         Dict[str, Any]: 生成结果信息
@@ -38,35 +34,13 @@ def generate_wordcloud(file_path: str, column: str, session_id: str = None, **kw
     if session_id:
         ensure_session_dir(session_id)
 
-    # 读取数据文件
-    df = read_any_file(file_path)
+    # 获取词频索引（同一数据版本的同一列只分词一次）
+    token_index = get_token_index(file_path, column, session_id, kwargs.get("progress_callback"))
 
-    # 检查列是否存在
-    if column not in df.columns:
-        raise ValueError(f"列 '{column}' 不存在于数据文件中")
-
-    # 提取指定列的文本数据
-    text_data = df[column].dropna().astype(str).tolist()
-    text = " ".join(text_data)
-
-    # 分词处理
-    words = pseg.cut(text)
-
-    # 处理停用词
-    stopwords = set()  # 不再使用wordcloud的STOPWORDS
-    custom_stopwords = kwargs.get("stopwords", [])
-    stopwords.update([word.lower() for word in custom_stopwords])
-
-    # 提取名词并过滤停用词
-    report_words = []
-    for word, flag in words:
-        word_lower = word.lower()
-        if (len(word) >= 2) and ('n' in flag) and (word_lower not in stopwords):
-            report_words.append(word)
-
-    # 统计高频词汇
+    # 在缓存的词频上过滤停用词并提取高频名词
     max_words = kwargs.get("max_words", 200)
-    result = Counter(report_words).most_common(max_words)
+    custom_stopwords = kwargs.get("stopwords", [])
+    result, total_words = query_token_index(token_index, custom_stopwords, max_words)
 
     # 将结果转换为适合pyecharts WordCloud的数据格式
     wordcloud_data = [(word, count) for word, count in result]
@@ -93,6 +67,11 @@ def generate_wordcloud(file_path: str, column: str, session_id: str = None, **kw
     wordcloud_filename = f"{filename}_{column}_wordcloud.html"
     chart_path = f'{save_dir}/{wordcloud_filename}'
 
+    # 延迟导入pyecharts相关模块，避免启动时加载
+    from pyecharts import options as opts
+    from pyecharts.charts import WordCloud
+    from pyecharts.globals import ThemeType
+
     # 创建WordCloud实例
     wordcloud = (
         WordCloud(init_opts=opts.InitOpts(
@@ -129,5 +108,5 @@ def generate_wordcloud(file_path: str, column: str, session_id: str = None, **kw
     return {
         "chart_path": chart_path,  # 返回HTML文件路径
         "top_words": dict(result[:50]),  # 返回前50个高频词
-        "total_words": len(report_words)
+        "total_words": total_words
     }
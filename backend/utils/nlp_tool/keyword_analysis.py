@@ -0,0 +1,257 @@
+from typing import Dict, Any, List
+import re
+import zlib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.file_manager import read_columns, ensure_data_dir, ensure_session_dir
+from utils.cache_manager import make_cache_key, get_or_build
+
+# 缓存命名空间（缓存内容的结构变化时更换，避免读到旧结构的缓存）
+TERM_MATRIX_NAMESPACE = "term_matrix_v2"
+
+# 哈希词表大小，限制稀疏矩阵的列数和反查词表的内存占用
+DEFAULT_N_FEATURES = 2 ** 20
+
+# 分组比较时最多保留的分组数量（按分组大小）
+MAX_GROUPS = 20
+
+_WORD_PATTERN = re.compile(r"\w")
+
+
+def _hash_term(term: str, n_features: int) -> int:
+    """将词映射到哈希词表中的列号（跨进程稳定）"""
+    return zlib.crc32(term.encode("utf-8")) % n_features
+
+
+def tokenize(text: str) -> List[str]:
+    """分词并去掉空白和纯标点，英文统一转为小写"""
+    import jieba
+
+    return [token.lower() for token in jieba.lcut(text) if _WORD_PATTERN.search(token)]
+
+
+def build_term_matrix(text_data: List[str], n_features: int = DEFAULT_N_FEATURES) -> Dict[str, Any]:
+    """
+    构建单词和二元词组的稀疏词频矩阵，使用哈希词表限制内存
+
+    Args:
+        text_data (List[str]): 文本列表
+        n_features (int): 哈希词表大小
+
+    Returns:
+        Dict[str, Any]: 包含 unigram/bigram 的CSR矩阵及列号到词的反查表，
+            哈希冲突时反查表保留最先出现的词
+    """
+    matrices = {}
+    for name in ("unigram", "bigram"):
+        matrices[name] = {"indptr": [0], "indices": [], "terms": {}, "memo": {}}
+
+    for text in text_data:
+        tokens = tokenize(text)
+        grams = {
+            "unigram": tokens,
+            "bigram": [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        }
+        for name, terms in grams.items():
+            store = matrices[name]
+            memo = store["memo"]
+            for term in terms:
+                index = memo.get(term)
+                if index is None:
+                    index = memo[term] = _hash_term(term, n_features)
+                    store["terms"].setdefault(index, term)
+                store["indices"].append(index)
+            store["indptr"].append(len(store["indices"]))
+
+    result = {"n_documents": len(text_data), "n_features": n_features}
+    for name, store in matrices.items():
+        indices = np.asarray(store["indices"], dtype=np.int32)
+        indptr = np.asarray(store["indptr"], dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(text_data), n_features)
+        )
+        # 合并同一文档中的重复词
+        matrix.sum_duplicates()
+
+        # 预先计算过滤所需的数组，查询时无需逐词遍历
+        terms = store["terms"]
+        term_index = np.fromiter(terms.keys(), dtype=np.int64, count=len(terms))
+        parts = [term.split(" ") for term in terms.values()]
+        result[name] = matrix
+        result[f"{name}_terms"] = terms
+        result[f"{name}_term_index"] = term_index
+        result[f"{name}_min_length"] = np.array([min(len(p) for p in part) for part in parts], dtype=np.int32)
+        result[f"{name}_parts"] = np.array(parts, dtype=object).reshape(len(parts), 1 if name == "unigram" else 2)
+    return result
+
+
+def get_term_matrix(file_path: str, column: str, session_id: str = None,
+                    n_features: int = DEFAULT_N_FEATURES) -> Dict[str, Any]:
+    """
+    获取指定列的稀疏词频矩阵，按 (数据集版本, 列名, 词表大小) 缓存
+
+    Returns:
+        Dict[str, Any]: 词频矩阵，额外包含非空文本所在的行号 row_positions
+    """
+    def builder():
+        series = read_columns(file_path, [column])[column]
+        mask = series.notna().to_numpy()
+        term_matrix = build_term_matrix(series[mask].astype(str).tolist(), n_features)
+        term_matrix["row_positions"] = np.flatnonzero(mask)
+        return term_matrix
+
+    key = make_cache_key(file_path, column, n_features)
+    return get_or_build(TERM_MATRIX_NAMESPACE, key, builder, session_id)
+
+
+def _valid_features(term_matrix: Dict[str, Any], name: str, stopwords: set, min_length: int = 1) -> np.ndarray:
+    """根据停用词和词长生成可用列的掩码，二元词组中任一词为停用词即被过滤"""
+    n_features = term_matrix["n_features"]
+    term_index = term_matrix[f"{name}_term_index"]
+    keep = term_matrix[f"{name}_min_length"] >= min_length
+
+    if stopwords:
+        # 按词本身判断，不能按哈希列号判断，否则与停用词哈希冲突的无关词也会被过滤
+        keep &= ~np.isin(term_matrix[f"{name}_parts"], list(stopwords)).any(axis=1)
+
+    valid = np.zeros(n_features, dtype=bool)
+    valid[term_index[keep]] = True
+    return valid
+
+
+def _top_indices(scores: np.ndarray, valid: np.ndarray, top_k: int) -> np.ndarray:
+    """在可用列中取得分最高的top_k个列号，按得分降序"""
+    candidates = np.flatnonzero(valid & (scores > 0))
+    if len(candidates) > top_k:
+        candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _group_comparison(matrix: sparse.csr_matrix, groups: pd.Series, valid: np.ndarray,
+                      terms: Dict[int, str], top_k: int, prior: float = 0.5) -> Dict[str, Any]:
+    """
+    比较各分组与其余文档的用词差异，使用平滑对数几率比的z值排序
+    """
+    codes, uniques = pd.factorize(groups)
+    kept = codes >= 0
+    n_groups = len(uniques)
+    if n_groups == 0:
+        return {}
+
+    # 分组指示矩阵 (分组 × 文档)，一次稀疏乘法得到每组的词频
+    indicator = sparse.csr_matrix(
+        (np.ones(int(kept.sum()), dtype=np.int64), (codes[kept], np.flatnonzero(kept))),
+        shape=(n_groups, matrix.shape[0])
+    )
+    group_counts = (indicator @ matrix).tocsr()
+    group_totals = np.asarray(group_counts.sum(axis=1)).ravel()
+    total_counts = np.asarray(group_counts.sum(axis=0)).ravel().astype(float)
+    total = float(group_totals.sum())
+    group_sizes = np.bincount(codes[kept], minlength=n_groups)
+
+    comparison = {}
+    for g in np.argsort(-group_sizes, kind="stable")[:MAX_GROUPS]:
+        counts = group_counts.getrow(g).toarray().ravel().astype(float)
+        rest = total_counts - counts
+        n_group = float(group_totals[g])
+        n_rest = total - n_group
+        if n_group == 0:
+            continue
+
+        log_odds = (np.log((counts + prior) / (n_group - counts + prior))
+                    - np.log((rest + prior) / (n_rest - rest + prior)))
+        z_scores = log_odds / np.sqrt(1.0 / (counts + prior) + 1.0 / (rest + prior))
+        z_scores[counts == 0] = 0
+
+        top = _top_indices(z_scores, valid, top_k)
+        comparison[str(uniques[g])] = {
+            "documents": int(group_sizes[g]),
+            "terms": [{
+                "word": terms[i],
+                "frequency": int(counts[i]),
+                "share": float(counts[i] / n_group),
+                "log_odds": float(log_odds[i]),
+                "z_score": float(z_scores[i])
+            } for i in top]
+        }
+    return comparison
+
+
+def keyword_analysis(file_path: str, column: str, session_id: str = None,
+                     top_k: int = 50, stopwords: List[str] = None, group_by: str = None,
+                     min_length: int = 2, n_features: int = DEFAULT_N_FEATURES) -> Dict[str, Any]:
+    """
+    关键词与n-gram分析 - 基于缓存的稀疏词频矩阵计算TF-IDF关键词、二元词组频率和分组用词比较
+
+    Args:
+        file_path (str): 数据文件路径
+        column (str): 文本列名
+        session_id (str): 用户会话ID
+        top_k (int): 每项统计返回的词数
+        stopwords (List[str]): 停用词列表（不区分大小写）
+        group_by (str): 分组列名，提供时比较各分组的特征词
+        min_length (int): 关键词最小长度（二元词组中每个词均需满足）
+        n_features (int): 哈希词表大小
+
+    Returns:
+        Dict[str, Any]: 关键词分析结果
+    """
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    # 确保数据目录存在
+    ensure_data_dir()
+
+    if session_id:
+        ensure_session_dir(session_id)
+
+    term_matrix = get_term_matrix(file_path, column, session_id, n_features)
+    stopword_set = {word.lower() for word in (stopwords or [])}
+
+    # TF-IDF关键词：每篇文档的TF-IDF向量（L2归一化）在全部文档上求和
+    n_features = term_matrix["n_features"]
+    unigram = term_matrix["unigram"]
+    unigram_terms = term_matrix["unigram_terms"]
+    unigram_valid = _valid_features(term_matrix, "unigram", stopword_set, min_length)
+    frequency = np.asarray(unigram.sum(axis=0)).ravel()
+    document_frequency = np.bincount(unigram.indices, minlength=n_features)
+    tfidf = np.asarray(TfidfTransformer().fit_transform(unigram).sum(axis=0)).ravel()
+
+    tfidf_keywords = [{
+        "word": unigram_terms[i],
+        "tfidf": float(tfidf[i]),
+        "frequency": int(frequency[i]),
+        "document_frequency": int(document_frequency[i])
+    } for i in _top_indices(tfidf, unigram_valid, top_k)]
+
+    # 二元词组频率
+    bigram = term_matrix["bigram"]
+    bigram_terms = term_matrix["bigram_terms"]
+    bigram_valid = _valid_features(term_matrix, "bigram", stopword_set, min_length)
+    bigram_frequency = np.asarray(bigram.sum(axis=0)).ravel()
+    bigram_document_frequency = np.bincount(bigram.indices, minlength=n_features)
+
+    bigrams = [{
+        "bigram": bigram_terms[i],
+        "frequency": int(bigram_frequency[i]),
+        "document_frequency": int(bigram_document_frequency[i])
+    } for i in _top_indices(bigram_frequency.astype(float), bigram_valid, top_k)]
+
+    result = {
+        "column": column,
+        "n_documents": term_matrix["n_documents"],
+        "vocabulary_size": len(unigram_terms),
+        "tfidf_keywords": tfidf_keywords,
+        "bigrams": bigrams
+    }
+
+    # 分组用词比较
+    if group_by:
+        groups = read_columns(file_path, [group_by])[group_by].iloc[term_matrix["row_positions"]]
+        result["group_by"] = group_by
+        result["group_comparison"] = _group_comparison(
+            unigram, groups.reset_index(drop=True), unigram_valid, unigram_terms, top_k)
+
+    return result
@@ -0,0 +1,90 @@
+from typing import List, Tuple, Callable
+from collections import Counter
+import pandas as pd
+
+from utils.file_manager import read_columns
+from utils.cache_manager import make_cache_key, get_or_build
+
+# 缓存命名空间
+TOKEN_INDEX_NAMESPACE = "token_index"
+
+# 每批拼接分词的文本条数
+SEGMENT_BATCH_SIZE = 2000
+
+
+def build_token_index(text_data: List[str], progress_callback: Callable = None) -> pd.DataFrame:
+    """
+    对文本列进行一次分词，统计 (词, 词性) 的出现次数
+
+    Args:
+        text_data (List[str]): 文本列表
+        progress_callback (Callable): 进度回调，参数为 (已处理条数, 总条数)
+
+    Returns:
+        pd.DataFrame: 包含 word, flag, count 三列的词频索引，按词首次出现的顺序排列
+    """
+    # 延迟导入：jieba.posseg在导入时加载词性词典，启动时由预热任务提前加载
+    import jieba.posseg as pseg
+
+    counter = Counter()
+    for start in range(0, len(text_data), SEGMENT_BATCH_SIZE):
+        text = " ".join(text_data[start:start + SEGMENT_BATCH_SIZE])
+        counter.update((word, flag) for word, flag in pseg.cut(text))
+        if progress_callback:
+            progress_callback(min(start + SEGMENT_BATCH_SIZE, len(text_data)), len(text_data))
+
+    return pd.DataFrame(
+        [(word, flag, count) for (word, flag), count in counter.items()],
+        columns=["word", "flag", "count"]
+    )
+
+
+def get_token_index(file_path: str, column: str, session_id: str = None,
+                    progress_callback: Callable = None) -> pd.DataFrame:
+    """
+    获取指定列的词频索引，按 (数据集版本, 列名) 缓存，仅在数据变化后重新分词
+
+    Args:
+        file_path (str): 数据文件路径
+        column (str): 文本列名
+        session_id (str): 用户会话ID
+        progress_callback (Callable): 分词进度回调，仅在缓存未命中时调用
+
+    Returns:
+        pd.DataFrame: 词频索引
+    """
+    def builder():
+        # 只读取需要分词的列
+        df = read_columns(file_path, [column])
+        return build_token_index(df[column].dropna().astype(str).tolist(), progress_callback)
+
+    key = make_cache_key(file_path, column)
+    return get_or_build(TOKEN_INDEX_NAMESPACE, key, builder, session_id)
+
+
+def query_token_index(index: pd.DataFrame, stopwords: List[str] = None, max_words: int = 200,
+                      pos: str = "n", min_length: int = 2) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    在词频索引上过滤停用词、词性和词长，并取出高频词
+
+    Args:
+        index (pd.DataFrame): 词频索引
+        stopwords (List[str]): 停用词列表（不区分大小写）
+        max_words (int): 返回的最大词数
+        pos (str): 词性标记需包含的字符，默认'n'（名词）
+        min_length (int): 最小词长
+
+    Returns:
+        Tuple[List[Tuple[str, int]], int]: (按词频降序的 (词, 次数) 列表, 过滤后的总词数)
+    """
+    if index.empty:
+        return [], 0
+
+    mask = (index["word"].str.len() >= min_length) & index["flag"].str.contains(pos, regex=False)
+    if stopwords:
+        mask &= ~index["word"].str.lower().isin({word.lower() for word in stopwords})
+
+    counts = index.loc[mask].groupby("word", sort=False)["count"].sum()
+    top = counts.nlargest(max_words, keep="first")
+
+    return [(word, int(count)) for word, count in top.items()], int(counts.sum())
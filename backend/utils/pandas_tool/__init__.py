@@ -7,6 +7,8 @@ from .hypothesis_tests import normality_test, t_test, f_test, chi_square_test, n
 from .text_to_numeric_or_datetime import text_to_numeric_or_datetime
 from .correlation_analysis import correlation_analysis
 from .linear_regression import linear_regression
+from .streaming_ols import streaming_ols
+from .regularization_path import regularization_path
 
 __all__ = [
     "check_and_read",
@@ -21,7 +23,9 @@ __all__ = [
     "non_parametric_test",
     "text_to_numeric_or_datetime",
     "correlation_analysis",
-    "linear_regression"
+    "linear_regression",
+    "streaming_ols",
+    "regularization_path"
 ]
 
 __author__ = 'github.com/746505972'
@@ -3,7 +3,8 @@ import pandas as pd
 from utils.file_manager import ensure_session_dir, read_any_file
 from typing import List
 
-def check_and_read(file_path: str, columns: List[str], session_id: str = None, select_all_cols: bool = False) -> tuple:
+def check_and_read(file_path: str, columns: List[str], session_id: str = None, select_all_cols: bool = False,
+                   require_numeric: bool = True) -> tuple:
     """
     检查文件和列的有效性，并读取数据
 
@@ -12,6 +13,7 @@ def check_and_read(file_path: str, columns: List[str], session_id: str = None, s
         columns (List[str]): 需要处理的列名列表
         session_id (str): 会话ID
         select_all_cols (bool): 默认选全部列
+        require_numeric (bool): 没有数值型列时是否报错（处理文本列的方法传False）
 
     Returns:
         tuple: (df, numeric_columns) 数据框和有效的数值列列表
@@ -32,6 +34,17 @@ def check_and_read(file_path: str, columns: List[str], session_id: str = None, s
     # 读取文件
     df = read_any_file(file_path)
 
+    return df, select_numeric_columns(df, columns, select_all_cols, require_numeric)
+
+
+def select_numeric_columns(df: pd.DataFrame, columns: List[str], select_all_cols: bool = False,
+                           require_numeric: bool = True) -> List[str]:
+    """
+    检查列的有效性并返回其中的数值型列，供已在内存中的数据使用（如清洗流水线）
+
+    Raises:
+        ValueError: 列不存在或没有有效的数值型列
+    """
     # 检查列是否存在
     missing_columns = [col for col in columns if col not in df.columns]
     if missing_columns:
@@ -46,7 +59,7 @@ def check_and_read(file_path: str, columns: List[str], session_id: str = None, s
     # 只选择数值型列进行处理
     numeric_columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
 
-    if not numeric_columns:
+    if require_numeric and not numeric_columns:
         raise ValueError("没有有效的数值型列可供处理")
 
-    return df, numeric_columns
+    return numeric_columns
@@ -1,12 +1,45 @@
 from typing import List, Dict, Any
+import os
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, QuantileTransformer, PowerTransformer
 import numpy as np
-from .check_and_read import check_and_read
-from ..file_manager import generate_new_file_path
+import pandas as pd
+from .check_and_read import check_and_read, select_numeric_columns
+from .streaming_scalers import streaming_dimensionless_processing, transform_streaming_chunk, STREAMING_METHODS
+from ..file_manager import generate_new_file_path, ensure_session_dir, READ_CHUNK_SIZE, STREAMING_FILE_SIZE
+from ..transformer_registry import register_transformer
+
+
+def _fitted_state(method: str, columns: List[str], scaler: Any = None, divisor: np.ndarray = None,
+                  shift: float = 0) -> Dict[str, Any]:
+    """
+    将内存中拟合的结果整理成与fit_streaming_scaler相同格式的参数，供transform_streaming_chunk重放；
+    幂变换无法用统计量表示，直接保存拟合好的PowerTransformer
+    """
+    state = {"method": method, "columns": list(columns)}
+    if method == "standard":
+        state.update(mean=scaler.mean_, var=scaler.var_)
+    elif method == "minmax":
+        state.update(min=scaler.data_min_, max=scaler.data_max_)
+    elif method == "robust":
+        state.update(center=scaler.center_, iqr=scaler.scale_)
+    elif method in ("unit", "l2"):
+        state["l2"] = np.asarray(divisor, dtype=float)
+    elif method == "l1":
+        state["l1"] = np.asarray(divisor, dtype=float)
+    elif method == "max":
+        state["abs_max"] = np.asarray(divisor, dtype=float)
+    elif method == "quantile":
+        state.update(references=scaler.references_, quantiles=scaler.quantiles_,
+                     output_distribution=scaler.output_distribution)
+    else:
+        state.update(scaler=scaler, shift=shift)
+    return state
 
 
 def dimensionless_processing(file_path: str, columns: List[str], method: str = "standard",
-                             session_id: str = None, **kwargs) -> Dict[str, Any]:
+                             session_id: str = None, streaming: bool = None,
+                             chunksize: int = READ_CHUNK_SIZE, save_transformer: bool = True,
+                             fitted: Dict[str, Any] = None, **kwargs) -> Dict[str, Any]:
     """
     量纲处理 - 对数据进行标准化、归一化等处理
 
@@ -25,15 +58,94 @@ def dimensionless_processing(file_path: str, columns: List[str], method: str = "
             - "l2": L2范数标准化 (与unit相同)
             - "max": 最大值标准化
         session_id (str): 会话ID
+        streaming (bool): 是否分块处理（两遍读取，内存占用与数据量无关），None表示CSV文件超过
+            STREAMING_FILE_SIZE且方法支持时自动启用；幂变换（yeo-johnson、box-cox）不支持分块处理，
+            robust和quantile方法的分位数由分位数草图近似估计
+        chunksize (int): 分块处理时每块的行数
+        save_transformer (bool): 是否保存拟合得到的参数，以便对新数据重放同样的变换
+        fitted (Dict[str, Any]): 已保存的参数（由预处理器注册表传入），传入时不重新拟合
         **kwargs: 其他参数，用于特定方法的配置
             - n_quantiles: 分位数变换的分位数数量 (默认100)
             - output_distribution: 分位数变换的输出分布 ('uniform'或'normal')
             - standardize: 是否在power变换后标准化数据 (默认True)
+            - sketch_size: 分块处理时分位数草图每层的样本数 (默认4096)
 
     Returns:
         Dict[str, Any]: 处理结果信息
     """
-    df, numeric_columns = check_and_read(file_path, columns, session_id)
+    is_csv = os.path.splitext(file_path)[1].lower() in [".csv", ".txt"]
+    if streaming is None:
+        # 重放已拟合的参数时只需一遍变换，所有方法都可以分块处理
+        streaming = (is_csv and (method in STREAMING_METHODS or fitted is not None) and os.path.isfile(file_path)
+                     and os.path.getsize(file_path) > STREAMING_FILE_SIZE)
+    if streaming:
+        if not is_csv:
+            raise ValueError("分块处理仅支持CSV文件")
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+        if session_id:
+            ensure_session_dir(session_id)
+        new_filename, new_file_path = generate_new_file_path(file_path, session_id)
+        stats = streaming_dimensionless_processing(file_path, new_file_path, columns, method, chunksize,
+                                                   fitted, **kwargs)
+        result = {
+            "data_id": new_filename,
+            "saved_path": new_file_path,
+            "processed_columns": stats["processed_columns"],
+            "method": method,
+            "streaming": True,
+            "chunks": stats["chunks"]
+        }
+        if save_transformer and fitted is None:
+            result["transformer_id"] = register_transformer(
+                "dimensionless_processing", method, stats["processed_columns"], stats["fitted"],
+                session_id, source_file=file_path, params=kwargs)
+        return result
+
+    df, _ = check_and_read(file_path, fitted["columns"] if fitted else columns, session_id)
+    df, numeric_columns, state = dimensionless_processing_frame(df, columns, method, fitted, **kwargs)
+
+    # 保存处理后的数据
+    new_filename, new_file_path = generate_new_file_path(file_path, session_id)
+    df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
+
+    result = {
+        "data_id": new_filename,
+        "saved_path": new_file_path,
+        "processed_columns": numeric_columns,
+        "method": method,
+        "streaming": False
+    }
+    if save_transformer and fitted is None:
+        result["transformer_id"] = register_transformer(
+            "dimensionless_processing", method, numeric_columns, state,
+            session_id, source_file=file_path, params=kwargs)
+    return result
+
+
+def dimensionless_processing_frame(df: pd.DataFrame, columns: List[str], method: str = "standard",
+                                   fitted: Dict[str, Any] = None, **kwargs) -> tuple:
+    """
+    对内存中的数据做量纲处理，参数含义同dimensionless_processing
+
+    Returns:
+        tuple: (df, processed_columns, state) 处理后的数据、处理的数值列和可重放的拟合参数
+    """
+    if fitted is not None:
+        # 用已保存的参数对整个数据块做一次变换，不重新拟合
+        columns = fitted["columns"]
+        numeric_columns = select_numeric_columns(df, columns)
+        non_numeric = [col for col in columns if col not in numeric_columns]
+        if non_numeric:
+            raise ValueError(f"以下列不是数值型: {non_numeric}")
+        block = transform_streaming_chunk(df[columns].to_numpy(dtype=float, na_value=np.nan), fitted)
+        df[columns] = pd.DataFrame(block, columns=columns, index=df.index)
+        return df, columns, fitted
+
+    numeric_columns = select_numeric_columns(df, columns)
+    scaler = None
+    divisor = None
+    shift = 0
 
     # 根据方法选择对应的处理器
     if method == "standard":
@@ -49,22 +161,19 @@ def dimensionless_processing(file_path: str, columns: List[str], method: str = "
         df[numeric_columns] = scaler.fit_transform(df[numeric_columns])
 
     elif method in ["unit", "l2"]:
-        # L2范数标准化
-        df[numeric_columns] = df[numeric_columns].div(
-            np.linalg.norm(df[numeric_columns], axis=0), axis=1
-        )
+        # L2范数标准化，缺失值不参与计算，与分块处理一致
+        divisor = np.sqrt(np.nansum(df[numeric_columns].to_numpy(dtype=float) ** 2, axis=0))
+        df[numeric_columns] = df[numeric_columns].div(divisor, axis=1)
 
     elif method == "l1":
-        # L1范数标准化
-        df[numeric_columns] = df[numeric_columns].div(
-            np.linalg.norm(df[numeric_columns], ord=1, axis=0), axis=1
-        )
+        # L1范数标准化，缺失值不参与计算，与分块处理一致
+        divisor = np.nansum(np.abs(df[numeric_columns].to_numpy(dtype=float)), axis=0)
+        df[numeric_columns] = df[numeric_columns].div(divisor, axis=1)
 
     elif method == "max":
         # 最大值标准化
-        df[numeric_columns] = df[numeric_columns].div(
-            df[numeric_columns].abs().max(), axis=1
-        )
+        divisor = df[numeric_columns].abs().max()
+        df[numeric_columns] = df[numeric_columns].div(divisor, axis=1)
 
     elif method == "quantile":
         # 分位数变换
@@ -88,7 +197,8 @@ def dimensionless_processing(file_path: str, columns: List[str], method: str = "
             # 对非正值添加常数使其变为正值
             min_val = df[numeric_columns].min().min()
             if min_val <= 0:
-                df[numeric_columns] = df[numeric_columns] + abs(min_val) + 1
+                shift = abs(min_val) + 1
+                df[numeric_columns] = df[numeric_columns] + shift
 
         standardize = kwargs.get('standardize', True)
         scaler = PowerTransformer(method='box-cox', standardize=standardize)
@@ -97,13 +207,4 @@ def dimensionless_processing(file_path: str, columns: List[str], method: str = "
     else:
         raise ValueError(f"不支持的量纲处理方法: {method}")
 
-    # 保存处理后的数据
-    new_filename, new_file_path = generate_new_file_path(file_path, session_id)
-    df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
-
-    return {
-        "data_id": new_filename,
-        "saved_path": new_file_path,
-        "processed_columns": numeric_columns,
-        "method": method
-    }
+    return df, numeric_columns, _fitted_state(method, numeric_columns, scaler, divisor, shift)
@@ -0,0 +1,130 @@
+from typing import List, Tuple
+from itertools import combinations_with_replacement
+import numpy as np
+
+# 单次生成的特征块的最大字节数，超过时在分配内存前报错
+MAX_FEATURE_BLOCK_BYTES = 1024 ** 3
+
+# 支持的输出精度
+FEATURE_DTYPES = ("float64", "float32")
+
+
+def _resolve_dtype(dtype: str) -> np.dtype:
+    if dtype not in FEATURE_DTYPES:
+        raise ValueError(f"不支持的特征精度: {dtype}，可选 {list(FEATURE_DTYPES)}")
+    return np.dtype(dtype)
+
+
+def check_block_size(n_rows: int, n_features: int, dtype: str = "float64",
+                     max_bytes: int = MAX_FEATURE_BLOCK_BYTES) -> int:
+    """
+    在分配内存前检查特征块大小，超过上限时抛出ValueError
+
+    Returns:
+        int: 特征块的字节数
+    """
+    n_bytes = n_rows * n_features * _resolve_dtype(dtype).itemsize
+    if max_bytes and n_bytes > max_bytes:
+        raise ValueError(
+            f"生成的特征块为 {n_rows}行×{n_features}列 ({dtype})，约{n_bytes / 1024 ** 2:.0f}MB，"
+            f"超过上限{max_bytes / 1024 ** 2:.0f}MB，请减少列数、降低多项式度数、关闭交叉项或使用float32"
+        )
+    return n_bytes
+
+
+def polynomial_terms(columns: List[str], degree: int = 2,
+                     cross_terms: bool = False) -> List[Tuple[Tuple[int, ...], str]]:
+    """
+    枚举2到degree次的多项式项，不计算数值
+
+    Args:
+        columns (List[str]): 参与的列
+        degree (int): 最高次数
+        cross_terms (bool): 是否包含不同列之间的交叉项，否则只生成各列自身的幂
+
+    Returns:
+        List[Tuple[Tuple[int, ...], str]]: (列下标组合, 特征名)，每项都排在其低一次的项之后，
+            例如 ((0, 0), "a^2")、((0, 1), "a*b")
+    """
+    if degree < 2:
+        raise ValueError("多项式度数必须大于等于2")
+
+    if cross_terms:
+        combos = [combo for d in range(2, degree + 1)
+                  for combo in combinations_with_replacement(range(len(columns)), d)]
+    else:
+        # 与逐列生成时的列顺序一致: a^2, a^3, b^2, ...
+        combos = [(i,) * d for i in range(len(columns)) for d in range(2, degree + 1)]
+
+    terms = []
+    for combo in combos:
+        parts = []
+        for i in sorted(set(combo)):
+            power = combo.count(i)
+            parts.append(columns[i] if power == 1 else f"{columns[i]}^{power}")
+        terms.append((combo, "*".join(parts)))
+    return terms
+
+
+def polynomial_features(X: np.ndarray, columns: List[str], degree: int = 2, cross_terms: bool = False,
+                        dtype: str = "float64", max_bytes: int = MAX_FEATURE_BLOCK_BYTES) -> tuple:
+    """
+    一次性生成多项式特征块：先检查输出大小，再分配整个块，
+    每个d次项由对应的d-1次项乘以一列得到，不重复计算幂
+
+    Args:
+        X (np.ndarray): 原始特征矩阵 (n×p)
+        columns (List[str]): 各列名称
+        degree (int): 最高次数
+        cross_terms (bool): 是否包含交叉项
+        dtype (str): 输出精度 ("float64" 或 "float32")
+        max_bytes (int): 特征块的最大字节数
+
+    Returns:
+        tuple: (block, feature_names)
+    """
+    terms = polynomial_terms(columns, degree, cross_terms)
+    check_block_size(len(X), len(terms), dtype, max_bytes)
+
+    X = np.asarray(X, dtype=_resolve_dtype(dtype))
+    block = np.empty((len(X), len(terms)), dtype=X.dtype)
+    # 已计算项的列位置，一次项直接取原始矩阵
+    position = {}
+    for j, (combo, _) in enumerate(terms):
+        prefix = combo[:-1]
+        base = X[:, prefix[0]] if len(prefix) == 1 else block[:, position[prefix]]
+        np.multiply(base, X[:, combo[-1]], out=block[:, j])
+        position[combo] = j
+    return block, [name for _, name in terms]
+
+
+def elementwise_transform(X: np.ndarray, operation: str, power: float = 2,
+                          dtype: str = "float64") -> np.ndarray:
+    """
+    对整个矩阵做逐元素变换，返回新的矩阵
+
+    Args:
+        X (np.ndarray): 原始特征矩阵，缺失值为NaN
+        operation (str): "log"（列最小值不大于0时先平移到1）、"exp"、"power"、"sqrt"（负数取绝对值）
+        power (float): 幂指数 (用于"power"操作)
+        dtype (str): 输出精度
+
+    Returns:
+        np.ndarray: 变换后的矩阵
+    """
+    X = np.array(X, dtype=_resolve_dtype(dtype))
+    with np.errstate(all="ignore"):
+        if operation == "log":
+            min_values = np.nanmin(X, axis=0) if len(X) else np.zeros(X.shape[1])
+            shift = np.where(min_values <= 0, np.abs(min_values) + 1, 0).astype(X.dtype)
+            X += shift
+            np.log(X, out=X)
+        elif operation == "exp":
+            np.exp(X, out=X)
+        elif operation == "power":
+            np.power(X, power, out=X)
+        elif operation == "sqrt":
+            np.sqrt(np.abs(X, out=X), out=X)
+        else:
+            raise ValueError(f"不支持的逐元素变换: {operation}")
+    return X
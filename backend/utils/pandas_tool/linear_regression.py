@@ -1,8 +1,13 @@
 from typing import List, Dict, Any
+import os
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression, Lasso, Ridge, ElasticNet
 from .check_and_read import check_and_read
+from .streaming_ols import streaming_ols
+from utils.model_registry import register_model
+from utils.file_manager import STREAMING_FILE_SIZE
+
 
 def _safe_float(value):
     """安全地将值转换为float，处理inf和nan值"""
@@ -17,6 +22,27 @@ def _safe_float(value):
         return None
 
 
+def _streaming_linear_regression(file_path: str, x_columns: List[str], y_column: str,
+                                 session_id: str = None, **kwargs) -> Dict[str, Any]:
+    """流式OLS求解，并将系数封装为LinearRegression模型保存"""
+    fit_intercept = kwargs.get("fit_intercept", True)
+    chunksize = kwargs.get("chunksize", 100000)
+
+    result = streaming_ols(file_path, x_columns, y_column, session_id, fit_intercept, chunksize)
+
+    if kwargs.get("save_model", True):
+        model = LinearRegression(fit_intercept=fit_intercept)
+        model.coef_ = np.array([result["coefficients"][col] for col in result["x_columns"]], dtype=float)
+        model.intercept_ = result["intercept"]
+        model.n_features_in_ = len(result["x_columns"])
+        result["model_id"] = register_model(
+            "linear_regression", "ols", model, result["x_columns"], session_id,
+            target_column=y_column, source_file=file_path,
+            params={"alpha": None, "l1_ratio": None, "fit_intercept": fit_intercept, "streaming": True})
+
+    return result
+
+
 def linear_regression(file_path: str, x_columns: List[str], y_column: str,
                       method: str = "ols", session_id: str = None,
                       alpha: float = 1.0, l1_ratio: float = 0.5, **kwargs) -> Dict[str, Any]:
@@ -39,10 +65,21 @@ def linear_regression(file_path: str, x_columns: List[str], y_column: str,
             - max_iter: 最大迭代次数 (默认1000)
             - tol: 收敛容差 (默认1e-4)
             - fit_intercept: 是否拟合截距 (默认True)
+            - save_model: 是否保存模型以便后续预测 (默认True)
+            - streaming: OLS是否分块流式求解，同时返回标准误、t值和p值
+              (默认None，文件超过256MB时自动启用)
+            - chunksize: 流式求解时每块读取的行数 (默认100000)
 
     Returns:
         Dict[str, Any]: 包含线性回归结果的字典
     """
+    # 大文件的OLS分块累加正规方程求解，不将数据整体读入内存
+    streaming = kwargs.get("streaming")
+    if streaming is None:
+        streaming = os.path.isfile(file_path) and os.path.getsize(file_path) > STREAMING_FILE_SIZE
+    if method == "ols" and streaming:
+        return _streaming_linear_regression(file_path, x_columns, y_column, session_id, **kwargs)
+
     # 检查文件和列的有效性
     df, numeric_x_columns = check_and_read(file_path, x_columns, session_id)
 
@@ -140,4 +177,11 @@ def linear_regression(file_path: str, x_columns: List[str], y_column: str,
         if method == "elastic_net":
             result["regularization_params"]["l1_ratio"] = l1_ratio
 
+    # 保存模型，供预测接口复用
+    if kwargs.get("save_model", True):
+        result["model_id"] = register_model(
+            "linear_regression", method, model, numeric_x_columns, session_id,
+            target_column=y_column, source_file=file_path,
+            params={"alpha": result["alpha"], "l1_ratio": result["l1_ratio"], "fit_intercept": fit_intercept})
+
     return result
@@ -1,10 +1,68 @@
 from typing import List, Dict, Any
-from .check_and_read import check_and_read
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .check_and_read import check_and_read, select_numeric_columns
 from ..file_manager import generate_new_file_path
+from ..transformer_registry import register_transformer
+
+# output_format为"auto"时，独热列总数超过该值则以稀疏格式保存
+MAX_DENSE_ONE_HOT_COLUMNS = 1000
+
+
+def build_one_hot_block(df: pd.DataFrame, columns: List[str], drop_first: bool = False,
+                        sparse_output: bool = False, categories: Dict[str, list] = None) -> tuple:
+    """
+    构造独热编码块：每列只做一次factorize，由类别编码直接写入指示矩阵，整个块只分配一次
+
+    类别顺序与首次出现的顺序一致，缺失值对应的行全为0；传入categories时按给定的类别编码，
+    不在其中的取值对应的行也全为0
+
+    Args:
+        df (pd.DataFrame): 数据
+        columns (List[str]): 需要编码的列
+        drop_first (bool): 是否删除每列的第一个类别
+        sparse_output (bool): 是否返回CSR稀疏矩阵，否则返回uint8稠密矩阵
+        categories (Dict[str, list]): 各列已拟合的类别
+
+    Returns:
+        tuple: (block, feature_names, categories) 指示矩阵、独热列名和各列的类别
+    """
+    n_rows = len(df)
+    start = 1 if drop_first else 0
+    encoded = []
+    feature_names = []
+    offset = 0
+    fixed_categories = categories or {}
+    categories = {}
+    for col in columns:
+        if col in fixed_categories:
+            uniques = pd.Index(fixed_categories[col])
+            codes = uniques.get_indexer(df[col])
+        else:
+            codes, uniques = pd.factorize(df[col])
+        categories[col] = uniques.tolist()
+        kept = uniques[start:]
+        feature_names.extend(f"{col}_{value}" for value in kept)
+        rows = np.flatnonzero(codes >= start)
+        encoded.append((rows, offset + codes[rows] - start))
+        offset += len(kept)
+
+    rows = np.concatenate([r for r, _ in encoded]) if encoded else np.array([], dtype=np.int64)
+    cols = np.concatenate([c for _, c in encoded]) if encoded else np.array([], dtype=np.int64)
+    if sparse_output:
+        block = sparse.csr_matrix((np.ones(len(rows), dtype=np.uint8), (rows, cols)), shape=(n_rows, offset))
+    else:
+        block = np.zeros((n_rows, offset), dtype=np.uint8)
+        block[rows, cols] = 1
+    return block, feature_names, categories
 
 
 def one_hot_encoding(file_path: str, columns: List[str], session_id: str = None,
-                     drop_first: bool = False) -> Dict[str, Any]:
+                     drop_first: bool = False, output_format: str = "dense",
+                     save_transformer: bool = True, fitted: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     独热编码 - 对分类变量进行独热编码处理
 
@@ -13,38 +71,99 @@ def one_hot_encoding(file_path: str, columns: List[str], session_id: str = None,
         columns (List[str]): 需要处理的列名列表
         session_id (str): 会话ID
         drop_first (bool): 是否删除第一个虚拟变量以避免多重共线性
+        output_format (str): 输出格式
+            - "dense": 独热列以0/1写入数据文件并删除原始列 (默认)
+            - "sparse": 独热编码以CSR格式另存为.npz文件（列名存于同名.json），数据文件保持不变，适用于高基数列；
+              该文件仅供导出，分析和建模接口不会读取它（逻辑回归的sparse模式会自行对分类列编码）
+            - "auto": 独热列总数不超过MAX_DENSE_ONE_HOT_COLUMNS时使用"dense"，否则使用"sparse"
+        save_transformer (bool): 是否保存各列的类别，以便对新数据生成相同的独热列
+        fitted (Dict[str, Any]): 已保存的类别（由预处理器注册表传入），传入时新出现的取值编码为全0
 
     Returns:
         Dict[str, Any]: 处理结果信息
     """
-    df, _ = check_and_read(file_path, columns, session_id)
+    if output_format not in ("dense", "sparse", "auto"):
+        raise ValueError(f"不支持的输出格式: {output_format}")
 
-    # 对指定列进行独热编码
-    processed_columns = []
+    df, _ = check_and_read(file_path, columns, session_id, require_numeric=False)
 
-    for col in columns:
-        # 获取该列的所有唯一值
-        unique_values = df[col].dropna().unique()
+    fixed_categories = fitted["categories"] if fitted else None
+    if output_format == "auto":
+        if fixed_categories:
+            n_features = sum(len(fixed_categories[col]) - (1 if drop_first else 0) for col in columns)
+        else:
+            n_features = sum(df[col].nunique() - (1 if drop_first else 0) for col in columns)
+        output_format = "dense" if n_features <= MAX_DENSE_ONE_HOT_COLUMNS else "sparse"
 
-        # 创建独热编码列
-        for i, value in enumerate(unique_values):
-            if drop_first and i == 0:
-                continue  # 跳过第一个值以避免多重共线性
+    # 对指定列进行独热编码
+    block, feature_names, categories = build_one_hot_block(df, columns, drop_first, output_format == "sparse",
+                                                           fixed_categories)
+    processed_columns = list(columns)
 
-            new_col_name = f"{col}_{value}"
-            df[new_col_name] = (df[col] == value).astype(int)
+    new_filename, new_file_path = generate_new_file_path(file_path, session_id)
+    result = {
+        "data_id": new_filename,
+        "saved_path": new_file_path,
+        "processed_columns": processed_columns,
+        "output_format": output_format,
+        "n_features": len(feature_names)
+    }
+    if fixed_categories:
+        result["unknown_values"] = _unknown_value_counts(df, columns, fixed_categories)
+    elif save_transformer:
+        result["transformer_id"] = register_transformer(
+            "one_hot_encoding", "one_hot", processed_columns, {"categories": categories},
+            session_id, source_file=file_path, params={"drop_first": drop_first, "output_format": output_format})
 
-        processed_columns.append(col)
+    if output_format == "sparse":
+        # 独热编码另存为稀疏矩阵，数据文件内容不变
+        sparse_path = f"{os.path.splitext(new_file_path)[0]}_onehot.npz"
+        sparse.save_npz(sparse_path, block)
+        with open(f"{os.path.splitext(sparse_path)[0]}.json", "w", encoding="utf-8") as f:
+            json.dump({"columns": processed_columns, "feature_names": feature_names, "drop_first": drop_first},
+                      f, ensure_ascii=False)
+        if os.path.abspath(new_file_path) != os.path.abspath(file_path):
+            df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
+        result["sparse_path"] = sparse_path
+        return result
 
-    # 删除原始分类列
-    df = df.drop(columns=columns)
+    df = _attach_one_hot_block(df, columns, block, feature_names)
 
     # 保存处理后的数据
-    new_filename, new_file_path = generate_new_file_path(file_path, session_id)
     df.to_csv(new_file_path, index=False, encoding="utf-8-sig")
 
+    return result
+
+
+def _attach_one_hot_block(df: pd.DataFrame, columns: List[str], block: np.ndarray,
+                          feature_names: List[str]) -> pd.DataFrame:
+    """删除原始分类列以及与独热列重名的列，独热块一次拼接"""
+    dropped = list(columns) + [col for col in feature_names if col in df.columns and col not in columns]
+    return pd.concat([df.drop(columns=dropped), pd.DataFrame(block, columns=feature_names, index=df.index)], axis=1)
+
+
+def _unknown_value_counts(df: pd.DataFrame, columns: List[str], categories: Dict[str, list]) -> Dict[str, int]:
+    """拟合时未出现的非缺失取值数量"""
     return {
-        "data_id": new_filename,
-        "saved_path": new_file_path,
-        "processed_columns": processed_columns
+        col: int((pd.Index(categories[col]).get_indexer(df[col]) < 0).sum() - df[col].isna().sum())
+        for col in columns
     }
+
+
+def one_hot_encoding_frame(df: pd.DataFrame, columns: List[str], drop_first: bool = False,
+                           fitted: Dict[str, Any] = None) -> tuple:
+    """
+    对内存中的数据做独热编码（稠密输出），参数含义同one_hot_encoding
+
+    Returns:
+        tuple: (df, info, state) 处理后的数据、处理信息和可重放的类别
+    """
+    select_numeric_columns(df, columns, require_numeric=False)
+    fixed_categories = fitted["categories"] if fitted else None
+    info = {"processed_columns": list(columns)}
+    if fixed_categories:
+        info["unknown_values"] = _unknown_value_counts(df, columns, fixed_categories)
+
+    block, feature_names, categories = build_one_hot_block(df, columns, drop_first, False, fixed_categories)
+    info["n_features"] = len(feature_names)
+    return _attach_one_hot_block(df, columns, block, feature_names), info, {"categories": categories}
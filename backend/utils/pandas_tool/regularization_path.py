@@ -0,0 +1,224 @@
+from typing import List, Dict, Any
+import os
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Lasso, Ridge, ElasticNet, enet_path
+from sklearn.model_selection import KFold
+
+from .check_and_read import check_and_read
+from utils.model_registry import register_model
+
+# 交叉验证的最大并行进程数
+MAX_CV_JOBS = 4
+
+
+def _safe_float(value):
+    """安全地将值转换为float，处理inf和nan值"""
+    if value is None:
+        return None
+    try:
+        f = float(value)
+        if np.isinf(f) or np.isnan(f):
+            return None
+        return f
+    except (ValueError, OverflowError):
+        return None
+
+
+def _center(X: np.ndarray, y: np.ndarray, fit_intercept: bool) -> tuple:
+    """拟合截距时先对X和y中心化，截距由均值恢复"""
+    if not fit_intercept:
+        return X, y, np.zeros(X.shape[1]), 0.0
+    X_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    return X - X_mean, y - y_mean, X_mean, y_mean
+
+
+def _ridge_svd_path(X: np.ndarray, y: np.ndarray, alphas: np.ndarray, fit_intercept: bool) -> tuple:
+    """
+    基于一次SVD分解得到全部alpha下的岭回归系数：w(α) = V diag(s / (s² + α)) Uᵀy
+
+    Returns:
+        tuple: (coefs, intercepts) coefs形状为 (n_features, n_alphas)
+    """
+    Xc, yc, X_mean, y_mean = _center(X, y, fit_intercept)
+    U, s, Vt = np.linalg.svd(Xc, full_matrices=False)
+    Uty = U.T @ yc
+    shrink = s[:, None] / (s[:, None] ** 2 + alphas[None, :])
+    coefs = Vt.T @ (shrink * Uty[:, None])
+    intercepts = y_mean - X_mean @ coefs
+    return coefs, intercepts
+
+
+def _enet_path(X: np.ndarray, y: np.ndarray, alphas: np.ndarray, l1_ratio: float, fit_intercept: bool,
+               max_iter: int, tol: float) -> tuple:
+    """
+    坐标下降计算Lasso/弹性网络的系数路径，按alpha从大到小依次以上一个解热启动
+
+    Returns:
+        tuple: (coefs, intercepts) coefs形状为 (n_features, n_alphas)
+    """
+    Xc, yc, X_mean, y_mean = _center(X, y, fit_intercept)
+    _, coefs, _ = enet_path(Xc, yc, l1_ratio=l1_ratio, alphas=alphas, max_iter=max_iter, tol=tol)
+    intercepts = y_mean - X_mean @ coefs
+    return coefs, intercepts
+
+
+def _compute_path(X: np.ndarray, y: np.ndarray, method: str, alphas: np.ndarray, l1_ratio: float,
+                  fit_intercept: bool, max_iter: int, tol: float) -> tuple:
+    if method == "ridge":
+        return _ridge_svd_path(X, y, alphas, fit_intercept)
+    return _enet_path(X, y, alphas, 1.0 if method == "lasso" else l1_ratio, fit_intercept, max_iter, tol)
+
+
+def _fold_mse(X: np.ndarray, y: np.ndarray, train: np.ndarray, test: np.ndarray, method: str,
+              alphas: np.ndarray, l1_ratio: float, fit_intercept: bool, max_iter: int, tol: float) -> np.ndarray:
+    """在一个训练折上计算整条路径，返回测试折上每个alpha的均方误差"""
+    coefs, intercepts = _compute_path(X[train], y[train], method, alphas, l1_ratio, fit_intercept, max_iter, tol)
+    predictions = X[test] @ coefs + intercepts
+    return ((predictions - y[test][:, None]) ** 2).mean(axis=0)
+
+
+def _default_alphas(X: np.ndarray, y: np.ndarray, method: str, l1_ratio: float, n_alphas: int,
+                    fit_intercept: bool) -> np.ndarray:
+    """生成从大到小的alpha网格：Lasso/弹性网络从所有系数恰好为0的alpha开始，岭回归按奇异值尺度取值"""
+    Xc, yc, _, _ = _center(X, y, fit_intercept)
+    if method == "ridge":
+        s_max = np.linalg.norm(Xc, 2)
+        return s_max ** 2 * np.logspace(1, -6, n_alphas)
+
+    ratio = 1.0 if method == "lasso" else max(l1_ratio, 1e-3)
+    alpha_max = np.abs(Xc.T @ yc).max() / (len(yc) * ratio)
+    if alpha_max <= 0:
+        alpha_max = 1.0
+    return alpha_max * np.logspace(0, -3, n_alphas)
+
+
+def regularization_path(file_path: str, x_columns: List[str], y_column: str,
+                        method: str = "lasso", session_id: str = None,
+                        alphas: List[float] = None, n_alphas: int = 50, l1_ratio: float = 0.5,
+                        cv: int = 5, **kwargs) -> Dict[str, Any]:
+    """
+    正则化路径与交叉验证 - 一次请求计算整条系数路径，并行进行k折交叉验证，返回CV曲线和最佳alpha
+
+    Args:
+        file_path (str): 文件路径
+        x_columns (List[str]): 自变量列名列表（特征列）
+        y_column (str): 因变量列名（目标列）
+        method (str): 回归方法
+            - "lasso": L1正则化，坐标下降热启动路径 (默认)
+            - "ridge": L2正则化，一次SVD分解得到全部alpha的解
+            - "elastic_net": 弹性网络，坐标下降热启动路径
+        session_id (str): 会话ID
+        alphas (List[float]): alpha取值列表，默认根据数据自动生成
+        n_alphas (int): 自动生成的alpha数量 (默认50)
+        l1_ratio (float): ElasticNet中L1正则化的比例 (仅用于elastic_net)
+        cv (int): 交叉验证折数 (默认5)
+        **kwargs: 其他参数
+            - max_iter: 最大迭代次数 (默认1000)
+            - tol: 收敛容差 (默认1e-4)
+            - fit_intercept: 是否拟合截距 (默认True)
+            - n_jobs: 交叉验证并行进程数 (默认为折数与CPU核数中的较小值，最多4个)
+            - save_model: 是否保存最佳alpha对应的模型 (默认True)
+
+    Returns:
+        Dict[str, Any]: 包含alpha网格、系数路径、CV曲线、最佳alpha及其拟合结果的字典
+    """
+    from joblib import Parallel, delayed
+    from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+
+    if method not in ("lasso", "ridge", "elastic_net"):
+        raise ValueError(f"不支持的正则化方法: {method}")
+
+    # 检查文件和列的有效性
+    df, numeric_x_columns = check_and_read(file_path, x_columns, session_id)
+
+    if y_column not in df.columns:
+        raise ValueError(f"目标列 '{y_column}' 不存在于数据集中")
+    if not pd.api.types.is_numeric_dtype(df[y_column]):
+        raise ValueError(f"目标列 '{y_column}' 必须是数值型")
+
+    # 准备数据
+    data = df[numeric_x_columns + [y_column]].dropna()
+    X = data[numeric_x_columns].to_numpy(dtype=float)
+    y = data[y_column].to_numpy(dtype=float)
+
+    if len(X) < cv or cv < 2:
+        raise ValueError(f"有效样本数量({len(X)})不足以进行{cv}折交叉验证")
+
+    # 获取参数
+    max_iter = kwargs.get("max_iter", 1000)
+    tol = kwargs.get("tol", 1e-4)
+    fit_intercept = kwargs.get("fit_intercept", True)
+
+    if alphas:
+        alpha_grid = np.sort(np.asarray(alphas, dtype=float))[::-1]
+    else:
+        alpha_grid = _default_alphas(X, y, method, l1_ratio, n_alphas, fit_intercept)
+
+    # 全量数据上的系数路径
+    coefs, intercepts = _compute_path(X, y, method, alpha_grid, l1_ratio, fit_intercept, max_iter, tol)
+
+    # 并行计算各折的路径和测试误差
+    folds = list(KFold(n_splits=cv, shuffle=True, random_state=42).split(X))
+    n_jobs = kwargs.get("n_jobs") or min(cv, os.cpu_count() or 1, MAX_CV_JOBS)
+    fold_mse = np.array(Parallel(n_jobs=n_jobs)(
+        delayed(_fold_mse)(X, y, train, test, method, alpha_grid, l1_ratio, fit_intercept, max_iter, tol)
+        for train, test in folds
+    ))
+    cv_mean = fold_mse.mean(axis=0)
+    cv_std = fold_mse.std(axis=0)
+
+    # 最佳alpha为CV误差最小者；1-SE规则取误差在一个标准误之内的最大alpha
+    best_index = int(np.argmin(cv_mean))
+    best_alpha = float(alpha_grid[best_index])
+    threshold = cv_mean[best_index] + cv_std[best_index] / np.sqrt(cv)
+    alpha_1se = float(alpha_grid[np.flatnonzero(cv_mean <= threshold).min()])
+
+    # 以最佳alpha拟合最终模型，参数含义与linear_regression一致
+    if method == "lasso":
+        model = Lasso(alpha=best_alpha, fit_intercept=fit_intercept, max_iter=max_iter, tol=tol)
+    elif method == "ridge":
+        model = Ridge(alpha=best_alpha, fit_intercept=fit_intercept, max_iter=max_iter, tol=tol)
+    else:
+        model = ElasticNet(alpha=best_alpha, l1_ratio=l1_ratio, fit_intercept=fit_intercept,
+                           max_iter=max_iter, tol=tol)
+    model.fit(X, y)
+    y_pred = model.predict(X)
+    mse = mean_squared_error(y, y_pred)
+
+    result = {
+        "method": method,
+        "x_columns": numeric_x_columns,
+        "y_column": y_column,
+        "alphas": [float(alpha) for alpha in alpha_grid],
+        "coef_path": {col: [_safe_float(value) for value in coefs[i]] for i, col in enumerate(numeric_x_columns)},
+        "intercept_path": [_safe_float(value) for value in intercepts],
+        "n_nonzero": [int(count) for count in (np.abs(coefs) > 1e-12).sum(axis=0)],
+        "cv_mse_mean": [_safe_float(value) for value in cv_mean],
+        "cv_mse_std": [_safe_float(value) for value in cv_std],
+        "cv_folds": cv,
+        "best_alpha": best_alpha,
+        "alpha_1se": alpha_1se,
+        "best_cv_mse": _safe_float(cv_mean[best_index]),
+        "coefficients": {col: _safe_float(value) for col, value in zip(numeric_x_columns, model.coef_)},
+        "intercept": _safe_float(model.intercept_),
+        "evaluation_metrics": {
+            "mse": _safe_float(mse),
+            "rmse": _safe_float(np.sqrt(mse)),
+            "r2_score": _safe_float(r2_score(y, y_pred)),
+            "mae": _safe_float(mean_absolute_error(y, y_pred))
+        },
+        "sample_size": len(X),
+        "l1_ratio": l1_ratio if method == "elastic_net" else None,
+        "n_jobs": n_jobs
+    }
+
+    # 保存最佳alpha对应的模型，供预测接口复用
+    if kwargs.get("save_model", True):
+        result["model_id"] = register_model(
+            "linear_regression", method, model, numeric_x_columns, session_id,
+            target_column=y_column, source_file=file_path,
+            params={"alpha": best_alpha, "l1_ratio": result["l1_ratio"], "fit_intercept": fit_intercept})
+
+    return result
@@ -1,8 +1,10 @@
 from typing import List, Dict, Any
-import numpy as np
+import pandas as pd
 
 from ..file_manager import generate_new_file_path
 from .check_and_read import check_and_read
+from .feature_generation import elementwise_transform, polynomial_features, MAX_FEATURE_BLOCK_BYTES
+
 
 def scientific_calculation(file_path: str, columns: List[str], operation: str,
                            params: Dict[str, Any] = None, session_id: str = None) -> Dict[str, Any]:
@@ -21,47 +23,41 @@ def scientific_calculation(file_path: str, columns: List[str], operation: str,
         params (Dict[str, Any]): 运算参数
             - power: 幂指数 (用于"power"操作)
             - degree: 多项式度数 (用于"poly"操作)
+            - cross_terms: 是否生成不同列之间的交叉项，如"a*b" (用于"poly"操作，默认False)
+            - dtype: 结果精度，"float64" (默认) 或 "float32"
+            - max_bytes: 新增特征块的最大字节数，超过时在分配内存前报错 (用于"poly"操作)，
+              只能低于服务端上限MAX_FEATURE_BLOCK_BYTES，无效值或更大的值按上限处理
         session_id (str): 会话ID
 
     Returns:
         Dict[str, Any]: 处理结果信息
     """
+    params = params or {}
+    dtype = params.get("dtype", "float64")
     df, numeric_columns = check_and_read(file_path, columns, session_id)
+    X = df[numeric_columns].to_numpy(dtype="float64")
 
-    # 根据操作类型执行相应计算
-    if operation == "log":
-        # 对数变换
-        for col in numeric_columns:
-            # 处理负数和零值
-            min_val = df[col].min()
-            if min_val <= 0:
-                df[col] = df[col] + abs(min_val) + 1
-            df[col] = np.log(df[col])
-
-    elif operation == "exp":
-        # 指数变换
-        for col in numeric_columns:
-            df[col] = np.exp(df[col])
-
-    elif operation == "power":
-        # 幂变换
-        power = params.get("power", 2) if params else 2
-        for col in numeric_columns:
-            df[col] = np.power(df[col], power)
+    # 调用方只能调低特征块上限，不能关闭或调高
+    max_bytes = params.get("max_bytes")
+    if not isinstance(max_bytes, (int, float)) or isinstance(max_bytes, bool) or max_bytes <= 0:
+        max_bytes = MAX_FEATURE_BLOCK_BYTES
+    max_bytes = min(int(max_bytes), MAX_FEATURE_BLOCK_BYTES)
 
-    elif operation == "sqrt":
-        # 平方根变换
-        for col in numeric_columns:
-            # 处理负数
-            df[col] = np.where(df[col] < 0, np.sqrt(np.abs(df[col])), np.sqrt(df[col]))
+    # 根据操作类型一次性计算整个结果块
+    if operation in ("log", "exp", "power", "sqrt"):
+        # 逐元素变换，结果整体写回原列，保持列顺序
+        block = elementwise_transform(X, operation, params.get("power", 2), dtype)
+        df[numeric_columns] = pd.DataFrame(block, columns=numeric_columns, index=df.index)
+        feature_names = numeric_columns
 
     elif operation == "poly":
-        # 多项式特征
-        degree = params.get("degree", 2) if params else 2
-        for col in numeric_columns:
-            for d in range(2, degree + 1):
-                new_col_name = f"{col}^{d}"
-                df[new_col_name] = np.power(df[col], d)
+        # 多项式特征，先检查输出大小再分配整个块
+        block, feature_names = polynomial_features(
+            X, numeric_columns, params.get("degree", 2), params.get("cross_terms", False), dtype, max_bytes
+        )
+        # 覆盖已存在的同名列
+        df = df.drop(columns=[col for col in feature_names if col in df.columns])
+        df = pd.concat([df, pd.DataFrame(block, columns=feature_names, index=df.index)], axis=1)
 
     else:
         raise ValueError(f"不支持的科学计算操作: {operation}")
@@ -74,5 +70,6 @@ def scientific_calculation(file_path: str, columns: List[str], operation: str,
         "data_id": new_filename,
         "saved_path": new_file_path,
         "processed_columns": numeric_columns,
-        "operation": operation
+        "operation": operation,
+        "generated_columns": feature_names if operation == "poly" else []
     }
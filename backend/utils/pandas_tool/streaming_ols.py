@@ -0,0 +1,226 @@
+from typing import List, Dict, Any
+import os
+import numpy as np
+import pandas as pd
+from scipy import linalg, stats
+
+from utils.file_manager import iter_column_chunks, ensure_session_dir, READ_CHUNK_SIZE
+
+
+def _safe_float(value):
+    """安全地将值转换为float，处理inf和nan值"""
+    if value is None:
+        return None
+    try:
+        f = float(value)
+        if np.isinf(f) or np.isnan(f):
+            return None
+        return f
+    except (ValueError, OverflowError):
+        return None
+
+
+def accumulate_normal_equations(file_path: str, x_columns: List[str], y_column: str,
+                                fit_intercept: bool = True, chunksize: int = READ_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    分块读取数据并累加正规方程所需的矩阵，内存占用与数据行数无关
+
+    含缺失值的行不参与累加；拟合截距时特征和目标都在首个数据块的均值处平移后再累加，
+    减小XᵀX的条件数，并避免目标值整体偏移很大时残差平方和在相减中丢失精度。
+    目标的均值和二阶中心矩按块合并（与streaming_scalers相同），用于计算总平方和
+
+    Returns:
+        Dict[str, Any]: 平移后的 xtx, xty, yty, 以及 n, y_mean, y_m2, shift, y_shift, chunks
+    """
+    n_features = len(x_columns)
+    size = n_features + (1 if fit_intercept else 0)
+    xtx = np.zeros((size, size))
+    xty = np.zeros(size)
+    yty = 0.0
+    y_mean = 0.0
+    y_m2 = 0.0
+    n = 0
+    chunks = 0
+    shift = None
+    y_shift = 0.0
+
+    for chunk in iter_column_chunks(file_path, list(x_columns) + [y_column], chunksize):
+        chunks += 1
+        non_numeric = [col for col in chunk.columns if not pd.api.types.is_numeric_dtype(chunk[col])]
+        if non_numeric:
+            raise ValueError(f"以下列必须是数值型: {non_numeric}")
+
+        values = chunk.to_numpy(dtype=float)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            continue
+
+        X = values[:, :n_features]
+        y = values[:, n_features]
+        if shift is None:
+            shift = X.mean(axis=0) if fit_intercept else np.zeros(n_features)
+            y_shift = float(y.mean()) if fit_intercept else 0.0
+
+        # 按块合并目标的均值和二阶中心矩
+        chunk_mean = float(y.mean())
+        total = n + len(y)
+        delta = chunk_mean - y_mean
+        y_mean += delta * len(y) / total
+        y_m2 += float(((y - chunk_mean) ** 2).sum()) + delta ** 2 * n * len(y) / total
+        n = total
+
+        X = X - shift
+        y = y - y_shift
+        if fit_intercept:
+            X = np.column_stack([X, np.ones(len(X))])
+
+        xtx += X.T @ X
+        xty += X.T @ y
+        yty += float(y @ y)
+
+    return {
+        "xtx": xtx,
+        "xty": xty,
+        "yty": yty,
+        "y_mean": y_mean,
+        "y_m2": y_m2,
+        "n": n,
+        "shift": shift if shift is not None else np.zeros(n_features),
+        "y_shift": y_shift,
+        "chunks": chunks
+    }
+
+
+def solve_normal_equations(xtx: np.ndarray, xty: np.ndarray) -> tuple:
+    """
+    求解正规方程：优先使用Cholesky分解，矩阵不满秩时退回到基于特征分解的伪逆
+
+    Returns:
+        tuple: (beta, xtx_inv, rank_deficient)
+    """
+    try:
+        factor = linalg.cho_factor(xtx)
+        beta = linalg.cho_solve(factor, xty)
+        xtx_inv = linalg.cho_solve(factor, np.eye(len(xtx)))
+        return beta, xtx_inv, False
+    except linalg.LinAlgError:
+        xtx_inv = linalg.pinvh(xtx)
+        return xtx_inv @ xty, xtx_inv, True
+
+
+def streaming_ols(file_path: str, x_columns: List[str], y_column: str, session_id: str = None,
+                  fit_intercept: bool = True, chunksize: int = READ_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    流式普通最小二乘回归 - 分块累加XᵀX、Xᵀy、yᵀy后求解，并由累加矩阵得到标准误、t值和p值
+
+    Args:
+        file_path (str): 文件路径
+        x_columns (List[str]): 自变量列名列表（特征列）
+        y_column (str): 因变量列名（目标列）
+        session_id (str): 会话ID
+        fit_intercept (bool): 是否拟合截距 (默认True)
+        chunksize (int): 每块读取的行数
+
+    Returns:
+        Dict[str, Any]: 包含回归系数、检验统计量和评估指标的字典
+    """
+    if session_id:
+        ensure_session_dir(session_id)
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    # 与内存路径一致，按首个数据块的类型只保留数值型自变量，目标列必须是数值型
+    first_chunk = next(iter_column_chunks(file_path, list(x_columns) + [y_column], chunksize), None)
+    if first_chunk is not None:
+        if not pd.api.types.is_numeric_dtype(first_chunk[y_column]):
+            raise ValueError(f"目标列 '{y_column}' 必须是数值型")
+        x_columns = [col for col in x_columns if pd.api.types.is_numeric_dtype(first_chunk[col])]
+    del first_chunk
+
+    if not x_columns:
+        raise ValueError("所有自变量列都必须是数值型")
+
+    acc = accumulate_normal_equations(file_path, x_columns, y_column, fit_intercept, chunksize)
+    n = acc["n"]
+    n_params = len(acc["xty"])
+    if n == 0:
+        raise ValueError("没有有效的数据可用于回归分析")
+    if n <= n_params:
+        raise ValueError(f"有效样本数量({n})必须大于参数数量({n_params})")
+
+    beta, xtx_inv, rank_deficient = solve_normal_equations(acc["xtx"], acc["xty"])
+
+    # 残差平方和由平移后的累加矩阵得到；总平方和取合并得到的中心矩，
+    # 不拟合截距时同样中心化，与内存路径的r2_score一致
+    rss = max(acc["yty"] - 2 * beta @ acc["xty"] + beta @ acc["xtx"] @ beta, 0.0)
+    tss = acc["y_m2"]
+    dof = n - n_params
+    sigma2 = rss / dof
+    std_errors = np.sqrt(np.clip(np.diag(xtx_inv) * sigma2, 0, None))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_values = beta / std_errors
+    p_values = 2 * stats.t.sf(np.abs(t_values), dof)
+
+    # 还原平移：斜率不变，截距需减去特征平移量的贡献并加回目标的平移量
+    slopes = beta[:len(x_columns)]
+    shift = acc["shift"]
+    intercept = float(beta[-1] - shift @ slopes + acc["y_shift"]) if fit_intercept else 0.0
+    if fit_intercept:
+        # 截距的方差：Var(b0 - shift·b) = shiftᵀ Var(b) shift - 2 shiftᵀ Cov(b, b0) + Var(b0)
+        cov = xtx_inv * sigma2
+        k = len(x_columns)
+        intercept_var = cov[k, k] - 2 * shift @ cov[:k, k] + shift @ cov[:k, :k] @ shift
+        intercept_se = float(np.sqrt(max(intercept_var, 0.0)))
+        intercept_t = intercept / intercept_se if intercept_se > 0 else None
+        intercept_p = 2 * stats.t.sf(abs(intercept_t), dof) if intercept_t is not None else None
+
+    r2 = 1 - rss / tss if tss > 0 else None
+    n_slopes = len(x_columns)
+    adj_r2 = 1 - (1 - r2) * (n - (1 if fit_intercept else 0)) / dof if r2 is not None else None
+    f_statistic = ((tss - rss) / n_slopes) / sigma2 if tss > 0 and sigma2 > 0 else None
+    f_p_value = stats.f.sf(f_statistic, n_slopes, dof) if f_statistic is not None else None
+    mse = rss / n
+
+    result = {
+        "method": "ols",
+        "x_columns": list(x_columns),
+        "y_column": y_column,
+        "coefficients": {col: _safe_float(value) for col, value in zip(x_columns, slopes)},
+        "intercept": intercept,
+        "evaluation_metrics": {
+            "mse": _safe_float(mse),
+            "rmse": _safe_float(np.sqrt(mse)),
+            "r2_score": _safe_float(r2),
+            "mae": None,
+            "adjusted_r2": _safe_float(adj_r2),
+            "f_statistic": _safe_float(f_statistic),
+            "f_p_value": _safe_float(f_p_value)
+        },
+        "statistics": {
+            col: {
+                "coefficient": _safe_float(slopes[i]),
+                "std_error": _safe_float(std_errors[i]),
+                "t_value": _safe_float(t_values[i]),
+                "p_value": _safe_float(p_values[i])
+            } for i, col in enumerate(x_columns)
+        },
+        "sample_size": n,
+        "alpha": None,
+        "l1_ratio": None,
+        "solver": "pinv" if rank_deficient else "cholesky",
+        "rank_deficient": rank_deficient,
+        "degrees_of_freedom": dof,
+        "residual_std_error": _safe_float(np.sqrt(sigma2)),
+        "chunks": acc["chunks"]
+    }
+    if fit_intercept:
+        result["statistics"]["intercept"] = {
+            "coefficient": _safe_float(intercept),
+            "std_error": _safe_float(intercept_se),
+            "t_value": _safe_float(intercept_t),
+            "p_value": _safe_float(intercept_p)
+        }
+
+    return result
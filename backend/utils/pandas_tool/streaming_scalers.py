@@ -0,0 +1,273 @@
+from typing import List, Dict, Any
+import os
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from utils.file_manager import iter_column_chunks, _appended_column_names, _load_columns_manifest, READ_CHUNK_SIZE
+
+# 支持分块处理的量纲处理方法（幂变换需要在完整数据上迭代估计λ，不支持）
+STREAMING_METHODS = ("standard", "minmax", "robust", "unit", "l2", "l1", "max", "quantile")
+
+# 分位数草图每层保留的最大样本数，越大越精确
+QUANTILE_SKETCH_SIZE = 4096
+
+# 分位数变换输出正态分布时的截断阈值，与QuantileTransformer一致
+BOUNDS_THRESHOLD = 1e-7
+
+
+class QuantileSketch:
+    """
+    可分块更新的分位数草图（KLL风格的分层压缩）
+
+    第h层的每个样本代表2^h个原始值；某层超过sketch_size个样本时排序后隔一个取一个（起点随机）
+    压缩到上一层，内存占用约为 sketch_size × log2(n / sketch_size)。
+    样本总数不超过sketch_size时结果与np.nanpercentile完全一致
+    """
+
+    def __init__(self, sketch_size: int = QUANTILE_SKETCH_SIZE, random_state: int = 0):
+        self.sketch_size = sketch_size
+        self.levels = []
+        self.count = 0
+        self._rng = np.random.RandomState(random_state)
+
+    def update(self, values: np.ndarray):
+        """加入一批值，忽略缺失值"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        if not self.levels:
+            self.levels.append(values)
+        else:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+
+        level = 0
+        while level < len(self.levels) and len(self.levels[level]) > self.sketch_size:
+            compacted = np.sort(self.levels[level])[self._rng.randint(2)::2]
+            self.levels[level] = np.array([], dtype=float)
+            if level + 1 == len(self.levels):
+                self.levels.append(compacted)
+            else:
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], compacted])
+            level += 1
+
+    def quantiles(self, q: np.ndarray) -> np.ndarray:
+        """
+        按线性插值估计分位数，q取值范围为[0, 1]，没有数据时返回NaN
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        # 每个样本代表的秩区间的中点，权重均为1时即为0, 1, ..., n-1
+        total = weights.sum()
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        return np.interp(q * (total - 1), ranks, values)
+
+
+def fit_streaming_scaler(file_path: str, columns: List[str], method: str = "standard",
+                         chunksize: int = READ_CHUNK_SIZE, n_quantiles: int = 100,
+                         output_distribution: str = "uniform",
+                         sketch_size: int = QUANTILE_SKETCH_SIZE) -> Dict[str, Any]:
+    """
+    第一遍分块读取指定列，累加拟合所需的统计量：样本数、均值和二阶中心矩（按块合并的Welford算法）、
+    最小/最大值、绝对值最大值、L1/L2范数，robust和quantile方法另外维护分位数草图。
+    只有在所有数据块中都是数值型的列才会被处理，缺失值不参与统计
+
+    Returns:
+        Dict[str, Any]: 包含 columns (数值列), n_samples, chunks 以及各方法所需的统计量
+    """
+    if method not in STREAMING_METHODS:
+        raise ValueError(f"分块处理不支持的量纲处理方法: {method}，可选 {list(STREAMING_METHODS)}")
+    if not columns:
+        raise ValueError("没有指定列")
+
+    n_columns = len(columns)
+    numeric = np.ones(n_columns, dtype=bool)
+    count = np.zeros(n_columns)
+    mean = np.zeros(n_columns)
+    m2 = np.zeros(n_columns)
+    min_values = np.full(n_columns, np.inf)
+    max_values = np.full(n_columns, -np.inf)
+    abs_max = np.zeros(n_columns)
+    l1 = np.zeros(n_columns)
+    l2 = np.zeros(n_columns)
+    sketches = [QuantileSketch(sketch_size) for _ in columns] if method in ("robust", "quantile") else None
+    chunks = 0
+    n_samples = 0
+
+    for chunk in iter_column_chunks(file_path, list(columns), chunksize):
+        chunks += 1
+        n_samples += len(chunk)
+        numeric &= np.array([pd.api.types.is_numeric_dtype(chunk[col]) for col in columns])
+        X = np.full((len(chunk), n_columns), np.nan)
+        for j in np.flatnonzero(numeric):
+            X[:, j] = chunk[columns[j]].to_numpy(dtype=float, na_value=np.nan)
+
+        observed = ~np.isnan(X)
+        chunk_count = observed.sum(axis=0)
+        has_values = chunk_count > 0
+        if not has_values.any():
+            continue
+        chunk_mean = np.divide(np.nansum(X, axis=0), chunk_count, out=np.zeros(n_columns), where=has_values)
+        chunk_m2 = np.nansum((X - chunk_mean) ** 2, axis=0)
+
+        # 按块合并均值和二阶中心矩
+        total = count + chunk_count
+        delta = chunk_mean - mean
+        ratio = np.divide(chunk_count, total, out=np.zeros(n_columns), where=total > 0)
+        mean += delta * ratio
+        m2 += chunk_m2 + delta ** 2 * count * ratio
+        count = total
+
+        min_values = np.minimum(min_values, np.where(observed, X, np.inf).min(axis=0))
+        max_values = np.maximum(max_values, np.where(observed, X, -np.inf).max(axis=0))
+        abs_values = np.where(observed, np.abs(X), 0)
+        abs_max = np.maximum(abs_max, abs_values.max(axis=0))
+        l1 += abs_values.sum(axis=0)
+        l2 += np.nansum(X ** 2, axis=0)
+
+        if sketches is not None:
+            for j in np.flatnonzero(numeric & has_values):
+                sketches[j].update(X[:, j])
+
+    keep = np.flatnonzero(numeric)
+    fitted = {
+        "method": method,
+        "columns": [columns[j] for j in keep],
+        "n_samples": n_samples,
+        "chunks": chunks,
+        "count": count[keep],
+        "mean": mean[keep],
+        "var": np.divide(m2, count, out=np.zeros(n_columns), where=count > 0)[keep],
+        "min": np.where(count > 0, min_values, np.nan)[keep],
+        "max": np.where(count > 0, max_values, np.nan)[keep],
+        "abs_max": abs_max[keep],
+        "l1": l1[keep],
+        "l2": np.sqrt(l2[keep])
+    }
+    if method == "robust":
+        quartiles = np.array([sketches[j].quantiles([0.25, 0.5, 0.75]) for j in keep]).reshape(len(keep), 3)
+        fitted["center"] = quartiles[:, 1]
+        fitted["iqr"] = quartiles[:, 2] - quartiles[:, 0]
+    elif method == "quantile":
+        n_quantiles = max(1, min(n_quantiles, int(count[keep].max()) if len(keep) else 1))
+        fitted["output_distribution"] = output_distribution
+        fitted["references"] = np.linspace(0, 1, n_quantiles)
+        fitted["quantiles"] = np.array([np.maximum.accumulate(sketches[j].quantiles(fitted["references"]))
+                                        for j in keep]).reshape(len(keep), n_quantiles).T
+    return fitted
+
+
+def _nonzero_scale(scale: np.ndarray) -> np.ndarray:
+    """与sklearn一致，尺度为0（常量列）时不缩放"""
+    scale = np.asarray(scale, dtype=float).copy()
+    scale[(scale == 0) | ~np.isfinite(scale)] = 1.0
+    return scale
+
+
+def transform_streaming_chunk(X: np.ndarray, fitted: Dict[str, Any]) -> np.ndarray:
+    """
+    用拟合得到的参数变换一个数据块，X的列与fitted["columns"]对应
+
+    fitted为fit_streaming_scaler的返回值，或在内存中拟合后整理成相同格式的参数；
+    幂变换保存的是拟合好的PowerTransformer (scaler) 和Box-Cox的平移量 (shift)
+    """
+    method = fitted["method"]
+    X = np.array(X, dtype=float)
+    if "scaler" in fitted:
+        X += fitted.get("shift", 0)
+        return fitted["scaler"].transform(pd.DataFrame(X, columns=fitted["columns"]))
+    if method == "standard":
+        return (X - fitted["mean"]) / _nonzero_scale(np.sqrt(fitted["var"]))
+    if method == "minmax":
+        return (X - fitted["min"]) / _nonzero_scale(fitted["max"] - fitted["min"])
+    if method == "robust":
+        return (X - fitted["center"]) / _nonzero_scale(fitted["iqr"])
+    if method in ("unit", "l2"):
+        return X / fitted["l2"]
+    if method == "l1":
+        return X / fitted["l1"]
+    if method == "max":
+        return X / fitted["abs_max"]
+
+    # quantile：与QuantileTransformer相同，正向与反向插值取平均以处理重复的分位点
+    references = fitted["references"]
+    quantiles = fitted["quantiles"]
+    for j in range(X.shape[1]):
+        column = X[:, j]
+        observed = ~np.isnan(column)
+        values = column[observed]
+        lower, upper = quantiles[0, j], quantiles[-1, j]
+        converted = 0.5 * (np.interp(values, quantiles[:, j], references)
+                           - np.interp(-values, -quantiles[::-1, j], -references[::-1]))
+        converted[values <= lower] = 0
+        converted[values >= upper] = 1
+        if fitted.get("output_distribution") == "normal":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                converted = stats.norm.ppf(converted)
+            clip_min = stats.norm.ppf(BOUNDS_THRESHOLD - np.spacing(1))
+            clip_max = stats.norm.ppf(1 - (BOUNDS_THRESHOLD - np.spacing(1)))
+            converted = np.clip(converted, clip_min, clip_max)
+        column[observed] = converted
+    return X
+
+
+def streaming_dimensionless_processing(file_path: str, output_path: str, columns: List[str],
+                                       method: str = "standard", chunksize: int = READ_CHUNK_SIZE,
+                                       fitted: Dict[str, Any] = None, **kwargs) -> Dict[str, Any]:
+    """
+    分块量纲处理，内存占用只与块大小有关：第一遍累加拟合统计量，第二遍分块变换并写出；
+    传入已拟合的参数时跳过第一遍
+
+    Args:
+        file_path (str): CSV文件路径
+        output_path (str): 输出文件路径，先写入临时文件，完成后替换
+        columns (List[str]): 需要处理的列名列表
+        method (str): 处理方法，见STREAMING_METHODS
+        chunksize (int): 每块的行数
+        fitted (Dict[str, Any]): 已拟合的参数，列必须都存在于数据中
+        **kwargs: n_quantiles, output_distribution, sketch_size
+
+    Returns:
+        Dict[str, Any]: 包含 processed_columns, chunks, fitted
+    """
+    if fitted is None:
+        fitted = fit_streaming_scaler(file_path, columns, method, chunksize, kwargs.get("n_quantiles", 100),
+                                      kwargs.get("output_distribution", "uniform"),
+                                      kwargs.get("sketch_size", QUANTILE_SKETCH_SIZE))
+    processed_columns = fitted["columns"]
+    if not processed_columns:
+        raise ValueError("没有有效的数值型列可供处理")
+
+    header = list(pd.read_csv(file_path, encoding="utf-8-sig", nrows=0).columns)
+    all_columns = header + [col for col in _appended_column_names(_load_columns_manifest(file_path))
+                            if col not in header]
+    missing_columns = [col for col in processed_columns if col not in all_columns]
+    if missing_columns:
+        raise ValueError(f"以下列不存在于数据集中: {missing_columns}")
+
+    chunks = 0
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8-sig", newline="") as f:
+        for chunk_number, chunk in enumerate(iter_column_chunks(file_path, all_columns, chunksize)):
+            chunks += 1
+            block = transform_streaming_chunk(chunk[processed_columns].to_numpy(dtype=float, na_value=np.nan),
+                                              fitted)
+            chunk = chunk.copy()
+            chunk[processed_columns] = pd.DataFrame(block, columns=processed_columns, index=chunk.index)
+            chunk.to_csv(f, index=False, header=chunk_number == 0)
+        if chunks == 0:
+            pd.DataFrame(columns=all_columns).to_csv(f, index=False)
+    os.replace(temp_path, output_path)
+
+    return {
+        "processed_columns": processed_columns,
+        "chunks": chunks,
+        "fitted": fitted
+    }
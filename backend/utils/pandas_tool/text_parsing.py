@@ -0,0 +1,208 @@
+from typing import Any, List
+from collections import Counter
+import warnings
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.1
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# 数值单位后缀，顺序与 UNIT_MULTIPLIERS 的下标（去掉首个无后缀项）一致
+UNIT_SUFFIXES = ["", "k", "m", "b", "t"]
+UNIT_MULTIPLIERS = np.array([1.0, 1e3, 1e6, 1e9, 1e12])
+
+# 推断时间格式时抽样的不同取值数量
+DATETIME_SAMPLE_SIZE = 200
+
+# 解析失败时错误信息中展示的示例数量
+ERROR_EXAMPLES = 5
+
+
+def _convert_text_to_number(text: Any) -> Any:
+    """逐个解析向量化解析失败的文本，无法解析时返回原始值"""
+    if pd.isna(text) or text == '':
+        return text
+
+    # 转换为字符串处理，去除千位分隔符
+    cleaned = str(text).strip().lower().replace(',', '')
+    if not cleaned:
+        return text
+
+    # 检查是否以单位结尾
+    if cleaned[-1] in UNIT_SUFFIXES[1:]:
+        try:
+            return float(cleaned[:-1]) * UNIT_MULTIPLIERS[UNIT_SUFFIXES.index(cleaned[-1])]
+        except ValueError:
+            pass
+
+    # 尝试直接转换为浮点数
+    try:
+        return float(cleaned)
+    except ValueError:
+        # 如果转换失败，返回原始值
+        return text
+
+
+def parse_numeric_text(series: pd.Series) -> tuple:
+    """
+    向量化解析数值文本：先对列去重，在不同取值上去除千位分隔符，用str访问器拆出K/M/B/T单位后缀，
+    数字部分批量解析后按后缀查表乘以倍数，只对剩余少量文本逐个解析
+
+    Args:
+        series (pd.Series): 待转换的列
+
+    Returns:
+        tuple: (converted, unparsed_count) 转换后的列（全部解析成功时为float64，否则保留无法解析的原始值）
+            和无法解析的非空值数量
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype("float64"), 0
+
+    # 重复的文本只解析一次
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).astype(str).str.replace(',', '', regex=False)
+
+    try:
+        # 不带单位的数字列一次转换完成
+        values = text.astype("float64").to_numpy(copy=True)
+    except ValueError:
+        # 拆出末尾的单位后缀，数字部分批量解析后按后缀查表乘以倍数
+        text = text.str.strip()
+        suffix_codes = pd.Categorical(text.str[-1:].str.lower(), categories=UNIT_SUFFIXES).codes
+        number_text = text.where(suffix_codes <= 0, text.str[:-1])
+        values = pd.to_numeric(number_text, errors="coerce").to_numpy(dtype="float64", copy=True)
+        values *= UNIT_MULTIPLIERS[np.maximum(suffix_codes, 0)]
+
+    # 向量化解析失败的取值逐个解析（如 "inf"、"1_000"），仍失败时保留原始值
+    parsed = ~np.isnan(values)
+    unique_values = values.astype(object)
+    for i in np.flatnonzero(~parsed):
+        result = _convert_text_to_number(uniques[i])
+        if isinstance(result, str) and not result.strip():
+            # 空白文本视为缺失值
+            result = np.nan
+        unique_values[i] = result
+        parsed[i] = isinstance(result, float)
+
+    unparsed_count = int((~parsed[codes[codes >= 0]]).sum())
+    if unparsed_count == 0:
+        converted = np.full(len(series), np.nan)
+        converted[codes >= 0] = unique_values[codes[codes >= 0]].astype("float64")
+        return pd.Series(converted, index=series.index, name=series.name), 0
+
+    converted = series.astype(object).copy()
+    converted[codes >= 0] = unique_values[codes[codes >= 0]]
+    return converted, unparsed_count
+
+
+def _swap_day_month(datetime_format: str) -> str:
+    """交换格式中日和月的位置，如 %m/%d/%Y -> %d/%m/%Y"""
+    return datetime_format.replace("%d", "\0").replace("%m", "%d").replace("\0", "%m")
+
+
+def _is_dayfirst(datetime_format: str) -> bool:
+    """格式中日是否在月之前"""
+    return "%d" in datetime_format and "%m" in datetime_format and \
+        datetime_format.index("%d") < datetime_format.index("%m")
+
+
+def infer_datetime_formats(values: pd.Index, sample_size: int = DATETIME_SAMPLE_SIZE,
+                           random_state: int = 42) -> List[str]:
+    """
+    在不同取值的随机样本上逐个猜测时间格式，按出现次数从多到少返回候选格式，
+    其后追加各格式交换日和月位置后的格式（样本中日和月都不超过12时无法区分二者）
+    """
+    if len(values) > sample_size:
+        rng = np.random.RandomState(random_state)
+        values = values[np.sort(rng.choice(len(values), sample_size, replace=False))]
+    with warnings.catch_warnings():
+        # 猜测到日在前的格式时pandas会提示dayfirst，这里只需要格式本身
+        warnings.simplefilter("ignore")
+        formats = [fmt for fmt, _ in Counter(fmt for fmt in map(guess_datetime_format, values) if fmt).most_common()]
+    swapped = [_swap_day_month(fmt) for fmt in formats]
+    return formats + [fmt for fmt in dict.fromkeys(swapped) if fmt not in formats]
+
+
+def parse_datetime_text(series: pd.Series, datetime_format: str = None) -> tuple:
+    """
+    解析时间文本：先对列去重，未指定格式时在不同取值的样本上推断候选格式，
+    依次用候选格式对全部不同取值做向量化解析，选用能解析全部取值的格式；
+    没有这样的格式时选用解析成功最多的格式，剩余取值按同样的日/月顺序逐个解析
+
+    Args:
+        series (pd.Series): 待转换的列
+        datetime_format (str): 时间格式，指定时所有取值必须符合该格式
+
+    Returns:
+        tuple: (converted, info) 转换后的列，以及 format（使用的格式）、inferred（是否为推断的格式）
+            和 fallback_count（逐个解析的不同取值数量）
+
+    Raises:
+        ValueError: 存在无法解析为时间的取值，或取值的日/月顺序不一致
+    """
+    # 数值时间戳和已是时间类型的列直接转换
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return pd.to_datetime(series), {"format": datetime_format, "inferred": False, "fallback_count": 0}
+
+    # 重复的文本只解析一次
+    codes, uniques = pd.factorize(series)
+    text = pd.Index(uniques, dtype=object).astype(str).str.strip()
+
+    if datetime_format:
+        parsed = pd.DatetimeIndex(pd.to_datetime(text, format=datetime_format))
+        info = {"format": datetime_format, "inferred": False, "fallback_count": 0}
+        return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name), info
+
+    # 空白文本视为缺失值
+    blank = np.asarray(text == "")
+    chosen_format = None
+    parsed = pd.DatetimeIndex([pd.NaT] * len(text))
+    candidates = infer_datetime_formats(text[~blank])
+    for candidate in candidates:
+        candidate_parsed = pd.DatetimeIndex(pd.to_datetime(text, format=candidate, errors="coerce"))
+        if chosen_format is None or candidate_parsed.notna().sum() > parsed.notna().sum():
+            chosen_format, parsed = candidate, candidate_parsed
+        if not (parsed.isna() & ~blank).any():
+            break
+
+    # 没有能解析全部取值的格式时，剩余取值逐个解析
+    leftovers = np.flatnonzero(parsed.isna() & ~blank)
+    info = {"format": chosen_format, "inferred": chosen_format is not None, "fallback_count": len(leftovers)}
+    if len(leftovers) == 0:
+        return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name), info
+
+    # 剩余取值符合日/月互换后的格式，说明同一列混用了两种日期顺序
+    swapped_format = _swap_day_month(chosen_format) if chosen_format else None
+    if swapped_format and swapped_format != chosen_format:
+        swapped = pd.to_datetime(text[leftovers], format=swapped_format, errors="coerce")
+        if swapped.notna().any():
+            examples = list(uniques[leftovers[swapped.notna()]][:ERROR_EXAMPLES])
+            raise ValueError(f"取值的日/月顺序不一致，无法按同一格式 ({chosen_format}) 解析，例如: {examples}")
+
+    # 剩余取值先依次用样本中猜到的其他格式解析（如混有ISO格式的取值）
+    stamps = list(parsed)
+    for candidate in candidates:
+        if not len(leftovers) or candidate in (chosen_format, swapped_format):
+            continue
+        candidate_parsed = pd.DatetimeIndex(pd.to_datetime(text[leftovers], format=candidate, errors="coerce"))
+        for i, stamp in zip(leftovers[candidate_parsed.notna()], candidate_parsed[candidate_parsed.notna()]):
+            stamps[i] = stamp
+        leftovers = leftovers[candidate_parsed.isna()]
+
+    # 仍无法解析的取值逐个解析，日在前的格式下非年份开头的取值同样按日在前解析
+    dayfirst = _is_dayfirst(chosen_format) if chosen_format else False
+    unparsed = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i in leftovers:
+            try:
+                stamps[i] = pd.to_datetime(text[i], dayfirst=dayfirst and not text[i][:4].isdigit())
+            except (ValueError, OverflowError):
+                unparsed.append(uniques[i])
+    if unparsed:
+        raise ValueError(f"{len(unparsed)}个取值无法解析为时间，例如: {unparsed[:ERROR_EXAMPLES]}")
+
+    parsed = pd.DatetimeIndex(pd.to_datetime(stamps))
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name), info
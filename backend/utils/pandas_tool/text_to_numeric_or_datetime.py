@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
-import pandas as pd
 from . import check_and_read
+from .text_parsing import parse_numeric_text, parse_datetime_text
 from ..file_manager import generate_new_file_path
 
 
@@ -13,65 +13,35 @@ def text_to_numeric_or_datetime(file_path: str, columns: List[str], convert_to:
         file_path (str): 文件路径
         columns (List[str]): 需要处理的列名列表
         convert_to (str): 转换目标类型 "numeric" 或 "datetime"
-        datetime_format (str): 时间格式，如转换为时间时可指定格式，例如 "%Y-%m-%d %H:%M:%S"
+        datetime_format (str): 时间格式，如转换为时间时可指定格式，例如 "%Y-%m-%d %H:%M:%S"；
+            未指定时在样本上推断格式，不符合推断格式的取值逐个解析
         session_id (str): 会话ID
 
     Returns:
-        Dict[str, Any]: 处理结果信息
+        Dict[str, Any]: 处理结果信息，unparsed_counts 为各列无法解析的非空值数量，
+            datetime_formats 为各列使用的时间格式
     """
-    df, _ = check_and_read(file_path, columns, session_id)
+    df, _ = check_and_read(file_path, columns, session_id, require_numeric=False)
 
     # 处理列
     processed_columns = []
 
+    # 各列无法解析的非空值数量
+    unparsed_counts = {}
+    # 各列使用的时间格式及逐个解析的取值数量
+    datetime_formats = {}
+
     if convert_to == "numeric":
-        # 转换为数值
+        # 转换为数值：去除千位分隔符，处理带有 K, M, B, T 等单位的数值，无法解析的值保持原样
         for col in columns:
-            # 处理带有 K, M, B 等单位的数值
-            def convert_text_to_number(text):
-                if pd.isna(text) or text == '':
-                    return text
-
-                # 转换为字符串处理
-                text = str(text).strip().lower()
-
-                # 去除千位分隔符
-                text = text.replace(',', '')
-
-                # 定义单位映射
-                units = {
-                    'k': 10 ** 3,
-                    'm': 10 ** 6,
-                    'b': 10 ** 9,
-                    't': 10 ** 12
-                }
-
-                # 检查是否以单位结尾
-                if text[-1] in units:
-                    try:
-                        number = float(text[:-1])
-                        return number * units[text[-1]]
-                    except ValueError:
-                        pass
-
-                # 尝试直接转换为浮点数
-                try:
-                    return float(text)
-                except ValueError:
-                    # 如果转换失败，返回原始值
-                    return text
-
-            df[col] = df[col].apply(convert_text_to_number)
+            df[col], unparsed_counts[col] = parse_numeric_text(df[col])
             processed_columns.append(col)
 
     elif convert_to == "datetime":
         # 转换为时间
         for col in columns:
             try:
-                if datetime_format:
-                    df[col] = pd.to_datetime(df[col], format=datetime_format)
-                else:
-                    df[col] = pd.to_datetime(df[col])
+                df[col], datetime_formats[col] = parse_datetime_text(df[col], datetime_format)
                 processed_columns.append(col)
             except Exception as e:
                 raise ValueError(f"列 {col} 转换为时间失败: {e}")
@@ -86,5 +56,7 @@ def text_to_numeric_or_datetime(file_path: str, columns: List[str], convert_to:
         "data_id": new_filename,
         "saved_path": new_file_path,
         "processed_columns": processed_columns,
-        "convert_to": convert_to
+        "convert_to": convert_to,
+        "unparsed_counts": unparsed_counts,
+        "datetime_formats": datetime_formats
     }
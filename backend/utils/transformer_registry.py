@@ -0,0 +1,194 @@
+"""
+预处理器注册表
+按session保存量纲处理、独热编码和缺失值插补拟合得到的参数，新数据到达时可直接重放同样的变换而无需重新拟合
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import pickle
+import logging
+from typing import Any, Dict, List
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 数据目录
+DATA_DIR = "data"
+
+# 预处理器子目录名称（位于session目录下，随session一起被定期清理）
+TRANSFORMERS_DIR_NAME = ".transformers"
+
+# 支持保存的预处理器类型
+TRANSFORMER_KINDS = ("dimensionless_processing", "one_hot_encoding", "handle_missing_values")
+
+_TRANSFORMER_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def get_transformers_dir(session_id: str = None) -> str:
+    """
+    获取预处理器目录，支持session隔离
+    """
+    base_dir = os.path.join(DATA_DIR, session_id) if session_id else DATA_DIR
+    transformers_dir = os.path.join(base_dir, TRANSFORMERS_DIR_NAME)
+    os.makedirs(transformers_dir, exist_ok=True)
+    return transformers_dir
+
+
+def _transformer_paths(transformer_id: str, session_id: str = None) -> tuple:
+    """返回预处理器文件和元数据文件路径，ID格式不正确时视为不存在"""
+    if not _TRANSFORMER_ID_PATTERN.match(transformer_id or ""):
+        raise FileNotFoundError(f"预处理器不存在: {transformer_id}")
+    transformers_dir = get_transformers_dir(session_id)
+    return (os.path.join(transformers_dir, f"{transformer_id}.pkl"),
+            os.path.join(transformers_dir, f"{transformer_id}.json"))
+
+
+def register_transformer(kind: str, method: str, columns: List[str], state: Dict[str, Any],
+                         session_id: str = None, source_file: str = None,
+                         params: Dict[str, Any] = None) -> str:
+    """
+    保存拟合好的预处理器
+
+    Args:
+        kind (str): 预处理类型，见TRANSFORMER_KINDS
+        method (str): 具体方法
+        columns (List[str]): 参与拟合的列，重放时新数据必须包含这些列
+        state (Dict[str, Any]): 拟合得到的参数（如均值和标准差、类别列表、填充值、近邻候选行）
+        session_id (str): 用户会话ID
+        source_file (str): 拟合所用的数据文件路径
+        params (Dict[str, Any]): 重放时沿用的调用参数
+
+    Returns:
+        str: 预处理器ID
+    """
+    if kind not in TRANSFORMER_KINDS:
+        raise ValueError(f"不支持的预处理器类型: {kind}")
+
+    transformer_id = uuid.uuid4().hex
+    info = {
+        "transformer_id": transformer_id,
+        "kind": kind,
+        "method": method,
+        "columns": list(columns),
+        "source_data_id": os.path.splitext(os.path.basename(source_file))[0] if source_file else None,
+        "params": params or {},
+        "created_at": time.time()
+    }
+    transformer_path, info_path = _transformer_paths(transformer_id, session_id)
+
+    with open(f"{transformer_path}.tmp", "wb") as f:
+        pickle.dump({"info": info, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{transformer_path}.tmp", transformer_path)
+
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, default=str)
+
+    return transformer_id
+
+
+def load_transformer(transformer_id: str, session_id: str = None) -> Dict[str, Any]:
+    """
+    读取预处理器
+
+    Returns:
+        Dict[str, Any]: 包含 info, state
+
+    Raises:
+        FileNotFoundError: 预处理器不存在
+    """
+    transformer_path, _ = _transformer_paths(transformer_id, session_id)
+    if not os.path.exists(transformer_path):
+        raise FileNotFoundError(f"预处理器不存在: {transformer_id}")
+
+    with open(transformer_path, "rb") as f:
+        return pickle.load(f)
+
+
+def get_transformer_info(transformer_id: str, session_id: str = None) -> Dict[str, Any]:
+    """
+    读取预处理器元数据（不加载拟合参数）
+    """
+    _, info_path = _transformer_paths(transformer_id, session_id)
+    if not os.path.exists(info_path):
+        raise FileNotFoundError(f"预处理器不存在: {transformer_id}")
+
+    with open(info_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_transformers(session_id: str = None) -> List[Dict[str, Any]]:
+    """
+    列出session下的全部预处理器，按创建时间倒序
+    """
+    transformers_dir = get_transformers_dir(session_id)
+    transformers = []
+    for filename in os.listdir(transformers_dir):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(transformers_dir, filename), "r", encoding="utf-8") as f:
+                transformers.append(json.load(f))
+        except Exception as e:
+            logger.warning(f"读取预处理器信息失败 {filename}: {e}")
+    return sorted(transformers, key=lambda info: info["created_at"], reverse=True)
+
+
+def delete_transformer(transformer_id: str, session_id: str = None):
+    """
+    删除预处理器
+
+    Raises:
+        FileNotFoundError: 预处理器不存在
+    """
+    transformer_path, info_path = _transformer_paths(transformer_id, session_id)
+    if not os.path.exists(transformer_path):
+        raise FileNotFoundError(f"预处理器不存在: {transformer_id}")
+
+    os.remove(transformer_path)
+    if os.path.exists(info_path):
+        os.remove(info_path)
+
+
+def apply_transformer(transformer_id: str, file_path: str, session_id: str = None) -> Dict[str, Any]:
+    """
+    对新数据重放已保存的预处理：使用保存的参数对整列做一次向量化变换，不重新拟合，
+    结果与对应处理函数一样另存为新文件
+
+    Args:
+        transformer_id (str): 预处理器ID
+        file_path (str): 待处理的数据文件路径
+        session_id (str): 用户会话ID
+
+    Returns:
+        Dict[str, Any]: 对应处理函数的返回结果，另含 transformer_id
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    transformer = load_transformer(transformer_id, session_id)
+    info = transformer["info"]
+    state = transformer["state"]
+    params = info["params"]
+    kind = info["kind"]
+
+    if kind == "dimensionless_processing":
+        from utils.pandas_tool.dimensionless_processing import dimensionless_processing
+        # 是否分块处理按新数据的大小重新决定
+        result = dimensionless_processing(file_path, info["columns"], info["method"], session_id,
+                                          fitted=state, **params)
+    elif kind == "one_hot_encoding":
+        from utils.pandas_tool.one_hot_encoding import one_hot_encoding
+        result = one_hot_encoding(file_path, info["columns"], session_id, params.get("drop_first", False),
+                                  params.get("output_format", "dense"), fitted=state)
+    elif kind == "handle_missing_values":
+        from utils.file_manager import handle_missing_values
+        result = handle_missing_values(file_path, session_id, info["columns"], info["method"],
+                                       params.get("fill_value"), params.get("knn_neighbors", 5),
+                                       params.get("knn_backend", "index"), fitted=state)
+    else:
+        raise ValueError(f"不支持的预处理器类型: {kind}")
+
+    return {"transformer_id": transformer_id, **result}
@@ -0,0 +1,104 @@
+"""
+模型预热工具
+在应用启动后于后台预先加载分词词典和情感模型，避免部署后首个NLP请求长时间等待
+"""
+
+import os
+import time
+import logging
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 通过环境变量配置预热，例如 WARMUP_ENABLED=false 或 WARMUP_COMPONENTS=jieba,snownlp
+WARMUP_ENABLED_ENV = "WARMUP_ENABLED"
+WARMUP_COMPONENTS_ENV = "WARMUP_COMPONENTS"
+
+
+def warmup_jieba():
+    """加载jieba主词典和词性词典"""
+    import jieba
+    import jieba.posseg as pseg
+
+    jieba.initialize()
+    # 触发一次词性标注，确保HMM模型已加载
+    list(pseg.cut("预热分词词典"))
+
+
+def warmup_snownlp():
+    """加载SnowNLP分词、词性和情感分类模型"""
+    from snownlp import SnowNLP
+
+    _ = SnowNLP("预热情感模型").sentiments
+
+
+def warmup_pyecharts():
+    """导入pyecharts图表模块"""
+    from pyecharts import options as opts  # noqa: F401
+    from pyecharts.charts import WordCloud  # noqa: F401
+
+
+WARMUP_COMPONENTS = {
+    "jieba": warmup_jieba,
+    "snownlp": warmup_snownlp,
+    "pyecharts": warmup_pyecharts,
+}
+
+
+def is_warmup_enabled() -> bool:
+    """
+    读取环境变量判断是否启用预热，默认启用
+    """
+    return os.getenv(WARMUP_ENABLED_ENV, "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_warmup_components() -> list:
+    """
+    读取环境变量确定需要预热的组件，默认预热全部组件
+    """
+    value = os.getenv(WARMUP_COMPONENTS_ENV)
+    if not value:
+        return list(WARMUP_COMPONENTS)
+
+    components = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in components if name not in WARMUP_COMPONENTS]
+    if unknown:
+        logger.warning(f"忽略未知的预热组件: {unknown}")
+    return [name for name in components if name in WARMUP_COMPONENTS]
+
+
+def warmup_models(components: list = None) -> dict:
+    """
+    依次预热各组件并记录耗时，单个组件失败不影响其他组件
+
+    Args:
+        components (list): 需要预热的组件名称列表，默认读取环境变量配置
+
+    Returns:
+        dict: 各组件的预热耗时（秒），失败的组件值为None
+    """
+    if components is None:
+        components = get_warmup_components()
+
+    timings = {}
+    total_start = time.perf_counter()
+    for name in components:
+        start = time.perf_counter()
+        try:
+            WARMUP_COMPONENTS[name]()
+            timings[name] = round(time.perf_counter() - start, 3)
+            logger.info(f"预热组件 {name} 完成，耗时 {timings[name]:.3f} 秒")
+        except Exception as e:
+            timings[name] = None
+            logger.error(f"预热组件 {name} 失败: {e}")
+
+    logger.info(f"模型预热完成，总耗时 {time.perf_counter() - total_start:.3f} 秒")
+    return timings
+
+
+if __name__ == "__main__":
+    # 配置日志
+    logging.basicConfig(level=logging.INFO)
+
+    # 执行预热任务
+    warmup_models()